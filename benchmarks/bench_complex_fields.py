@@ -0,0 +1,87 @@
+# coding: utf-8
+'''
+Benchmark the conversion of complex fields into simple fields using a table
+of contents style document.
+
+Each TOC entry is a paragraph (or a line within a single paragraph) containing
+the entry text and a complex PAGEREF field:
+
+    $ python benchmarks/bench_complex_fields.py --entries 5000
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import time
+
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+TOC_ENTRY = '''
+    <r><t>Section {index}</t></r>
+    <r><tab/></r>
+    <r><fldChar fldCharType="begin"/></r>
+    <r><instrText> PAGEREF _Toc{index} \\h </instrText></r>
+    <r><fldChar fldCharType="separate"/></r>
+    <r><t>{page}</t></r>
+    <r><fldChar fldCharType="end"/></r>
+'''
+
+
+def build_toc_document(entries, entries_per_paragraph=1):
+    '''
+    Return an in-memory docx containing `entries` TOC entries, with
+    `entries_per_paragraph` entries sharing each paragraph (separated by
+    line breaks).
+    '''
+    paragraphs = []
+    for start in range(0, entries, entries_per_paragraph):
+        stop = min(start + entries_per_paragraph, entries)
+        lines = [
+            TOC_ENTRY.format(index=index, page=index // 40 + 1)
+            for index in range(start, stop)
+        ]
+        paragraphs.append('<p>{0}</p>'.format('<r><br/></r>'.join(lines)))
+
+    document = WordprocessingDocumentFactory()
+    document.add(MainDocumentPart, ''.join(paragraphs))
+    return create_zip_archive(document.to_zip_dict())
+
+
+def time_export(docx):
+    docx.seek(0)
+    exporter = PyDocXHTMLExporter(docx)
+    # Load the document up front so only the export is measured
+    exporter.main_document_part.document
+    start = time.time()
+    exporter.export()
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--entries', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    layouts = [
+        ('one entry per paragraph', 1),
+        ('all entries in one paragraph', args.entries),
+    ]
+    for label, entries_per_paragraph in layouts:
+        docx = build_toc_document(args.entries, entries_per_paragraph)
+        best = min(time_export(docx) for _ in range(args.repeat))
+        print('{label}: {entries} entries in {seconds:.3f}s'.format(
+            label=label,
+            entries=args.entries,
+            seconds=best,
+        ))
+
+
+if __name__ == '__main__':
+    main()
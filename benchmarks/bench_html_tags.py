@@ -0,0 +1,81 @@
+# coding: utf-8
+'''
+Benchmark rendering HTML tags with a document made up of many short,
+formatted runs.
+
+Runs cycle through plain, bold, italic, underlined and tabbed text, so most
+of the output consists of the same few tags:
+
+    $ python benchmarks/bench_html_tags.py --runs 100000
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import time
+
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+RUNS = (
+    '<r><t>plain {index} </t></r>',
+    '<r><rPr><b/></rPr><t>bold {index} </t></r>',
+    '<r><rPr><i/></rPr><t>italic {index} </t></r>',
+    '<r><rPr><u val="single"/></rPr><t>underline {index} </t></r>',
+    '<r><tab/><t>tab {index} </t></r>',
+)
+
+
+def build_runs_document(runs, runs_per_paragraph=10):
+    '''
+    Return an in-memory docx containing `runs` runs, split into paragraphs of
+    `runs_per_paragraph` runs each.
+    '''
+    paragraphs = []
+    for start in range(0, runs, runs_per_paragraph):
+        stop = min(start + runs_per_paragraph, runs)
+        paragraph_runs = [
+            RUNS[index % len(RUNS)].format(index=index)
+            for index in range(start, stop)
+        ]
+        paragraphs.append('<p>{0}</p>'.format(''.join(paragraph_runs)))
+
+    document = WordprocessingDocumentFactory()
+    document.add(MainDocumentPart, ''.join(paragraphs))
+    return create_zip_archive(document.to_zip_dict())
+
+
+def time_export(docx):
+    docx.seek(0)
+    exporter = PyDocXHTMLExporter(docx)
+    # Load the document up front so only the export is measured
+    exporter.main_document_part.document
+    start = time.time()
+    html = exporter.export()
+    return time.time() - start, len(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--runs', type=int, default=100000)
+    parser.add_argument('--runs-per-paragraph', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    docx = build_runs_document(args.runs, args.runs_per_paragraph)
+    timings = [time_export(docx) for _ in range(args.repeat)]
+    seconds, size = min(timings)
+    print('{runs} runs exported in {seconds:.3f}s ({size} characters)'.format(
+        runs=args.runs,
+        seconds=seconds,
+        size=size,
+    ))
+
+
+if __name__ == '__main__':
+    main()
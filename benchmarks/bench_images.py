@@ -0,0 +1,101 @@
+# coding: utf-8
+'''
+Benchmark exporting documents with large images (like scans), with and
+without an image processor (which requires Pillow):
+
+    $ python benchmarks/bench_images.py --images 5 --megapixels 12
+
+The images are shown 100 pixels wide, and half of them are TIFFs. The
+processor is timed with a cold cache (a new processor for each export) and
+with a warm one (the same processor for every export).
+'''
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+from io import BytesIO
+from timeit import default_timer
+
+from bench_suite import DRAWING
+from PIL import Image
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.export.images import ImageProcessor
+from pydocx.openxml.packaging import ImagePart, MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+
+def build_image(image_format, megapixels):
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = width * 3 // 4
+    # A noisy gradient, which compresses like a photograph
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 32)
+    image = Image.merge('RGB', [gradient, noise, Image.blend(gradient, noise, 0.5)])
+    output = BytesIO()
+    image.save(output, image_format)
+    return output.getvalue()
+
+
+def build_docx(images, megapixels):
+    document = WordprocessingDocumentFactory()
+    relationships = []
+    body = []
+    media = {}
+    for index in range(images):
+        extension = 'tiff' if index % 2 else 'jpeg'
+        relationship_id = 'rIdImage{0}'.format(index)
+        target = 'media/image{0}.{1}'.format(index, extension)
+        relationships.append(document.relationship_format.format(
+            id=relationship_id,
+            type=ImagePart.relationship_type,
+            target=target,
+            target_mode='Internal',
+        ))
+        media['word/' + target] = build_image(extension.upper(), megapixels)
+        body.append(DRAWING.format(relationship_id=relationship_id))
+    document.add(MainDocumentPart, ''.join(body), ''.join(relationships))
+    zip_dict = document.to_zip_dict()
+    zip_dict.update(media)
+    return create_zip_archive(zip_dict).getvalue()
+
+
+def time_export(data, create_processor, repeat):
+    seconds = []
+    for _ in range(repeat):
+        processor = create_processor()
+        start = default_timer()
+        html = PyDocXHTMLExporter(BytesIO(data), image_processor=processor).export()
+        seconds.append(default_timer() - start)
+    return min(seconds), len(html.encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--images', type=int, default=4)
+    parser.add_argument('--megapixels', type=float, default=12)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = build_docx(args.images, args.megapixels)
+    shared_processor = ImageProcessor()
+    cases = [
+        ('none', lambda: None),
+        ('cold', ImageProcessor),
+        ('warm', lambda: shared_processor),
+    ]
+    for name, create_processor in cases:
+        seconds, size = time_export(data, create_processor, args.repeat)
+        print('{name:<5} {seconds:8.4f}s  {size:>12,} bytes of HTML'.format(
+            name=name,
+            seconds=seconds,
+            size=size,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# coding: utf-8
+'''
+Benchmark reconverting revisions of a document, each of which changes a few
+paragraphs, with and without a block cache:
+
+    $ python benchmarks/bench_incremental.py --paragraphs 5000 --revisions 5
+
+The first conversion fills the cache. Each revision then edits `--edits`
+paragraphs and is converted again; the best time of `--repeat` conversions
+of each revision is reported (on average over the revisions).
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import random
+from io import BytesIO
+from timeit import default_timer
+
+from bench_suite import NUMBERING, NUMBERING_LEVEL, STYLE, build_paragraph, build_table
+from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.export.incremental import BlockCache
+from pydocx.openxml.packaging import (
+    MainDocumentPart,
+    NumberingDefinitionsPart,
+    StyleDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.stats import ConversionStats
+from pydocx.util.zip import create_zip_archive
+
+EXPORTERS = [
+    ('html', PyDocXHTMLExporter),
+    ('markdown', PyDocXMarkdownExporter),
+]
+
+
+def build_blocks(paragraphs):
+    # A list, followed by paragraphs and tables
+    blocks = [
+        build_paragraph(index, 1, style_depth=0, list_depth=1, field=False)
+        for index in range(10)
+    ]
+    for index in range(paragraphs):
+        blocks.append(build_paragraph(
+            index,
+            runs_per_paragraph=3,
+            style_depth=1,
+            list_depth=0,
+            field=index % 20 == 0,
+        ))
+        if index % 100 == 0:
+            blocks.append(build_table(5, 4))
+    return blocks
+
+
+def build_docx(blocks):
+    document = WordprocessingDocumentFactory()
+    document.add(StyleDefinitionsPart, STYLE.format(
+        index=0,
+        based_on='',
+        properties='<b/>',
+    ))
+    document.add(NumberingDefinitionsPart, NUMBERING.format(
+        levels=NUMBERING_LEVEL.format(level=0, num_format='decimal'),
+    ))
+    document.add(MainDocumentPart, ''.join(blocks))
+    return create_zip_archive(document.to_zip_dict()).getvalue()
+
+
+def build_revisions(paragraphs, revisions, edits):
+    blocks = build_blocks(paragraphs)
+    random.seed(0)
+    yield build_docx(blocks)
+    for revision in range(revisions):
+        for _ in range(edits):
+            index = random.randrange(len(blocks))
+            blocks[index] = '<p><r><t>Revision {0}</t></r></p>'.format(revision)
+        yield build_docx(blocks)
+
+
+def convert(exporter_class, data, block_cache=None, stats=None):
+    exporter = exporter_class(BytesIO(data), block_cache=block_cache, stats=stats)
+    return ''.join(exporter.export())
+
+
+def time_conversion(exporter_class, data, block_cache, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = default_timer()
+        convert(exporter_class, data, block_cache=block_cache)
+        seconds.append(default_timer() - start)
+    return min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--paragraphs', type=int, default=5000)
+    parser.add_argument('--revisions', type=int, default=5)
+    parser.add_argument('--edits', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    revisions = list(build_revisions(args.paragraphs, args.revisions, args.edits))
+    for name, exporter_class in EXPORTERS:
+        cache = BlockCache()
+        convert(exporter_class, revisions[0], block_cache=cache)
+        full_seconds = 0
+        incremental_seconds = 0
+        misses = 0
+        for data in revisions[1:]:
+            expected = convert(exporter_class, data)
+            stats = ConversionStats()
+            output = convert(exporter_class, data, block_cache=cache, stats=stats)
+            misses += stats.counters.get('block_cache_misses', 0)
+            assert output == expected, 'The incremental output is different'
+
+            full_seconds += time_conversion(exporter_class, data, None, args.repeat)
+            incremental_seconds += time_conversion(
+                exporter_class,
+                data,
+                cache,
+                args.repeat,
+            )
+        print(
+            '{name:<9} full {full:8.4f}s  incremental {incremental:8.4f}s  '
+            '({misses} blocks rendered in {revisions} revisions)'.format(
+                name=name,
+                full=full_seconds / args.revisions,
+                incremental=incremental_seconds / args.revisions,
+                misses=misses,
+                revisions=args.revisions,
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
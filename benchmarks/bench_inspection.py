@@ -0,0 +1,65 @@
+# coding: utf-8
+'''
+Benchmark inspecting documents compared with converting them:
+
+    $ python benchmarks/bench_inspection.py --paragraphs 1000 5000
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+from io import BytesIO
+from timeit import default_timer
+
+from bench_suite import build_document
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.inspection import inspect_document
+
+
+def best_time(function, data, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = default_timer()
+        function(BytesIO(data))
+        seconds.append(default_timer() - start)
+    return min(seconds)
+
+
+def convert(stream):
+    return PyDocXHTMLExporter(stream).export()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--paragraphs', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for paragraphs in args.paragraphs:
+        data = build_document(
+            paragraphs,
+            runs_per_paragraph=3,
+            style_depth=2,
+            tables=paragraphs // 100,
+            table_rows=5,
+            table_columns=4,
+            images=paragraphs // 100,
+        )
+        convert_seconds = best_time(convert, data, args.repeat)
+        inspect_seconds = best_time(inspect_document, data, args.repeat)
+        print(
+            '{paragraphs:>7} paragraphs  convert {convert:8.4f}s  '
+            'inspect {inspect:8.4f}s ({ratio:.1%})'.format(
+                paragraphs=paragraphs,
+                convert=convert_seconds,
+                inspect=inspect_seconds,
+                ratio=inspect_seconds / convert_seconds,
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+# coding: utf-8
+'''
+Benchmark loading the models of the fixtures eagerly (the default) and
+lazily, and exporting them to HTML in both modes:
+
+    $ python benchmarks/bench_lazy_models.py
+
+Loading lazily only creates the models of the parts' root elements, so the
+export times show how much decoding the exporter actually saves.
+
+The fields that aren't set are read through their descriptors in both
+modes, so the time to read every unset field of the eagerly loaded
+synthetic document is reported as well.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import glob
+import os
+from io import BytesIO
+from timeit import default_timer
+
+from bench_suite import FIXTURES, build_document
+from pydocx.exceptions import MalformedDocxException
+from pydocx.models import get_own_fields
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import WordprocessingDocument
+from pydocx.openxml.wordprocessing import Document, Footnotes, Numbering, Styles
+
+
+class LazyModelsExporter(PyDocXHTMLExporter):
+    lazy_models = True
+
+
+def parse_parts(data):
+    '''
+    Return the (model class, part) of each part whose models are loaded,
+    with its XML already parsed, so that only loading the models is timed.
+    '''
+    document = WordprocessingDocument(path=BytesIO(data))
+    main_document_part = document.main_document_part
+    if main_document_part is None:
+        raise MalformedDocxException
+    parts = [
+        (Document, main_document_part),
+        (Styles, main_document_part.style_definitions_part),
+        (Numbering, main_document_part.numbering_definitions_part),
+        (Footnotes, main_document_part.footnotes_part),
+    ]
+    return [
+        (model_class, part)
+        for model_class, part in parts
+        if part is not None and part.root_element is not None
+    ]
+
+
+def load_models(parts, lazy):
+    for model_class, part in parts:
+        model_class.load(
+            part.root_element,
+            container=part,
+            alternate_content=part.alternate_content,
+            lazy=lazy,
+        )
+
+
+def iterate_models(model):
+    yield model
+    for field_name in get_own_fields(type(model)).values():
+        value = model.__dict__.get(field_name)
+        values = value if isinstance(value, list) else [value]
+        for value in values:
+            if hasattr(value, '_lazy_source'):
+                for child in iterate_models(value):
+                    yield child
+
+
+def get_unset_fields(parts):
+    '''
+    Return the (model, field name) of each field of the eagerly loaded
+    models that isn't set.
+    '''
+    unset_fields = []
+    for model_class, part in parts:
+        root = model_class.load(
+            part.root_element,
+            container=part,
+            alternate_content=part.alternate_content,
+        )
+        for model in iterate_models(root):
+            unset_fields.extend(
+                (model, field_name)
+                for field_name in get_own_fields(type(model)).values()
+                if field_name not in model.__dict__
+            )
+    return unset_fields
+
+
+def read_unset_fields(unset_fields):
+    for model, field_name in unset_fields:
+        getattr(model, field_name)
+
+
+def best_time(function, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = default_timer()
+        function()
+        seconds.append(default_timer() - start)
+    return min(seconds)
+
+
+def measure(data, repeat):
+    parts = parse_parts(data)
+    return [
+        best_time(lambda: load_models(parts, lazy=False), repeat),
+        best_time(lambda: load_models(parts, lazy=True), repeat),
+        best_time(lambda: PyDocXHTMLExporter(BytesIO(data)).export(), repeat),
+        best_time(lambda: LazyModelsExporter(BytesIO(data)).export(), repeat),
+    ]
+
+
+def report(name, timings):
+    print(
+        '{name:<45} load {0:8.4f}s / {1:8.4f}s  '
+        'export {2:8.4f}s / {3:8.4f}s ({ratio:+.1%})'.format(
+            *timings,
+            name=name,
+            ratio=timings[3] / timings[2] - 1
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--paragraphs', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('Times are eager / lazy')
+    totals = [0, 0, 0, 0]
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.docx'))):
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            timings = measure(data, args.repeat)
+        except MalformedDocxException:
+            continue
+        totals = [total + timing for total, timing in zip(totals, timings)]
+        report(os.path.basename(path), timings)
+    report('all fixtures', totals)
+
+    data = build_document(
+        args.paragraphs,
+        runs_per_paragraph=3,
+        style_depth=2,
+        tables=args.paragraphs // 100,
+        table_rows=5,
+        table_columns=4,
+        images=0,
+    )
+    report('synthetic ({0} paragraphs)'.format(args.paragraphs), measure(data, 3))
+
+    unset_fields = get_unset_fields(parse_parts(data))
+    seconds = best_time(lambda: read_unset_fields(unset_fields), args.repeat)
+    print('read {0} unset fields of the eager models {1:8.4f}s ({2:.3f}us each)'.format(
+        len(unset_fields),
+        seconds,
+        seconds / len(unset_fields) * 1e6,
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# coding: utf-8
+'''
+Benchmark rendering the body of a large document in several processes:
+
+    $ python benchmarks/bench_parallel.py --paragraphs 20000 --processes 1 2 4
+
+The document is loaded once; each variant only renders it. The time to load
+the document is reported separately, since it is always sequential.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import multiprocessing
+from io import BytesIO
+from timeit import default_timer
+
+from bench_suite import build_document
+from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.export.parallel import can_fork
+
+EXPORTERS = [
+    ('html', PyDocXHTMLExporter),
+    ('markdown', PyDocXMarkdownExporter),
+]
+
+
+def load(exporter_class, data, processes):
+    exporter_class = type(str('Exporter'), (exporter_class,), dict(
+        render_processes=processes,
+    ))
+    exporter = exporter_class(BytesIO(data))
+    # Load the document (and its parts) ahead of time
+    exporter.main_document_part.document
+    return exporter
+
+
+def run(exporter_class, data, processes, repeat):
+    seconds = []
+    for _ in range(repeat):
+        exporter = load(exporter_class, data, processes)
+        start = default_timer()
+        output = ''.join(exporter.export())
+        seconds.append(default_timer() - start)
+    return min(seconds), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--tables', type=int, default=200)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if not can_fork():
+        parser.error('Rendering in parallel requires fork')
+
+    data = build_document(
+        paragraphs=args.paragraphs,
+        runs_per_paragraph=3,
+        style_depth=2,
+        list_depth=0,
+        tables=args.tables,
+        table_rows=5,
+        table_columns=4,
+        fields=args.paragraphs // 10,
+    )
+    print('{cpus} cpus'.format(cpus=multiprocessing.cpu_count()))
+    for name, exporter_class in EXPORTERS:
+        start = default_timer()
+        load(exporter_class, data, 1)
+        print('{name} load {seconds:8.4f}s'.format(
+            name=name,
+            seconds=default_timer() - start,
+        ))
+        expected = None
+        for processes in args.processes:
+            seconds, output = run(exporter_class, data, processes, args.repeat)
+            if expected is None:
+                expected = output
+            print('{name} processes={processes:<3} {seconds:8.4f}s  {same}'.format(
+                name=name,
+                processes=processes,
+                seconds=seconds,
+                same='same output' if output == expected else 'DIFFERENT OUTPUT',
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# coding: utf-8
+'''
+Benchmark previewing the start of documents of increasing length, compared
+with converting them in full:
+
+    $ python benchmarks/bench_preview.py --paragraphs 1000 5000 20000
+
+The preview time should stay the same as the documents get longer.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+from io import BytesIO
+from timeit import default_timer
+
+from bench_suite import build_document
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.util.preview import PreviewLimits
+from pydocx.util.stats import ConversionStats
+
+
+def time_conversion(data, preview, repeat):
+    seconds = []
+    for _ in range(repeat):
+        stats = ConversionStats()
+        start = default_timer()
+        PyDocXHTMLExporter(BytesIO(data), preview=preview, stats=stats).export()
+        seconds.append(default_timer() - start)
+    return min(seconds), stats.counters.get('bytes_decompressed', 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--paragraphs', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--max-blocks', type=int, default=50)
+    parser.add_argument('--max-chars', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    preview = PreviewLimits(max_blocks=args.max_blocks, max_chars=args.max_chars)
+    for paragraphs in args.paragraphs:
+        data = build_document(
+            paragraphs,
+            runs_per_paragraph=3,
+            style_depth=2,
+            images=paragraphs // 100,
+        )
+        full, full_bytes = time_conversion(data, None, args.repeat)
+        partial, partial_bytes = time_conversion(data, preview, args.repeat)
+        print(
+            '{paragraphs:>7} paragraphs  full {full:8.4f}s ({full_bytes} bytes)  '
+            'preview {partial:8.4f}s ({partial_bytes} bytes)'.format(
+                paragraphs=paragraphs,
+                full=full,
+                full_bytes=full_bytes,
+                partial=partial,
+                partial_bytes=partial_bytes,
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# coding: utf-8
+'''
+Benchmark computing the effective properties of every run of a document
+whose paragraphs use a chain of based on styles:
+
+    $ python benchmarks/bench_property_merge.py --style-depth 1 4 8
+
+The models are loaded once, and only merging the run properties of the
+style chain (and the run) is timed.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+from io import BytesIO
+from timeit import default_timer
+
+from bench_suite import build_document
+from pydocx.export.run_coalescing import get_model_key
+from pydocx.openxml.packaging import WordprocessingDocument
+from pydocx.openxml.wordprocessing import Run
+
+
+def iterate_runs(model):
+    for child in getattr(model, 'children', None) or []:
+        if isinstance(child, Run):
+            yield child
+        else:
+            for run in iterate_runs(child):
+                yield run
+
+
+def load_runs(data):
+    document = WordprocessingDocument(path=BytesIO(data))
+    main_document_part = document.main_document_part
+    # Load the styles up front, so that they aren't part of the timings
+    main_document_part.style_definitions_part.styles
+    return list(iterate_runs(main_document_part.document.body))
+
+
+# The effective properties of each run are memoized, so the undecorated
+# function is called to compute them every time
+compute_effective_properties = Run.effective_properties.fget.func
+
+
+def merge_properties(runs):
+    for run in runs:
+        # The key is computed as well, as the run coalescing does
+        get_model_key(compute_effective_properties(run))
+
+
+def best_time(function, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = default_timer()
+        function()
+        seconds.append(default_timer() - start)
+    return min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--style-depth', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--paragraphs', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    for style_depth in args.style_depth:
+        data = build_document(
+            args.paragraphs,
+            runs_per_paragraph=3,
+            style_depth=style_depth,
+        )
+        runs = load_runs(data)
+        seconds = best_time(lambda: merge_properties(runs), args.repeat)
+        print(
+            'style depth {depth:>2}  {runs:>6} runs  {seconds:8.4f}s '
+            '({per_run:.2f}us per run)'.format(
+                depth=style_depth,
+                runs=len(runs),
+                seconds=seconds,
+                per_run=seconds / len(runs) * 1e6,
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
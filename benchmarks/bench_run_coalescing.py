@@ -0,0 +1,83 @@
+# coding: utf-8
+'''
+Benchmark exporting a document whose paragraphs are split into many runs
+with the same formatting (as word processors do after editing), with and
+without coalescing the runs:
+
+    $ python benchmarks/bench_run_coalescing.py --runs-per-paragraph 2 8 32
+
+Each export after the first reuses the coalesced runs, so both the first
+export of a new exporter and the repeated exports of one are timed.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+from io import BytesIO
+from timeit import default_timer
+
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+RUN = '<r><rPr><b/></rPr><t xml:space="preserve">Word{0} </t></r>'
+
+
+class CoalescingExporter(PyDocXHTMLExporter):
+    coalesce_runs = True
+
+
+def build_document(paragraphs, runs_per_paragraph):
+    paragraph = '<p>{0}</p>'.format(''.join(
+        RUN.format(index) for index in range(runs_per_paragraph)
+    ))
+    document = WordprocessingDocumentFactory()
+    document.add(MainDocumentPart, paragraph * paragraphs)
+    return create_zip_archive(document.to_zip_dict()).getvalue()
+
+
+def best_time(function, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = default_timer()
+        function()
+        seconds.append(default_timer() - start)
+    return min(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--runs-per-paragraph', type=int, nargs='+', default=[2, 8, 32])
+    parser.add_argument('--paragraphs', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for runs_per_paragraph in args.runs_per_paragraph:
+        data = build_document(args.paragraphs, runs_per_paragraph)
+        for exporter_class in (PyDocXHTMLExporter, CoalescingExporter):
+            first = best_time(
+                lambda: exporter_class(BytesIO(data)).export(),
+                args.repeat,
+            )
+            exporter = exporter_class(BytesIO(data))
+            html = exporter.export()
+            repeated = best_time(exporter.export, args.repeat)
+            print(
+                '{runs:>3} runs per paragraph  coalesce={coalesce!s:<5}  '
+                'first {first:7.4f}s  repeated {repeated:7.4f}s  '
+                '{size:>8} bytes'.format(
+                    runs=runs_per_paragraph,
+                    coalesce=exporter_class.coalesce_runs,
+                    first=first,
+                    repeated=repeated,
+                    size=len(html),
+                ),
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+# coding: utf-8
+'''
+Benchmark exporting image-heavy documents to HTML with images embedded (the
+default), linked or skipped, and with footnotes, numbering and styles
+turned off:
+
+    $ python benchmarks/bench_selective_loading.py --images 200
+
+For each variant, the time, the number of bytes decompressed from the docx
+and the peak memory (python 3.4+) of the export are reported.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import os
+from collections import OrderedDict
+from io import BytesIO
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:  # python < 3.4
+    tracemalloc = None
+
+from bench_suite import (
+    DRAWING,
+    FIXTURES,
+    NUMBERING,
+    NUMBERING_LEVEL,
+    STYLE,
+    build_paragraph,
+)
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import (
+    ImagePart,
+    MainDocumentPart,
+    NumberingDefinitionsPart,
+    StyleDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.stats import ConversionStats
+from pydocx.util.zip import create_zip_archive
+
+FIXTURE_NAMES = [
+    'has_image',
+    'read_same_image_multiple_times',
+    'attachment_is_tiff',
+]
+
+VARIANTS = OrderedDict([
+    ('default', dict()),
+    ('images=external', dict(images='external')),
+    ('images=skip', dict(images='skip')),
+    ('text only', dict(
+        images='skip',
+        footnotes=False,
+        numbering=False,
+        styles=False,
+    )),
+])
+
+
+def build_document(images, image_bytes, paragraphs):
+    '''
+    Return the data of a docx with `paragraphs` styled list paragraphs
+    followed by `images` images of `image_bytes` (incompressible) bytes each.
+    '''
+    document = WordprocessingDocumentFactory()
+    document.add(StyleDefinitionsPart, STYLE.format(
+        index=0,
+        based_on='',
+        properties='<b/>',
+    ))
+    document.add(NumberingDefinitionsPart, NUMBERING.format(
+        levels=NUMBERING_LEVEL.format(level=0, num_format='decimal'),
+    ))
+    body = [
+        build_paragraph(
+            index,
+            runs_per_paragraph=3,
+            style_depth=1,
+            list_depth=1,
+            field=False,
+        )
+        for index in range(paragraphs)
+    ]
+    relationships = []
+    media = {}
+    for index in range(images):
+        relationship_id = 'rIdImage{0}'.format(index)
+        target = 'media/image{0}.png'.format(index)
+        relationships.append(document.relationship_format.format(
+            id=relationship_id,
+            type=ImagePart.relationship_type,
+            target=target,
+            target_mode='Internal',
+        ))
+        media['word/' + target] = os.urandom(image_bytes)
+        body.append(DRAWING.format(relationship_id=relationship_id))
+
+    document.add(MainDocumentPart, ''.join(body), ''.join(relationships))
+    zip_dict = document.to_zip_dict()
+    zip_dict.update(media)
+    return create_zip_archive(zip_dict).getvalue()
+
+
+def get_exporter_class(options):
+    return type(str('Exporter'), (PyDocXHTMLExporter,), options)
+
+
+def export(exporter_class, data, stats=None):
+    return exporter_class(BytesIO(data), stats=stats).export()
+
+
+def measure_peak_memory(exporter_class, data):
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        export(exporter_class, data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_variant(data, options, repeat):
+    exporter_class = get_exporter_class(options)
+    seconds = []
+    for _ in range(repeat):
+        start = default_timer()
+        export(exporter_class, data)
+        seconds.append(default_timer() - start)
+    stats = ConversionStats()
+    output = export(exporter_class, data, stats=stats)
+    return OrderedDict([
+        ('seconds', min(seconds)),
+        ('bytes_decompressed', stats.counters.get('bytes_decompressed', 0)),
+        ('output_bytes', len(output.encode('utf-8'))),
+        ('peak_memory_bytes', measure_peak_memory(exporter_class, data)),
+    ])
+
+
+def format_bytes(value):
+    if value is None:
+        return '-'
+    return '{0:.2f}MB'.format(value / 1024.0 / 1024.0)
+
+
+def report(name, data, repeat):
+    print('{name} ({size})'.format(name=name, size=format_bytes(len(data))))
+    for variant, options in VARIANTS.items():
+        result = run_variant(data, options, repeat)
+        print(
+            '  {variant:<16} {seconds:8.4f}s  decompressed {decompressed:>8}  '
+            'output {output:>8}  peak memory {memory:>8}'.format(
+                variant=variant,
+                seconds=result['seconds'],
+                decompressed=format_bytes(result['bytes_decompressed']),
+                output=format_bytes(result['output_bytes']),
+                memory=format_bytes(result['peak_memory_bytes']),
+            ),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--image-bytes', type=int, default=50 * 1024)
+    parser.add_argument('--paragraphs', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    report(
+        'synthetic ({images} images)'.format(images=args.images),
+        build_document(args.images, args.image_bytes, args.paragraphs),
+        args.repeat,
+    )
+    for name in FIXTURE_NAMES:
+        with open(os.path.join(FIXTURES, name + '.docx'), 'rb') as f:
+            report(name, f.read(), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# coding: utf-8
+'''
+Benchmark restoring a document from a snapshot against loading it from the
+docx (unzip, XML parse and model load):
+
+    $ python benchmarks/bench_snapshot.py --paragraphs 20000
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import time
+
+from pydocx.openxml.packaging import MainDocumentPart, WordprocessingDocument
+from pydocx.openxml.packaging.snapshot import (
+    dumps_snapshot,
+    load_document_completely,
+    loads_snapshot,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+PARAGRAPH = '''
+    <p>
+      <pPr><jc val="left"/></pPr>
+      <r><rPr><b/></rPr><t>Paragraph {index}</t></r>
+      <r><t> with some plain text, </t></r>
+      <r><rPr><i/><sz val="24"/></rPr><t>italic text</t></r>
+      <r><tab/><t>and a tab.</t></r>
+    </p>
+'''
+
+
+def build_document(paragraphs):
+    document = WordprocessingDocumentFactory()
+    document.add(MainDocumentPart, ''.join(
+        PARAGRAPH.format(index=index)
+        for index in range(paragraphs)
+    ))
+    return create_zip_archive(document.to_zip_dict())
+
+
+def time_load(docx):
+    docx.seek(0)
+    start = time.time()
+    load_document_completely(WordprocessingDocument(path=docx))
+    return time.time() - start
+
+
+def time_restore(snapshot):
+    start = time.time()
+    loads_snapshot(snapshot)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    docx = build_document(args.paragraphs)
+    snapshot = dumps_snapshot(WordprocessingDocument(path=docx))
+    print('docx is {docx:.1f}MB, snapshot is {snapshot:.1f}MB'.format(
+        docx=len(docx.getvalue()) / 1024.0 / 1024.0,
+        snapshot=len(snapshot) / 1024.0 / 1024.0,
+    ))
+
+    load_seconds = min(time_load(docx) for _ in range(args.repeat))
+    restore_seconds = min(time_restore(snapshot) for _ in range(args.repeat))
+    print('load from docx: {seconds:.3f}s'.format(seconds=load_seconds))
+    print('restore from snapshot: {seconds:.3f}s'.format(
+        seconds=restore_seconds,
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,478 @@
+# coding: utf-8
+'''
+Run the benchmark suite: export synthetic documents and the fixtures in
+tests/fixtures to HTML and Markdown, and report the latency percentiles,
+throughput and peak memory of each as JSON:
+
+    $ python benchmarks/bench_suite.py --output results.json
+    $ make benchmark
+
+The synthetic documents are built from scenarios that each stress one
+construct (paragraphs, runs per paragraph, style inheritance depth, list
+nesting, tables, images and fields), scaled by --scale. Results from
+different commits can be compared with --compare:
+
+    $ python benchmarks/bench_suite.py --compare baseline.json
+'''
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import glob
+import json
+import os
+import platform
+import struct
+import subprocess
+import sys
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from io import BytesIO
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:  # python < 3.4
+    tracemalloc = None
+
+from pydocx import __version__
+from pydocx.exceptions import MalformedDocxException
+from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.openxml.packaging import (
+    ImagePart,
+    MainDocumentPart,
+    NumberingDefinitionsPart,
+    StyleDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.xml import get_xml_backend
+from pydocx.util.zip import create_zip_archive
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+
+EXPORTERS = OrderedDict([
+    ('html', PyDocXHTMLExporter),
+    ('markdown', PyDocXMarkdownExporter),
+])
+
+# The parameters of each synthetic document. Counts (but not depths or sizes)
+# are multiplied by --scale.
+SCENARIOS = OrderedDict([
+    ('paragraphs', dict(paragraphs=2000)),
+    ('runs', dict(paragraphs=100, runs_per_paragraph=50)),
+    ('styles', dict(paragraphs=1000, style_depth=10)),
+    ('lists', dict(paragraphs=1000, list_depth=6)),
+    ('tables', dict(tables=5, table_rows=100, table_columns=10)),
+    ('images', dict(images=100)),
+    ('fields', dict(paragraphs=1000, fields=1000)),
+    ('mixed', dict(
+        paragraphs=1000,
+        runs_per_paragraph=5,
+        style_depth=3,
+        list_depth=3,
+        tables=2,
+        table_rows=20,
+        table_columns=5,
+        images=10,
+        fields=100,
+    )),
+])
+SCALED_PARAMETERS = ('paragraphs', 'tables', 'images', 'fields')
+
+RUN = '<r>{properties}<t xml:space="preserve">Run {index} of some text. </t></r>'
+RUN_PROPERTIES = ['', '<rPr><b/></rPr>', '<rPr><i/></rPr>', '<rPr><u val="single"/></rPr>']  # noqa
+
+FIELD = '''
+    <r><fldChar fldCharType="begin"/></r>
+    <r><instrText> HYPERLINK "http://example.com/{index}" </instrText></r>
+    <r><fldChar fldCharType="separate"/></r>
+    <r><t>link {index}</t></r>
+    <r><fldChar fldCharType="end"/></r>
+'''
+
+DRAWING = '''
+    <p><r><drawing><inline>
+      <graphic><graphicData><pic>
+        <blipFill><blip embed="{relationship_id}"/></blipFill>
+        <spPr><xfrm><ext cx="952500" cy="952500"/></xfrm></spPr>
+      </pic></graphicData></graphic>
+    </inline></drawing></r></p>
+'''
+
+STYLE = '''
+    <style styleId="Style{index}" type="paragraph">
+      <name val="Style {index}"/>
+      {based_on}
+      <rPr>{properties}</rPr>
+    </style>
+'''
+STYLE_PROPERTIES = ['<b/>', '<i/>', '<u val="single"/>', '<caps/>', '<strike/>']
+
+NUMBERING = '''
+    <num numId="1"><abstractNumId val="1"/></num>
+    <abstractNum abstractNumId="1">{levels}</abstractNum>
+'''
+NUMBERING_LEVEL = '<lvl ilvl="{level}"><numFmt val="{num_format}"/></lvl>'
+NUMBERING_FORMATS = ['decimal', 'lowerLetter', 'lowerRoman', 'upperLetter']
+
+
+def build_png(width=10, height=10):
+    '''
+    Return the data of a solid, grayscale PNG image.
+    '''
+    def chunk(chunk_type, data):
+        checksum = zlib.crc32(chunk_type + data) & 0xffffffff
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', checksum)  # noqa
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+    pixels = b''.join(b'\x00' + b'\x80' * width for _ in range(height))
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', header),
+        chunk(b'IDAT', zlib.compress(pixels)),
+        chunk(b'IEND', b''),
+    ])
+
+
+def build_paragraph(index, runs_per_paragraph, style_depth, list_depth, field):
+    properties = []
+    if style_depth:
+        properties.append('<pStyle val="Style{0}"/>'.format(style_depth - 1))
+    if list_depth:
+        properties.append(
+            '<numPr><ilvl val="{0}"/><numId val="1"/></numPr>'.format(
+                index % list_depth,
+            ),
+        )
+    runs = [
+        RUN.format(
+            properties=RUN_PROPERTIES[run % len(RUN_PROPERTIES)],
+            index=run,
+        )
+        for run in range(runs_per_paragraph)
+    ]
+    if field:
+        runs.append(FIELD.format(index=index))
+    return '<p><pPr>{properties}</pPr>{runs}</p>'.format(
+        properties=''.join(properties),
+        runs=''.join(runs),
+    )
+
+
+def build_table(rows, columns):
+    cell = '<tc><p><r><t>{0}</t></r></p></tc>'
+    return '<tbl>{0}</tbl>'.format(''.join(
+        '<tr>{0}</tr>'.format(''.join(
+            cell.format(row * columns + column)
+            for column in range(columns)
+        ))
+        for row in range(rows)
+    ))
+
+
+def build_document(
+    paragraphs=0,
+    runs_per_paragraph=1,
+    style_depth=0,
+    list_depth=0,
+    tables=0,
+    table_rows=0,
+    table_columns=0,
+    images=0,
+    fields=0,
+):
+    '''
+    Return the data of a docx with the given number of paragraphs (each with
+    `runs_per_paragraph` runs, the deepest of a `style_depth` long chain of
+    based on styles, and cycling through `list_depth` list levels), followed
+    by `tables` tables and `images` images. The first `fields` paragraphs end
+    with a complex HYPERLINK field.
+    '''
+    document = WordprocessingDocumentFactory()
+    if style_depth:
+        document.add(StyleDefinitionsPart, ''.join(
+            STYLE.format(
+                index=index,
+                based_on=(
+                    '<basedOn val="Style{0}"/>'.format(index - 1) if index else ''
+                ),
+                properties=STYLE_PROPERTIES[index % len(STYLE_PROPERTIES)],
+            )
+            for index in range(style_depth)
+        ))
+    if list_depth:
+        document.add(NumberingDefinitionsPart, NUMBERING.format(levels=''.join(
+            NUMBERING_LEVEL.format(
+                level=level,
+                num_format=NUMBERING_FORMATS[level % len(NUMBERING_FORMATS)],
+            )
+            for level in range(list_depth)
+        )))
+
+    body = [
+        build_paragraph(
+            index,
+            runs_per_paragraph,
+            style_depth,
+            list_depth,
+            field=index < fields,
+        )
+        for index in range(paragraphs)
+    ]
+    body.extend(
+        build_table(table_rows, table_columns)
+        for _ in range(tables)
+    )
+    relationships = []
+    media = {}
+    for index in range(images):
+        relationship_id = 'rIdImage{0}'.format(index)
+        target = 'media/image{0}.png'.format(index)
+        relationships.append(document.relationship_format.format(
+            id=relationship_id,
+            type=ImagePart.relationship_type,
+            target=target,
+            target_mode='Internal',
+        ))
+        media['word/' + target] = build_png()
+        body.append(DRAWING.format(relationship_id=relationship_id))
+
+    document.add(MainDocumentPart, ''.join(body), ''.join(relationships))
+    zip_dict = document.to_zip_dict()
+    zip_dict.update(media)
+    return create_zip_archive(zip_dict).getvalue()
+
+
+def export(exporter_class, data):
+    output = exporter_class(BytesIO(data)).export()
+    # The Markdown exporter yields its output in pieces
+    return ''.join(output)
+
+
+def get_percentile(values, percentile):
+    '''
+    Return the nearest-rank percentile of the values.
+
+    >>> get_percentile([4, 1, 3, 2], 50)
+    2
+    >>> get_percentile([4, 1, 3, 2], 90)
+    4
+    '''
+    values = sorted(values)
+    rank = int(round(percentile / 100.0 * len(values) + 0.5)) - 1
+    return values[min(max(rank, 0), len(values) - 1)]
+
+
+def measure_peak_memory(exporter_class, data):
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        export(exporter_class, data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmark(name, exporter_name, data, repeat, parameters=None, memory=True):
+    exporter_class = EXPORTERS[exporter_name]
+    latencies = []
+    output = None
+    for _ in range(repeat):
+        start = default_timer()
+        output = export(exporter_class, data)
+        latencies.append(default_timer() - start)
+
+    total_seconds = sum(latencies)
+    result = OrderedDict()
+    result['name'] = name
+    result['format'] = exporter_name
+    result['parameters'] = parameters or {}
+    result['docx_bytes'] = len(data)
+    result['output_bytes'] = len(output.encode('utf-8'))
+    result['repeat'] = repeat
+    result['latency_seconds'] = OrderedDict([
+        ('min', min(latencies)),
+        ('mean', total_seconds / repeat),
+        ('p50', get_percentile(latencies, 50)),
+        ('p90', get_percentile(latencies, 90)),
+        ('p99', get_percentile(latencies, 99)),
+        ('max', max(latencies)),
+    ])
+    result['throughput'] = OrderedDict([
+        ('documents_per_second', repeat / total_seconds),
+        ('docx_megabytes_per_second', repeat * len(data) / total_seconds / 1024 / 1024),  # noqa
+    ])
+    result['peak_memory_bytes'] = None
+    if memory:
+        result['peak_memory_bytes'] = measure_peak_memory(exporter_class, data)
+    return result
+
+
+def get_commit():
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=ROOT,
+            stderr=subprocess.STDOUT,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.decode('ascii').strip()
+
+
+def get_metadata(args):
+    return OrderedDict([
+        ('commit', get_commit()),
+        ('pydocx_version', __version__),
+        ('python_version', platform.python_version()),
+        ('python_implementation', platform.python_implementation()),
+        ('platform', platform.platform()),
+        ('xml_backend', get_xml_backend().name),
+        ('timestamp', datetime.utcnow().isoformat() + 'Z'),
+        ('repeat', args.repeat),
+        ('scale', args.scale),
+    ])
+
+
+def get_scenario_parameters(name, scale):
+    parameters = dict(SCENARIOS[name])
+    for key in SCALED_PARAMETERS:
+        if key in parameters:
+            parameters[key] = max(1, int(parameters[key] * scale))
+    return parameters
+
+
+def run_suite(args, log):
+    results = []
+    for name in args.scenario or SCENARIOS.keys():
+        parameters = get_scenario_parameters(name, args.scale)
+        data = build_document(**parameters)
+        for exporter_name in args.format or EXPORTERS.keys():
+            result = run_benchmark(
+                name,
+                exporter_name,
+                data,
+                args.repeat,
+                parameters=parameters,
+                memory=not args.no_memory,
+            )
+            log(result)
+            results.append(result)
+
+    if args.no_fixtures:
+        return results
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.docx'))):
+        with open(path, 'rb') as f:
+            data = f.read()
+        name = 'fixtures/' + os.path.basename(path)
+        for exporter_name in args.format or EXPORTERS.keys():
+            try:
+                result = run_benchmark(
+                    name,
+                    exporter_name,
+                    data,
+                    args.repeat,
+                    memory=not args.no_memory,
+                )
+            except MalformedDocxException:
+                # Some fixtures are deliberately broken
+                sys.stderr.write('{0}: skipped, malformed\n'.format(name))
+                break
+            log(result)
+            results.append(result)
+    return results
+
+
+def compare(results, baseline):
+    '''
+    Print the ratio of the median latency of each benchmark to the median in
+    the baseline results (lower is faster).
+    '''
+    baseline_latencies = dict(
+        ((result['name'], result['format']), result['latency_seconds']['p50'])
+        for result in baseline['results']
+    )
+    print('{0:<50} {1:>10} {2:>10} {3:>7}'.format(
+        'benchmark', 'baseline', 'p50', 'ratio',
+    ))
+    for result in results:
+        key = (result['name'], result['format'])
+        if key not in baseline_latencies:
+            continue
+        before = baseline_latencies[key]
+        after = result['latency_seconds']['p50']
+        print('{0:<50} {1:>9.4f}s {2:>9.4f}s {3:>7.2f}'.format(
+            '{0} ({1})'.format(*key),
+            before,
+            after,
+            after / before if before else float('inf'),
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=1.0,
+        help='Multiply the counts of the synthetic documents',
+    )
+    parser.add_argument(
+        '--scenario',
+        action='append',
+        choices=list(SCENARIOS.keys()),
+        help='Only run the given scenario (may be repeated)',
+    )
+    parser.add_argument(
+        '--format',
+        action='append',
+        choices=list(EXPORTERS.keys()),
+        help='Only export to the given format (may be repeated)',
+    )
+    parser.add_argument('--no-fixtures', action='store_true')
+    parser.add_argument(
+        '--no-memory',
+        action='store_true',
+        help="Don't measure the peak memory, which exports each document again",
+    )
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument(
+        '--compare',
+        metavar='BASELINE',
+        help='Compare the results to the JSON results of an earlier run',
+    )
+    args = parser.parse_args()
+
+    def log(result):
+        sys.stderr.write('{name} ({format}): p50 {p50:.4f}s\n'.format(
+            name=result['name'],
+            format=result['format'],
+            p50=result['latency_seconds']['p50'],
+        ))
+
+    report = OrderedDict([
+        ('metadata', get_metadata(args)),
+        ('results', run_suite(args, log)),
+    ])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report['results'], json.load(f))
+
+
+if __name__ == '__main__':
+    main()
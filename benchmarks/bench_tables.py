@@ -0,0 +1,113 @@
+# coding: utf-8
+'''
+Benchmark the HTML export of large tables, and of the nested_table_rowspan
+fixture:
+
+    $ python benchmarks/bench_tables.py --rows 1000 --columns 100
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import os
+import time
+
+try:
+    import tracemalloc
+except ImportError:  # python < 3.4
+    tracemalloc = None
+
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures')
+
+CELL = '<tc>{properties}<p><r><t>{text}</t></r></p></tc>'
+
+
+def build_table_document(rows, columns, merge_every=10):
+    '''
+    Return an in-memory docx containing a `rows` by `columns` table. The first
+    column is vertically merged in groups of `merge_every` rows, and the last
+    two columns of every other row are merged horizontally.
+    '''
+    table_rows = []
+    for row in range(rows):
+        cells = []
+        if row % merge_every == 0:
+            merge = '<tcPr><vMerge val="restart"/></tcPr>'
+        else:
+            merge = '<tcPr><vMerge/></tcPr>'
+        cells.append(CELL.format(properties=merge, text=row))
+        last_column = columns
+        if row % 2:
+            last_column -= 1
+        for column in range(1, last_column):
+            properties = ''
+            if row % 2 and column == last_column - 1:
+                properties = '<tcPr><gridSpan val="2"/></tcPr>'
+            cells.append(CELL.format(properties=properties, text=column))
+        table_rows.append('<tr>{0}</tr>'.format(''.join(cells)))
+
+    document = WordprocessingDocumentFactory()
+    document.add(MainDocumentPart, '<tbl>{0}</tbl>'.format(''.join(table_rows)))
+    return create_zip_archive(document.to_zip_dict())
+
+
+def measure_export(path_or_stream, trace_memory=False):
+    if hasattr(path_or_stream, 'seek'):
+        path_or_stream.seek(0)
+    exporter = PyDocXHTMLExporter(path_or_stream)
+    # Load the document up front so only the export is measured
+    exporter.main_document_part.document
+    trace_memory = trace_memory and tracemalloc
+    if trace_memory:
+        tracemalloc.start()
+    start = time.time()
+    exporter.export()
+    seconds = time.time() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def report(label, seconds, peak):
+    line = '{label}: {seconds:.3f}s'.format(label=label, seconds=seconds)
+    if peak is not None:
+        line += ', peak export memory {mb:.1f}MB'.format(mb=peak / 1024.0 / 1024)
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--columns', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Report the peak memory of the export (slows it down)',
+    )
+    args = parser.parse_args()
+
+    docx = build_table_document(args.rows, args.columns)
+    seconds, peak = measure_export(docx, trace_memory=args.trace_memory)
+    report('{0}x{1} table'.format(args.rows, args.columns), seconds, peak)
+
+    fixture = os.path.join(FIXTURES, 'nested_table_rowspan.docx')
+    total = 0
+    for _ in range(args.repeat):
+        seconds, _ = measure_export(fixture)
+        total += seconds
+    report('nested_table_rowspan.docx (x{0})'.format(args.repeat), total, None)
+
+
+if __name__ == '__main__':
+    main()
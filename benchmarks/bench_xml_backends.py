@@ -0,0 +1,101 @@
+# coding: utf-8
+'''
+Benchmark the available XML backends on a large document.xml part.
+
+For each backend, the part is parsed with its namespaces removed (as done by
+OpenXmlPart.root_element), and then loaded into the document model:
+
+    $ python benchmarks/bench_xml_backends.py --paragraphs 20000
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import time
+
+from pydocx.openxml.wordprocessing import Document
+from pydocx.util.xml import (
+    lxml_etree,
+    parse_xml_from_string,
+    set_xml_backend,
+)
+
+DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>'
+)
+
+PARAGRAPH = '''
+    <w:p>
+      <w:pPr><w:pStyle w:val="Normal"/><w:jc w:val="left"/></w:pPr>
+      <w:r><w:rPr><w:b/></w:rPr><w:t>Paragraph {index}</w:t></w:r>
+      <w:r><w:t xml:space="preserve"> with some plain text, </w:t></w:r>
+      <w:r><w:rPr><w:i/><w:sz w:val="24"/></w:rPr><w:t>italic text</w:t></w:r>
+      <w:r><w:tab/><w:t>and a tab.</w:t></w:r>
+    </w:p>
+'''
+
+
+def build_document_xml(paragraphs):
+    '''
+    Return the bytes of a document.xml part (with namespaces) containing
+    `paragraphs` paragraphs.
+    '''
+    body = ''.join(
+        PARAGRAPH.format(index=index)
+        for index in range(paragraphs)
+    )
+    document_xml = DOCUMENT.format(
+        namespace='http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+        body=body,
+    )
+    return document_xml.encode('utf-8')
+
+
+def time_backend(backend, document_xml):
+    previous_backend = set_xml_backend(backend)
+    try:
+        start = time.time()
+        root = parse_xml_from_string(document_xml, remove_namespaces=True)
+        parsed = time.time()
+        Document.load(root)
+        loaded = time.time()
+    finally:
+        set_xml_backend(previous_backend)
+    return parsed - start, loaded - parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    backends = ['etree']
+    if lxml_etree is None:
+        print('lxml is not installed, only ElementTree is measured')
+    else:
+        backends.append('lxml')
+
+    document_xml = build_document_xml(args.paragraphs)
+    print('document.xml is {size:.1f}MB'.format(
+        size=len(document_xml) / 1024.0 / 1024.0,
+    ))
+    for backend in backends:
+        timings = [
+            time_backend(backend, document_xml)
+            for _ in range(args.repeat)
+        ]
+        parse_seconds, load_seconds = min(timings)
+        print('{backend}: parse {parse:.3f}s, load {load:.3f}s'.format(
+            backend=backend,
+            parse=parse_seconds,
+            load=load_seconds,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,17 +4,22 @@ from __future__ import (
     unicode_literals,
 )
 
+import json
 import sys
 import logging
+from collections import OrderedDict
 
 from pydocx import PyDocX
+from pydocx.export.profiler import ExportProfiler
+from pydocx.util.limits import ResourceLimits
+from pydocx.util.stats import ConversionStats
 
 
-def convert(output_type, docx_path, output_path):
+def convert(output_type, docx_path, output_path, stats=None, profiler=None):
     if output_type == '--html':
-        output = PyDocX.to_html(docx_path)
+        output = PyDocX.to_html(docx_path, stats=stats, profiler=profiler)
     elif output_type == '--markdown':
-        output = PyDocX.to_markdown(docx_path)
+        output = PyDocX.to_markdown(docx_path, stats=stats, profiler=profiler)
     else:
         print('Only valid output formats are --html and --markdown')
         return 2
@@ -23,8 +28,24 @@ def convert(output_type, docx_path, output_path):
     return 0
 
 
+def print_inspection(args):
+    if len(args) != 1:
+        return usage()
+    # The document may be untrusted, so it is limited like the conversions
+    # of `pydocx serve` (with its default options)
+    limits = ResourceLimits(max_total_bytes=1024 * 1024 * 1024, timeout=60)
+    report = PyDocX.inspect(args[0], limits=limits)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
 def usage():
-    print('Usage: pydocx --html|--markdown input.docx output')
+    print(
+        'Usage: pydocx [--stats] [--profile] --html|--markdown '
+        'input.docx output\n'
+        '       pydocx --inspect input.docx\n'
+        '       pydocx serve [--help]'
+    )
     return 1
 
 
@@ -34,6 +55,24 @@ def main(args=None):
     if args is None:
         return usage()
 
+    if args[:1] == ['serve']:
+        from pydocx import server
+        return server.main(args[1:])
+
+    if args[:1] == ['--inspect']:
+        return print_inspection(args[1:])
+
+    # Both options print a JSON report of the conversion once it is done
+    stats = None
+    if '--stats' in args:
+        # The conversion's timings and counters
+        stats = ConversionStats(trace_allocations=True)
+    profiler = None
+    if '--profile' in args:
+        # The time spent exporting each node type (under "profile")
+        profiler = ExportProfiler()
+    args = [arg for arg in args if arg not in ('--stats', '--profile')]
+
     try:
         output_type = args[0]
         docx_path = args[1]
@@ -41,7 +80,21 @@ def main(args=None):
     except IndexError:
         return usage()
 
-    return convert(output_type, docx_path, output_path)
+    result = convert(
+        output_type,
+        docx_path,
+        output_path,
+        stats=stats,
+        profiler=profiler,
+    )
+    if result == 0 and (stats is not None or profiler is not None):
+        report = OrderedDict()
+        if stats is not None:
+            report.update(stats.to_dict())
+        if profiler is not None:
+            report['profile'] = profiler.to_dict()
+        print(json.dumps(report, indent=2))
+    return result
 
 
 def cli():
@@ -7,3 +7,24 @@ from __future__ import (
 
 class MalformedDocxException(Exception):
     pass
+
+
+class InvalidSnapshotException(Exception):
+    pass
+
+
+class ResourceLimitExceededException(Exception):
+    '''
+    Raised when converting a document exceeds one of its ResourceLimits. The
+    name of the limit and its value are available as `limit_name` and
+    `limit`.
+    '''
+
+    def __init__(self, message, limit_name=None, limit=None):
+        super(ResourceLimitExceededException, self).__init__(message)
+        self.limit_name = limit_name
+        self.limit = limit
+
+    def __reduce__(self):
+        # e.g. when it is raised in a worker process
+        return (self.__class__, (self.args[0], self.limit_name, self.limit))
@@ -6,7 +6,9 @@ from __future__ import (
     unicode_literals,
 )
 
+import threading
 import xml.sax.saxutils
+from collections import OrderedDict
 
 from pydocx.constants import TWIPS_PER_POINT
 from pydocx.exceptions import MalformedDocxException
@@ -15,23 +17,99 @@ from pydocx.export.numbering_span import (
     NumberingSpan,
     NumberingSpanBuilder,
 )
+from pydocx.export import incremental, parallel, preview, run_coalescing
+from pydocx.export.context import RenderContext
 from pydocx.openxml import markup_compatibility, vml, wordprocessing
-from pydocx.openxml.packaging import WordprocessingDocument
+from pydocx.openxml.packaging import (
+    FootnotesPart,
+    NumberingDefinitionsPart,
+    StyleDefinitionsPart,
+    WordprocessingDocument,
+)
+from pydocx.util.limits import enforce_budget
+from pydocx.util.stats import activate_stats, stats_phase
 
 
 class PyDocXExporter(object):
     numbering_span_builder_class = NumberingSpanBuilder
 
-    def __init__(self, path):
+    # The class of the state of each export. See `pydocx.export.context`.
+    render_context_class = RenderContext
+
+    # If enabled, sequential runs within a paragraph that have the same
+    # formatting are merged together (along with their text nodes) before the
+    # paragraph is exported. See `pydocx.export.run_coalescing`.
+    coalesce_runs = False
+
+    # Set to False to ignore the footnotes, numbering (lists) or styles of
+    # the document, e.g. when only its text and structure are needed. Their
+    # parts are then never decompressed or parsed. These may also be passed
+    # to the constructor.
+    footnotes = True
+    numbering = True
+    styles = True
+
+    # If enabled, the fields of the document's models are only decoded from
+    # the XML the first time they are read, so that the fields the export
+    # never reads are never decoded. See `XmlModel.load`.
+    lazy_models = False
+
+    # The pydocx.util.limits.ResourceLimits applied to every export, unless
+    # other limits are passed to the constructor
+    limits = None
+
+    # If greater than 1, the top level blocks of bodies with at least
+    # `parallel_render_min_blocks` blocks are rendered in this many
+    # processes (on platforms that can fork). See `pydocx.export.parallel`.
+    render_processes = 1
+    parallel_render_min_blocks = 100
+
+    # The pydocx.util.preview.PreviewLimits of every export, unless others are
+    # passed to the constructor. If set, only the start of the document is
+    # loaded and exported.
+    preview = None
+
+    def __init__(
+        self,
+        path,
+        stats=None,
+        profiler=None,
+        limits=None,
+        block_cache=None,
+        preview=None,
+        footnotes=None,
+        numbering=None,
+        styles=None,
+    ):
         self.path = path
+        # If set to a pydocx.util.stats.ConversionStats, the timings and
+        # counters of the export are collected into it
+        self.stats = stats
+        # If set to a pydocx.export.profiler.ExportProfiler, the time spent
+        # exporting each node type is recorded into it
+        self.profiler = profiler
+        # A pydocx.util.limits.ResourceLimits enforced while exporting
+        if limits is not None:
+            self.limits = limits
+        # If set to a pydocx.export.incremental.BlockCache, the output of the
+        # top level blocks of the body is cached, and only the blocks that
+        # aren't cached yet are rendered
+        self.block_cache = block_cache
+        if preview is not None:
+            self.preview = preview
+        if footnotes is not None:
+            self.footnotes = footnotes
+        if numbering is not None:
+            self.numbering = numbering
+        if styles is not None:
+            self.styles = styles
         self._document = None
+        self.clear_document_caches()
+        # Held while the document is loaded (see `_export`)
+        self._document_lock = threading.RLock()
         self._page_width = None
-        self.first_pass = False
-
-        self.footnote_tracker = []
-
-        self.captured_runs = None
-        self.complex_field_runs = []
+        # The state of the running (or last) export of each thread
+        self._local = threading.local()
 
         self.node_type_to_export_func_map = {
             wordprocessing.Document: self.export_document,
@@ -76,15 +154,79 @@ class PyDocXExporter(object):
             'HYPERLINK': getattr(self, 'export_field_hyperlink', None),
         }
 
+    def create_render_context(self):
+        return self.render_context_class()
+
+    @property
+    def context(self):
+        '''
+        The render context of the export running in this thread (or of the
+        last one). Every thread has its own, so one exporter may export in
+        several threads at once.
+        '''
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = self.context = self.create_render_context()
+        return context
+
+    @context.setter
+    def context(self, context):
+        self._local.context = context
+
+    # Shortcuts to the state of the current export, which is kept in its
+    # render context
+
+    @property
+    def first_pass(self):
+        return self.context.first_pass
+
+    @property
+    def resource_budget(self):
+        return self.context.resource_budget
+
+    @property
+    def footnote_tracker(self):
+        return self.context.footnote_tracker
+
     @property
     def document(self):
         if not self._document:
-            self.document = self.load_document()
+            with self._document_lock:
+                if not self._document:
+                    self.document = self.load_document()
         return self._document
 
     @document.setter
     def document(self, document):
+        if document is not None:
+            document.excluded_part_types = self.get_excluded_part_types()
+            document.preview = self.preview
+            document.lazy_models = self.lazy_models
         self._document = document
+        self.clear_document_caches()
+
+    def clear_document_caches(self):
+        '''
+        Forget what was derived from the document for its exports, when
+        another document is set. Subclasses that keep data of their own about
+        the document must clear it here as well.
+        '''
+        # The children of each paragraph of the document with its runs
+        # coalesced (see `get_coalesced_children`)
+        self._coalesced_children = {}
+        # The numbering spans of each sequence of blocks of the document (see
+        # `get_numbering_spans`)
+        self._numbering_spans = {}
+
+    def get_excluded_part_types(self):
+        excluded_part_types = set()
+        if not self.footnotes:
+            excluded_part_types.add(FootnotesPart)
+        if not self.numbering:
+            excluded_part_types.add(NumberingDefinitionsPart)
+        if not self.styles:
+            excluded_part_types.add(StyleDefinitionsPart)
+        return frozenset(excluded_part_types)
 
     def load_document(self):
         self.document = WordprocessingDocument(path=self.path)
@@ -105,21 +247,57 @@ class PyDocXExporter(object):
             return self.main_document_part.numbering_definitions_part
 
     def export(self):
-        if self.main_document_part is None:
-            raise MalformedDocxException
-        document = self.main_document_part.document
-        if document:
+        context = self.create_render_context()
+        if self.limits is not None:
+            context.resource_budget = self.limits.create_budget()
+        results = self._export_with_stats()
+        while True:
+            # Another export (of this exporter or another one) may have run
+            # in this thread while this one was suspended, so its context,
+            # budget and stats are made active again
+            self.context = context
+            with enforce_budget(context.resource_budget), activate_stats(self.stats):
+                try:
+                    result = next(results)
+                except StopIteration:
+                    return
+            yield result
+
+    def _export_with_stats(self):
+        if self.stats is None:
+            for result in self._export():
+                yield result
+            return
+        with self.stats.collect():
+            for result in self._export():
+                yield result
+
+    def _export(self):
+        # The parts and models of the document are loaded on first access,
+        # and the first pass converts its complex fields, so exports in other
+        # threads wait until this one is past them. Rendering only reads the
+        # document, except for building the numbering spans, which is done
+        # once under the same lock (see `get_numbering_spans`).
+        with self._document_lock:
+            if self.main_document_part is None:
+                raise MalformedDocxException
+            document = self.main_document_part.document
+            if not document:
+                return
             # process the document in two passes, since there are some cases
             # where we can't know what to do until we look at the entire
             # document (e.g. fields)
             # In the first pass, discard any generated results
-            self.first_pass = True
-            self._first_pass_export()
+            self.context.first_pass = True
+            with stats_phase('first_pass'):
+                self._first_pass_export()
 
-            self._post_first_pass_processing()
+            with stats_phase('post_first_pass'):
+                self._post_first_pass_processing()
 
-            # actually render the results
-            self.first_pass = False
+        # actually render the results
+        self.context.first_pass = False
+        with stats_phase('render'):
             for result in self.export_node(document):
                 yield result
 
@@ -133,7 +311,8 @@ class PyDocXExporter(object):
         self._convert_complex_fields_into_simple_fields()
 
     def _convert_complex_fields_into_simple_fields(self):
-        if not self.complex_field_runs:
+        complex_field_runs = self.context.complex_field_runs
+        if not complex_field_runs:
             return
 
         fields = []
@@ -151,7 +330,7 @@ class PyDocXExporter(object):
 
         # First create all the necessary simple fields and group the runs into
         # their simple fields.
-        for run in self.complex_field_runs:
+        for run in complex_field_runs:
             for child in run.children:
                 if field is not None and previous_run is not None:
                     if previous_run.parent is not run.parent:
@@ -185,35 +364,55 @@ class PyDocXExporter(object):
                     runs_to_remove.add(run)
             previous_run = run
 
-        # Next, remove all of the runs from the run's current parent, and
-        # inject the field in their place.
+        # Next, group the fields by the parent of their first run, so that
+        # each parent only needs to have its children rebuilt once regardless
+        # of how many fields it contains.
+        fields_by_parent = OrderedDict()
         for field in fields:
-            runs_to_remove = runs_to_remove_by_field.get(field, set())
             if not field.children:
                 continue
-            first_run = field.children[0]
-            previous_parent_new_children = []
-            for child in first_run.parent.children:
-                if child is first_run:
+            parent = field.children[0].parent
+            fields_by_parent.setdefault(parent, []).append(field)
+
+        # Finally, remove all of the runs from each parent, and inject the
+        # fields in their place.
+        for parent, parent_fields in fields_by_parent.items():
+            field_by_first_run = {}
+            runs_to_remove = set()
+            for field in parent_fields:
+                field_by_first_run[field.children[0]] = field
+                runs_to_remove.update(runs_to_remove_by_field.get(field, ()))
+
+            new_children = []
+            for child in parent.children:
+                field = field_by_first_run.get(child)
+                if field is not None:
                     # This is the insertion point of the new field
-                    previous_parent_new_children.append(field)
+                    new_children.append(field)
                 elif child not in runs_to_remove:
-                    previous_parent_new_children.append(child)
-            first_run.parent.children = previous_parent_new_children
+                    new_children.append(child)
+            parent.children = new_children
 
-            # If we don't do this, the field's parent will be None. That will
-            # break the hierarchy.
-            field.parent = first_run.parent
+            for field in parent_fields:
+                # If we don't do this, the field's parent will be None. That
+                # will break the hierarchy.
+                field.parent = parent
 
-            # Update the run parent links to point to the field, since the
-            # field is now the run's new parent.
-            for run in field.children:
-                run.parent = field
+                # Update the run parent links to point to the field, since the
+                # field is now the run's new parent.
+                for run in field.children:
+                    run.parent = field
 
     def export_node(self, node):
+        resource_budget = self.context.resource_budget
+        if resource_budget is not None:
+            resource_budget.check_deadline()
         caller = self.node_type_to_export_func_map.get(type(node))
         if callable(caller):
-            results = caller(node)
+            if self.profiler is None:
+                results = caller(node)
+            else:
+                results = self.profiler.profile(node, caller)
             if results is not None:
                 for result in results:
                     yield result
@@ -278,25 +477,86 @@ class PyDocXExporter(object):
                 previous_was_empty = empty
 
     def yield_numbering_spans(self, items):
-        if self.first_pass:
+        if self.context.first_pass or not self.numbering:
             # If we're in the first pass, just yield back the items we are
             # passed in instead of processing for the numbering spans, since
             # doing that is destructive and will cause the second pass to not
-            # convert properly.
+            # convert properly. Without numbering, there are no spans.
             for item in items:
                 yield item
             return
-        builder = self.numbering_span_builder_class(items, process_components=True)
-        numbering_spans = builder.get_numbering_spans()
-        for item in numbering_spans:
+        for item in self.get_numbering_spans(items):
             yield item
 
+    def get_numbering_spans(self, items):
+        '''
+        Return the given items with the paragraphs of lists grouped into
+        numbering spans. Building the spans modifies the paragraphs (e.g. the
+        numbers of faked lists are removed from their text), so the spans of
+        each sequence of items are built once, while the document is
+        locked, and reused by every later export of the document.
+        '''
+        key = tuple(items)
+        numbering_spans = self._numbering_spans.get(key)
+        if numbering_spans is not None:
+            return numbering_spans
+        with self._document_lock:
+            numbering_spans = self._numbering_spans.get(key)
+            if numbering_spans is None:
+                with stats_phase('numbering_spans'):
+                    builder = self.numbering_span_builder_class(
+                        items,
+                        process_components=True,
+                    )
+                    numbering_spans = builder.get_numbering_spans()
+                self._numbering_spans[key] = numbering_spans
+        return numbering_spans
+
     def export_body(self, body):
         children = self.yield_body_children(body)
+        if not self.context.first_pass and self.preview is not None:
+            return preview.export_blocks(self, list(children))
+        if not self.context.first_pass and self.can_cache_blocks():
+            return incremental.export_blocks(self, list(children))
+        if not self.context.first_pass and self.can_render_in_parallel():
+            return parallel.export_blocks(self, list(children))
         return self.yield_nested(children, self.export_node)
 
+    def can_render_in_parallel(self):
+        # The profiler only sees the nodes exported by this process
+        return self.render_processes > 1 and self.profiler is None
+
+    def can_cache_blocks(self):
+        return self.block_cache is not None
+
+    def get_block_cache_namespace(self):
+        '''
+        Return a string that identifies the exporter and its configuration,
+        which is part of the key of each block it caches. Exporters with
+        other options that change the output of blocks must include them.
+        '''
+        return repr((
+            type(self).__module__,
+            type(self).__name__,
+            self.coalesce_runs,
+            self.footnotes,
+            self.numbering,
+            self.styles,
+            self.page_width,
+        ))
+
+    def get_result_text(self, result):
+        '''
+        Return the text of a single result yielded by `export_node`.
+        '''
+        return result
+
     def yield_body_children(self, body):
-        return self.yield_numbering_spans(body.children)
+        children = body.children
+        if self.preview is not None and self.preview.max_blocks is not None:
+            # The body may have been loaded in full (e.g. from a snapshot)
+            children = children[:self.preview.max_blocks]
+        return self.yield_numbering_spans(children)
 
     def export_paragraph(self, paragraph):
         children = self.yield_paragraph_children(paragraph)
@@ -306,9 +566,24 @@ class PyDocXExporter(object):
         return results
 
     def yield_paragraph_children(self, paragraph):
-        for child in paragraph.children:
+        children = paragraph.children
+        if self.coalesce_runs and not self.context.first_pass:
+            children = self.get_coalesced_children(paragraph)
+        for child in children:
             yield child
 
+    def get_coalesced_children(self, paragraph):
+        '''
+        Return the children of the paragraph with its runs coalesced (see
+        `pydocx.export.run_coalescing`). The paragraph isn't modified, and
+        the children are derived once for every export of the document.
+        '''
+        children = self._coalesced_children.get(paragraph)
+        if children is None:
+            children = run_coalescing.coalesce_runs(paragraph)
+            self._coalesced_children[paragraph] = children
+        return children
+
     def get_paragraph_styles_to_apply(self, paragraph):
         properties = paragraph.effective_properties
         property_rules = [
@@ -335,11 +610,10 @@ class PyDocXExporter(object):
         pass
 
     def export_run(self, run):
-        if self.first_pass:
-            if self.captured_runs is not None:
-                self.captured_runs.append(run)
+        if self.context.first_pass:
+            if self.context.captured_runs is not None:
+                self.context.captured_runs.append(run)
 
-        # TODO squash multiple sequential text nodes into one?
         results = self.yield_nested(run.children, self.export_node)
         if run.effective_properties:
             results = self.export_run_apply_properties(run, results)
@@ -453,13 +727,21 @@ class PyDocXExporter(object):
         return self.yield_nested(deleted_run.children, self.export_node)
 
     def export_footnote_reference(self, footnote_reference):
-        if self.first_pass:
+        if self.context.first_pass or not self.footnotes:
             return
 
-        if footnote_reference.footnote is None:
+        # The footnotes are loaded on first access, which exports in other
+        # threads may do at the same time
+        with self._document_lock:
+            footnote = footnote_reference.footnote
+        if footnote is None:
+            return
+        footnote_tracker = self.context.footnote_tracker
+        footnote_tracker.append(footnote_reference)
+        if self.context.footnote_ordinal_placeholder is not None:
+            yield self.context.footnote_ordinal_placeholder
             return
-        self.footnote_tracker.append(footnote_reference)
-        footnote_index = len(self.footnote_tracker)
+        footnote_index = len(footnote_tracker)
         yield '{0}'.format(footnote_index)
 
     def export_footnote(self, footnote):
@@ -468,9 +750,10 @@ class PyDocXExporter(object):
         return self.yield_nested(footnote.children, self.export_node)
 
     def export_footnotes(self):
-        if not self.footnote_tracker:
+        footnote_tracker = self.context.footnote_tracker
+        if not footnote_tracker:
             return
-        for footnote_reference in self.footnote_tracker:
+        for footnote_reference in footnote_tracker:
             footnote = footnote_reference.footnote
             if footnote:
                 for result in self.export_node(footnote):
@@ -532,12 +815,13 @@ class PyDocXExporter(object):
         return default_results
 
     def export_field_char(self, field_char):
-        if self.first_pass:
+        context = self.context
+        if context.first_pass:
             if field_char.is_type_begin():
-                self.captured_runs = [field_char.parent]
-            elif field_char.is_type_end() and self.captured_runs is not None:
-                self.complex_field_runs.extend(self.captured_runs)
-                self.captured_runs = None
+                context.captured_runs = [field_char.parent]
+            elif field_char.is_type_end() and context.captured_runs is not None:
+                context.complex_field_runs.extend(context.captured_runs)
+                context.captured_runs = None
             return
 
     def export_field_code(self, field_code):
@@ -550,7 +834,10 @@ class PyDocXExporter(object):
         return self.yield_nested(textbox_content.children, self.export_node)
 
     def export_markup_compatibility_alternate_content(self, alternate_content):
-        if self.first_pass:
+        # Parts resolve AlternateContent while loading (see
+        # OpenXmlPart.alternate_content), so this is only reached for models
+        # that were loaded without selecting a branch.
+        if self.context.first_pass:
             new_parent_children = []
             for child in alternate_content.parent.children:
                 # AlternateContent has two kinds of children: Choice and
@@ -0,0 +1,59 @@
+# coding: utf-8
+'''
+The state of a single export.
+
+An exporter's configuration (its class attributes and constructor options)
+doesn't change while it exports, but every export accumulates state as the
+document is traversed: which pass is running, the footnotes referenced so
+far, the runs of complex fields, and so on. That state is kept in a
+RenderContext, which `PyDocXExporter.export` creates for each export and
+which the export methods reach as `self.context`. The context is kept per
+thread, so an exporter may export in several threads at once.
+
+Exporters that need more state subclass RenderContext and set their
+`render_context_class`:
+
+class MyRenderContext(RenderContext):
+    def __init__(self):
+        super(MyRenderContext, self).__init__()
+        self.seen_bookmarks = set()
+
+class MyExporter(PyDocXHTMLExporter):
+    render_context_class = MyRenderContext
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from collections import OrderedDict
+
+
+class RenderContext(object):
+    def __init__(self):
+        # True while the first pass (whose results are discarded) runs
+        self.first_pass = False
+        # The ResourceBudget of the export, if it is limited
+        self.resource_budget = None
+        # The footnote references rendered so far, in order
+        self.footnote_tracker = []
+        # If set, footnote references are rendered with this instead of their
+        # ordinal (see `pydocx.export.incremental`)
+        self.footnote_ordinal_placeholder = None
+        # The runs of the complex field being captured during the first pass,
+        # and the runs of all of the complete complex fields
+        self.captured_runs = None
+        self.complex_field_runs = []
+
+
+class HtmlRenderContext(RenderContext):
+    def __init__(self):
+        super(HtmlRenderContext, self).__init__()
+        # Maps each interned style fragment to its generated class name
+        self.style_classes = OrderedDict()
+        # The rendered HTML of the tags of the export, by HtmlTag cache key
+        self.rendered_html = {}
+        # The pydocx.openxml.wordprocessing.table.TableGrid of each table
+        # being rendered
+        self.table_grids = {}
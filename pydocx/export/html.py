@@ -20,6 +20,7 @@ from pydocx.constants import (
     EMUS_PER_PIXEL
 )
 from pydocx.export.base import PyDocXExporter
+from pydocx.export.context import HtmlRenderContext
 from pydocx.export.numbering_span import NumberingItem
 from pydocx.openxml import wordprocessing
 from pydocx.util.uri import uri_is_external
@@ -92,9 +93,54 @@ def is_not_empty_and_not_only_whitespace(gen):
         pass
 
 
+class HtmlAttributes(dict):
+    '''
+    The attributes of an HtmlTag. They can't be changed, since tags (e.g.
+    TABLE_TAG) are shared by every export.
+    '''
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('HtmlTag attributes are immutable')
+
+    def __reduce__(self):
+        return (HtmlAttributes, (dict(self),))
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+
 class HtmlTag(object):
+    '''
+    An HTML tag, which is immutable (including its attributes) so that
+    instances can be shared; to change the attributes of a tag, create a new
+    one. The HTML for a tag is rendered once per instance. `to_html` may also
+    be given a cache (the HTML exporter passes one per export), so that the
+    attributes aren't sorted and formatted again for equal tags that are
+    created repeatedly.
+    '''
+
+    __slots__ = (
+        'tag',
+        'allow_self_closing',
+        'attrs',
+        'closed',
+        'allow_whitespace',
+        '_html',
+    )
+
     closed_tag_format = '</{tag}>'
 
+    # The closing tag for each tag name, which is shared by every export.
+    # It is only added to with setdefault, which is atomic, so threads that
+    # close the same tag at once get the same instance.
+    closing_tags = {}
+
     def __init__(
             self,
             tag,
@@ -103,11 +149,16 @@ class HtmlTag(object):
             allow_whitespace=False,
             **attrs
     ):
-        self.tag = tag
-        self.allow_self_closing = allow_self_closing
-        self.attrs = attrs
-        self.closed = closed
-        self.allow_whitespace = allow_whitespace
+        set_attribute = super(HtmlTag, self).__setattr__
+        set_attribute('tag', tag)
+        set_attribute('allow_self_closing', allow_self_closing)
+        set_attribute('attrs', HtmlAttributes(attrs))
+        set_attribute('closed', closed)
+        set_attribute('allow_whitespace', allow_whitespace)
+        set_attribute('_html', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('HtmlTag instances are immutable')
 
     def apply(self, results, allow_empty=True):
         if not allow_empty:
@@ -115,25 +166,64 @@ class HtmlTag(object):
             if results is None:
                 return
 
-        sequence = [[self]]
+        yield self
+
         if results is not None:
-            sequence.append(results)
+            for result in results:
+                yield result
 
         if not self.allow_self_closing:
-            sequence.append([self.close()])
-
-        results = chain(*sequence)
-
-        for result in results:
-            yield result
+            yield self.close()
 
     def close(self):
-        return HtmlTag(
-            tag=self.tag,
-            closed=True,
+        closing_tag = self.closing_tags.get(self.tag)
+        if closing_tag is None:
+            closing_tag = self.closing_tags.setdefault(
+                self.tag,
+                HtmlTag(tag=self.tag, closed=True),
+            )
+        return closing_tag
+
+    def get_cache_key(self):
+        '''
+        Return the key of the rendered HTML of the tag in a cache passed to
+        `to_html`, or None if it can't be cached (e.g. if the value of an
+        attribute isn't hashable).
+        '''
+        try:
+            attrs = frozenset(self.attrs.items())
+        except TypeError:
+            return None
+        return (
+            self.__class__,
+            self.tag,
+            self.closed,
+            self.allow_self_closing,
+            attrs,
         )
 
-    def to_html(self):
+    def to_html(self, cache=None):
+        '''
+        Return the HTML of the tag. If given, `cache` is a dict in which the
+        HTML of equal tags is kept.
+        '''
+        html = self._html
+        if html is not None:
+            return html
+        key = None
+        if cache is not None:
+            key = self.get_cache_key()
+        if key is not None:
+            html = cache.get(key)
+        if html is None:
+            html = self.render_html()
+            if key is not None:
+                cache[key] = html
+        # Threads that render a shared tag at once set the same HTML
+        super(HtmlTag, self).__setattr__('_html', html)
+        return html
+
+    def render_html(self):
         if self.closed is True:
             return self.closed_tag_format.format(tag=self.tag)
         else:
@@ -154,11 +244,77 @@ class HtmlTag(object):
         return convert_dictionary_to_html_attributes(self.attrs)
 
 
+# Tags that don't depend on the content of the document are shared between
+# all of the elements (and exporters) that use them.
+PARAGRAPH_TAG = HtmlTag('p')
+BOLD_TAG = HtmlTag('strong')
+ITALIC_TAG = HtmlTag('em')
+SUPERSCRIPT_TAG = HtmlTag('sup')
+SUBSCRIPT_TAG = HtmlTag('sub')
+UNDERLINE_TAG = HtmlTag('span', **{'class': 'pydocx-underline'})
+CAPS_TAG = HtmlTag('span', **{'class': 'pydocx-caps'})
+SMALL_CAPS_TAG = HtmlTag('span', **{'class': 'pydocx-small-caps'})
+STRIKE_TAG = HtmlTag('span', **{'class': 'pydocx-strike'})
+HIDDEN_TAG = HtmlTag('span', **{'class': 'pydocx-hidden'})
+DELETE_TAG = HtmlTag('span', **{'class': 'pydocx-delete'})
+INSERT_TAG = HtmlTag('span', **{'class': 'pydocx-insert'})
+TAB_TAG = HtmlTag('span', allow_whitespace=True, **{'class': 'pydocx-tab'})
+BREAK_TAG = HtmlTag('br', allow_whitespace=True, allow_self_closing=True)
+PAGE_BREAK_TAG = HtmlTag('hr', allow_whitespace=True, allow_self_closing=True)
+TABLE_TAG = HtmlTag('table', border='1')
+TABLE_ROW_TAG = HtmlTag('tr')
+TABLE_CELL_TAG = HtmlTag('td')
+LIST_ITEM_TAG = HtmlTag('li')
+
+
 class PyDocXHTMLExporter(PyDocXExporter):
+    render_context_class = HtmlRenderContext
+
+    # If enabled, inline style attributes are replaced by generated classes
+    # (pydocx-s0, pydocx-s1, ...) that are defined in the style block, one for
+    # each distinct style. Since the classes are only known once the body has
+    # been rendered, the body is rendered before the head in this mode.
+    intern_styles = False
+
+    # How images that are stored within the document are exported:
+    # 'inline' - embedded in the HTML as data URIs
+    # 'external' - referenced by their path within the docx (see
+    #              `get_external_image_source`), without reading their data
+    # 'skip' - not exported at all
+    # This may also be passed to the constructor.
+    images = 'inline'
+    image_modes = ('inline', 'external', 'skip')
+
+    # The pydocx.export.images.ImageProcessor of every export, unless another
+    # is passed to the constructor. If set, inline images are resized to
+    # their displayed size, and transcoded if browsers can't show them.
+    image_processor = None
+
+    # Models whose children are exported in place, so that any text within
+    # them ends up in the results of the model. See `has_visible_text`.
+    text_container_types = (
+        wordprocessing.Paragraph,
+        wordprocessing.Run,
+        wordprocessing.Hyperlink,
+        wordprocessing.SmartTagRun,
+        wordprocessing.InsertedRun,
+        wordprocessing.SimpleField,
+        wordprocessing.SdtContentRun,
+        wordprocessing.Footnote,
+    )
+
     def __init__(self, *args, **kwargs):
+        image_processor = kwargs.pop('image_processor', None)
+        images = kwargs.pop('images', None)
         super(PyDocXHTMLExporter, self).__init__(*args, **kwargs)
-        self.table_cell_rowspan_tracking = {}
-        self.in_table_cell = False
+        if image_processor is not None:
+            self.image_processor = image_processor
+        if images is not None:
+            self.images = images
+        if self.images not in self.image_modes:
+            raise ValueError('Unknown images mode: {0}'.format(self.images))
+        # Formatted style fragments, keyed by the items of the style dict
+        self.style_fragments = {}
         self.heading_level_conversion_map = {
             'heading 1': 'h1',
             'heading 2': 'h2',
@@ -198,22 +354,86 @@ class PyDocXHTMLExporter(PyDocXExporter):
                 convert_dictionary_to_style_fragment(definition),
             ))
 
+        for fragment, class_name in self.context.style_classes.items():
+            result.append('.%s {%s}' % (class_name, fragment))
+
         tag = HtmlTag('style')
         return tag.apply(''.join(result))
 
     def meta(self):
         yield HtmlTag('meta', charset='utf-8', allow_self_closing=True)
 
+    def get_style_fragment(self, style):
+        key = frozenset(style.items())
+        fragment = self.style_fragments.get(key)
+        if fragment is None:
+            fragment = convert_dictionary_to_style_fragment(style)
+            self.style_fragments[key] = fragment
+        return fragment
+
+    def get_style_attrs(self, style):
+        '''
+        Return the HTML attributes that apply the given style dictionary to a
+        tag: either an inline style, or if `intern_styles` is enabled, a
+        generated class.
+        '''
+        fragment = self.get_style_fragment(style)
+        # The results of the first pass are discarded, so there's no need to
+        # generate classes for them
+        if not self.intern_styles or self.context.first_pass:
+            return {'style': fragment}
+        style_classes = self.context.style_classes
+        class_name = style_classes.get(fragment)
+        if class_name is None:
+            class_name = 'pydocx-s%d' % len(style_classes)
+            style_classes[fragment] = class_name
+        return {'class': class_name}
+
     def export(self):
-        return ''.join(
-            result.to_html() if isinstance(result, HtmlTag)
-            else result
-            for result in super(PyDocXHTMLExporter, self).export()
+        html = ''.join(self.iter_export())
+        if self.stats is not None:
+            self.stats.count('output_bytes', len(html.encode('utf-8')))
+        return html
+
+    def iter_export(self):
+        '''
+        Yield the HTML in pieces as it is rendered, instead of returning it
+        all at once like `export`.
+        '''
+        for result in super(PyDocXHTMLExporter, self).export():
+            yield self.get_result_text(result)
+
+    def get_result_text(self, result):
+        if isinstance(result, HtmlTag):
+            return result.to_html(self.context.rendered_html)
+        return result
+
+    def can_render_in_parallel(self):
+        # Interned style classes are numbered in the order in which they are
+        # first used, across the whole document
+        if self.intern_styles:
+            return False
+        return super(PyDocXHTMLExporter, self).can_render_in_parallel()
+
+    def can_cache_blocks(self):
+        # Cached blocks would refer to the style classes of another export
+        if self.intern_styles:
+            return False
+        return super(PyDocXHTMLExporter, self).can_cache_blocks()
+
+    def get_block_cache_namespace(self):
+        namespace = super(PyDocXHTMLExporter, self).get_block_cache_namespace()
+        return '{0} images={1} image_processor={2!r}'.format(
+            namespace,
+            self.images,
+            self.image_processor,
         )
 
     def export_document(self, document):
         tag = HtmlTag('html')
         results = super(PyDocXHTMLExporter, self).export_document(document)
+        if self.intern_styles and results is not None:
+            results = list(results)
         sequence = []
         head = self.head()
         if head is not None:
@@ -244,8 +464,55 @@ class PyDocXHTMLExporter(PyDocXExporter):
 
     def export_footnote(self, footnote):
         results = super(PyDocXHTMLExporter, self).export_footnote(footnote)
-        tag = HtmlTag('li')
-        return tag.apply(results, allow_empty=False)
+        return LIST_ITEM_TAG.apply(
+            results,
+            allow_empty=self.has_visible_text(footnote),
+        )
+
+    def clear_document_caches(self):
+        super(PyDocXHTMLExporter, self).clear_document_caches()
+        # Whether each text container of the document has visible text (see
+        # `has_visible_text`)
+        self._visible_text = {}
+
+    def has_visible_text(self, node):
+        '''
+        Return True if the given model contains text that isn't only
+        whitespace, which means that its results are not empty and can be
+        wrapped in a tag without first scanning (and buffering) them.
+
+        A return value of False only means that the results must be scanned.
+        Subclasses that drop text (e.g. by overriding `export_text` or
+        `export_run`) may need to override this as well.
+
+        The value of each text container is computed once and reused by every
+        later export of the document. In the first pass it isn't kept, since
+        the numbers of faked lists are only removed from their paragraphs
+        when the numbering spans are built, before they are rendered.
+        '''
+        if self.context.first_pass:
+            return self._has_visible_text(node, {})
+        return self._has_visible_text(node, self._visible_text)
+
+    def _has_visible_text(self, node, visible_text):
+        if isinstance(node, wordprocessing.Text):
+            return bool(node.text and node.text.strip())
+        visible = visible_text.get(node)
+        if visible is not None:
+            return visible
+        if isinstance(node, wordprocessing.SdtRun):
+            children = [node.content]
+        elif isinstance(node, self.text_container_types):
+            children = node.children or []
+        else:
+            children = []
+        visible = False
+        for child in children:
+            if child is not None and self._has_visible_text(child, visible_text):
+                visible = True
+                break
+        visible_text[node] = visible
+        return visible
 
     def get_paragraph_tag(self, paragraph):
         heading_style = paragraph.heading_style
@@ -253,18 +520,39 @@ class PyDocXHTMLExporter(PyDocXExporter):
             tag = self.get_heading_tag(paragraph)
             if tag:
                 return tag
-        if self.in_table_cell:
+        if paragraph.has_ancestor(wordprocessing.TableCell):
+            return
+        if self.is_table_container(paragraph):
             return
         if paragraph.has_structured_document_parent():
             return
         if isinstance(paragraph.parent, NumberingItem):
             return
-        return HtmlTag('p')
+        return PARAGRAPH_TAG
+
+    def is_table_container(self, paragraph):
+        '''
+        Return True if the paragraph has no text of its own and contains a
+        table (in a text box), in which case it isn't wrapped in a tag, since
+        tables can't be within HTML paragraphs.
+        '''
+        if self.has_visible_text(paragraph):
+            return False
+        nodes = list(paragraph.children)
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, wordprocessing.Table):
+                return True
+            if isinstance(node, wordprocessing.SdtRun):
+                nodes.append(node.content)
+            else:
+                nodes.extend(getattr(node, 'children', None) or ())
+        return False
 
     def get_heading_tag(self, paragraph):
         if paragraph.has_ancestor(NumberingItem):
             # Force-bold headings that appear in list items
-            return HtmlTag('strong')
+            return BOLD_TAG
         heading_style = paragraph.heading_style
         tag = self.heading_level_conversion_map.get(
             heading_style.name.lower(),
@@ -277,9 +565,10 @@ class PyDocXHTMLExporter(PyDocXExporter):
     def export_paragraph(self, paragraph):
         results = super(PyDocXHTMLExporter, self).export_paragraph(paragraph)
 
-        results = is_not_empty_and_not_only_whitespace(results)
-        if results is None:
-            return
+        if not self.has_visible_text(paragraph):
+            results = is_not_empty_and_not_only_whitespace(results)
+            if results is None:
+                return
 
         tag = self.get_paragraph_tag(paragraph)
         if tag:
@@ -302,7 +591,10 @@ class PyDocXHTMLExporter(PyDocXExporter):
                 'class': pydocx_class,
             }
             tag = HtmlTag('span', **attrs)
-            results = tag.apply(results, allow_empty=False)
+            results = tag.apply(
+                results,
+                allow_empty=self.has_visible_text(paragraph),
+            )
         elif alignment is not None:
             # TODO What if alignment is something else?
             pass
@@ -352,11 +644,12 @@ class PyDocXHTMLExporter(PyDocXExporter):
             style['display'] = 'inline-block'
 
         if style:
-            attrs = {
-                'style': convert_dictionary_to_style_fragment(style)
-            }
+            attrs = self.get_style_attrs(style)
             tag = HtmlTag('span', **attrs)
-            results = tag.apply(results, allow_empty=False)
+            results = tag.apply(
+                results,
+                allow_empty=self.has_visible_text(paragraph),
+            )
 
         return results
 
@@ -485,61 +778,34 @@ class PyDocXHTMLExporter(PyDocXExporter):
                 yield result
 
     def export_run_property_bold(self, run, results):
-        tag = HtmlTag('strong')
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(BOLD_TAG, run, results)
 
     def export_run_property_italic(self, run, results):
-        tag = HtmlTag('em')
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(ITALIC_TAG, run, results)
 
     def export_run_property_underline(self, run, results):
-        attrs = {
-            'class': 'pydocx-underline',
-        }
-        tag = HtmlTag('span', **attrs)
-        return self.export_run_property(tag, run, results)
+        # Links are already underlined
+        if run.has_ancestor(wordprocessing.Hyperlink):
+            return results
+        return self.export_run_property(UNDERLINE_TAG, run, results)
 
     def export_run_property_caps(self, run, results):
-        attrs = {
-            'class': 'pydocx-caps',
-        }
-        tag = HtmlTag('span', **attrs)
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(CAPS_TAG, run, results)
 
     def export_run_property_small_caps(self, run, results):
-        attrs = {
-            'class': 'pydocx-small-caps',
-        }
-        tag = HtmlTag('span', **attrs)
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(SMALL_CAPS_TAG, run, results)
 
     def export_run_property_dstrike(self, run, results):
-        attrs = {
-            'class': 'pydocx-strike',
-        }
-        tag = HtmlTag('span', **attrs)
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(STRIKE_TAG, run, results)
 
     def export_run_property_strike(self, run, results):
-        attrs = {
-            'class': 'pydocx-strike',
-        }
-        tag = HtmlTag('span', **attrs)
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(STRIKE_TAG, run, results)
 
     def export_run_property_vanish(self, run, results):
-        attrs = {
-            'class': 'pydocx-hidden',
-        }
-        tag = HtmlTag('span', **attrs)
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(HIDDEN_TAG, run, results)
 
     def export_run_property_hidden(self, run, results):
-        attrs = {
-            'class': 'pydocx-hidden',
-        }
-        tag = HtmlTag('span', **attrs)
-        return self.export_run_property(tag, run, results)
+        return self.export_run_property(HIDDEN_TAG, run, results)
 
     def export_run_property_vertical_align(self, run, results):
         if run.effective_properties.is_superscript():
@@ -555,20 +821,25 @@ class PyDocXHTMLExporter(PyDocXExporter):
         return results
 
     def export_run_property_vertical_align_superscript(self, run, results):
-        tag = HtmlTag('sup')
-        return tag.apply(results, allow_empty=False)
+        return SUPERSCRIPT_TAG.apply(
+            results,
+            allow_empty=self.has_visible_text(run),
+        )
 
     def export_run_property_vertical_align_subscript(self, run, results):
-        tag = HtmlTag('sub')
-        return tag.apply(results, allow_empty=False)
+        return SUBSCRIPT_TAG.apply(
+            results,
+            allow_empty=self.has_visible_text(run),
+        )
 
     def export_run_property_color(self, run, results):
         if run.properties is None or run.properties.color is None:
             return results
 
-        attrs = {
-            'style': 'color:#' + run.properties.color
+        style = {
+            'color': '#' + run.properties.color,
         }
+        attrs = self.get_style_attrs(style)
         tag = HtmlTag('span', **attrs)
         return self.export_run_property(tag, run, results)
 
@@ -582,11 +853,7 @@ class PyDocXHTMLExporter(PyDocXExporter):
         # TODO deleted_text should be ignored if it is NOT contained within a
         # deleted run
         results = self.export_text(deleted_text)
-        attrs = {
-            'class': 'pydocx-delete',
-        }
-        tag = HtmlTag('span', **attrs)
-        return tag.apply(results, allow_empty=False)
+        return DELETE_TAG.apply(results, allow_empty=False)
 
     def get_hyperlink_tag(self, target_uri):
         if target_uri:
@@ -600,26 +867,16 @@ class PyDocXHTMLExporter(PyDocXExporter):
         else:
             tag = self.get_hyperlink_tag(target_uri=hyperlink.target_uri)
         if tag:
-            results = tag.apply(results, allow_empty=False)
-
-        # Prevent underline style from applying by temporarily monkey-patching
-        # the export underline function. There's got to be a better way.
-        old = self.export_run_property_underline
-        self.export_run_property_underline = lambda run, results: results
-        for result in results:
-            yield result
-        self.export_run_property_underline = old
+            results = tag.apply(
+                results,
+                allow_empty=self.has_visible_text(hyperlink),
+            )
+        return results
 
     def get_break_tag(self, br):
         if br.is_page_break():
-            tag_name = 'hr'
-        else:
-            tag_name = 'br'
-        return HtmlTag(
-            tag_name,
-            allow_whitespace=True,
-            allow_self_closing=True,
-        )
+            return PAGE_BREAK_TAG
+        return BREAK_TAG
 
     def export_break(self, br):
         tag = self.get_break_tag(br)
@@ -627,48 +884,48 @@ class PyDocXHTMLExporter(PyDocXExporter):
             yield tag
 
     def get_table_tag(self, table):
-        return HtmlTag('table', border='1')
+        return TABLE_TAG
 
     def export_table(self, table):
-        table_cell_spans = table.calculate_table_cell_spans()
-        self.table_cell_rowspan_tracking[table] = table_cell_spans
-        results = super(PyDocXHTMLExporter, self).export_table(table)
-        tag = self.get_table_tag(table)
-        return tag.apply(results)
+        # The grid of the table is only kept while the table is rendered
+        table_grids = self.context.table_grids
+        table_grids[table] = table.calculate_table_grid()
+        try:
+            results = super(PyDocXHTMLExporter, self).export_table(table)
+            tag = self.get_table_tag(table)
+            for result in tag.apply(results):
+                yield result
+        finally:
+            del table_grids[table]
 
     def export_table_row(self, table_row):
         results = super(PyDocXHTMLExporter, self).export_table_row(table_row)
-        tag = HtmlTag('tr')
-        return tag.apply(results)
+        return TABLE_ROW_TAG.apply(results)
+
+    def get_table_cell_spans(self, table_cell):
+        '''
+        Return the rowspan and colspan for the given cell, which are looked up
+        by its position in the grid of its table.
+        '''
+        table = table_cell.parent.parent
+        table_grid = self.context.table_grids[table]
+        row_index, cell_index = table_grid.get_cell_position(table_cell)
+        return table_grid.get_cell_spans(row_index, cell_index)
 
     def export_table_cell(self, table_cell):
-        start_new_tag = False
-        colspan = 1
-        if table_cell.properties:
-            if table_cell.properties.should_close_previous_vertical_merge():
-                start_new_tag = True
-            try:
-                # Should be done by properties, or as a helper
-                colspan = int(table_cell.properties.grid_span)
-            except (TypeError, ValueError):
-                colspan = 1
-
-        else:
-            # This means the properties element is missing, which means the
-            # merge element is missing
-            start_new_tag = True
+        rowspan, colspan = self.get_table_cell_spans(table_cell)
 
         tag = None
-        if start_new_tag:
-            parent_table = table_cell.get_first_ancestor(wordprocessing.Table)
-            rowspan_counts = self.table_cell_rowspan_tracking[parent_table]
-            rowspan = rowspan_counts.get(table_cell, 1)
-            attrs = {}
-            if colspan > 1:
-                attrs['colspan'] = colspan
-            if rowspan > 1:
-                attrs['rowspan'] = rowspan
-            tag = HtmlTag('td', **attrs)
+        # A rowspan of 0 means this cell continues a vertical merge
+        if rowspan:
+            tag = TABLE_CELL_TAG
+            if colspan > 1 or rowspan > 1:
+                attrs = {}
+                if colspan > 1:
+                    attrs['colspan'] = colspan
+                if rowspan > 1:
+                    attrs['rowspan'] = rowspan
+                tag = HtmlTag('td', **attrs)
 
         numbering_spans = self.yield_numbering_spans(table_cell.children)
         results = self.yield_nested_with_line_breaks_between_paragraphs(
@@ -677,13 +934,11 @@ class PyDocXHTMLExporter(PyDocXExporter):
         )
         if tag:
             results = tag.apply(results)
-
-        self.in_table_cell = True
-        for result in results:
-            yield result
-        self.in_table_cell = False
+        return results
 
     def export_drawing(self, drawing):
+        if self.images == 'skip':
+            return
         length, width = drawing.get_picture_extents()
         rotate = drawing.get_picture_rotate_angle()
         relationship_id = drawing.get_picture_relationship_id()
@@ -715,19 +970,68 @@ class PyDocXHTMLExporter(PyDocXExporter):
             return
         elif uri_is_external(image.uri):
             return image.uri
+        elif self.images == 'external':
+            return self.escape(self.get_external_image_source(image))
         else:
-            image.stream.seek(0)
-            data = image.stream.read()
+            data = self.get_image_data(image)
             _, filename = posixpath.split(image.uri)
             extension = filename.split('.')[-1].lower()
-            b64_encoded_src = 'data:image/{ext};base64,{data}'.format(
-                ext=extension,
-                data=base64.b64encode(data).decode(),
-            )
-            return self.escape(b64_encoded_src)
+            return self.get_data_uri(data, extension)
+
+    def get_image_data(self, image):
+        # The image is decompressed on first access, which exports in other
+        # threads may do at the same time
+        with self._document_lock:
+            return image.stream.getvalue()
+
+    def get_processed_image_source(self, image, width=None, height=None):
+        '''
+        Return the source of an inline image processed by the
+        `image_processor` for the given displayed size, or None if the image
+        isn't processed.
+        '''
+        if image is None or self.images != 'inline' or uri_is_external(image.uri):
+            return
+        result = self.image_processor.process(
+            self.get_image_data(image),
+            width=width,
+            height=height,
+        )
+        if result is not None:
+            data, extension = result
+            return self.get_data_uri(data, extension)
+
+    def get_data_uri(self, data, extension):
+        if self.stats is not None and not self.context.first_pass:
+            self.stats.count('images_encoded')
+            self.stats.count('image_bytes_encoded', len(data))
+        b64_encoded_src = 'data:image/{ext};base64,{data}'.format(
+            ext=extension,
+            data=base64.b64encode(data).decode(),
+        )
+        return self.escape(b64_encoded_src)
+
+    def get_external_image_source(self, image):
+        '''
+        Return the source of an image that is stored within the document when
+        `images` is 'external'. By default, this is the path of the image
+        within the docx (e.g. word/media/image1.png), so that the images can
+        be extracted next to the HTML. Override this to link to the images
+        elsewhere.
+        '''
+        return image.uri.lstrip('/')
 
     def get_image_tag(self, image, width=None, height=None, rotate=None):
-        image_src = self.get_image_source(image)
+        if self.context.first_pass:
+            # The results of the first pass are discarded, so the image
+            # isn't read (nor processed) yet
+            image_src = image.uri if image is not None else None
+        else:
+            image_src = None
+            if self.image_processor is not None:
+                image_src = self.get_processed_image_source(image, width, height)
+            if image_src is None:
+                image_src = self.get_image_source(image)
         if image_src:
             attrs = {
                 'src': image_src
@@ -747,13 +1051,11 @@ class PyDocXHTMLExporter(PyDocXExporter):
 
     def export_inserted_run(self, inserted_run):
         results = super(PyDocXHTMLExporter, self).export_inserted_run(inserted_run)
-        attrs = {
-            'class': 'pydocx-insert',
-        }
-        tag = HtmlTag('span', **attrs)
-        return tag.apply(results)
+        return INSERT_TAG.apply(results)
 
     def export_vml_image_data(self, image_data):
+        if self.images == 'skip':
+            return
         width, height = image_data.get_picture_extents()
         if not image_data.relationship_id:
             return
@@ -799,11 +1101,7 @@ class PyDocXHTMLExporter(PyDocXExporter):
 
     def export_tab_char(self, tab_char):
         results = super(PyDocXHTMLExporter, self).export_tab_char(tab_char)
-        attrs = {
-            'class': 'pydocx-tab',
-        }
-        tag = HtmlTag('span', allow_whitespace=True, **attrs)
-        return tag.apply(results)
+        return TAB_TAG.apply(results)
 
     def export_numbering_span(self, numbering_span):
         results = super(PyDocXHTMLExporter, self).export_numbering_span(numbering_span)
@@ -836,12 +1134,10 @@ class PyDocXHTMLExporter(PyDocXExporter):
             style = self.export_listing_paragraph_property_indentation(paragraph,
                                                                        level_properties)
 
-        attrs = {}
-
+        tag = LIST_ITEM_TAG
         if style:
-            attrs['style'] = convert_dictionary_to_style_fragment(style)
-
-        tag = HtmlTag('li', **attrs)
+            attrs = self.get_style_attrs(style)
+            tag = HtmlTag('li', **attrs)
         return tag.apply(results)
 
     def export_field_hyperlink(self, simple_field, field_args):
@@ -0,0 +1,224 @@
+# coding: utf-8
+'''
+Downscaling and transcoding images before they are embedded in the output.
+
+Documents often embed images at a much higher resolution than they are
+displayed at (e.g. scans of 20 megapixels shown a few inches wide), or in
+formats browsers can't show (e.g. TIFF). An ImageProcessor resizes each
+image to its displayed size (times `dpi_factor`, for high density screens)
+and transcodes TIFF and BMP images to PNG or JPEG. It requires Pillow, and
+leaves images as they are if Pillow isn't installed.
+
+The processed images are cached by the hash of their content and their
+target size, so that an image shown many times, or in many documents
+converted by the same processor, is only processed once.
+'''
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from pydocx.util.stats import count
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional
+    Image = None
+
+# The number of pixels of each CSS length unit (at 96 pixels per inch)
+PIXELS_PER_UNIT = {
+    '': 1,
+    'px': 1,
+    'pt': 96 / 72,
+    'pc': 96 / 6,
+    'in': 96,
+    'cm': 96 / 2.54,
+    'mm': 96 / 25.4,
+}
+
+LENGTH_PATTERN = re.compile(r'^\s*([0-9]*\.?[0-9]+)\s*([a-z]*)\s*$')
+
+NOT_CACHED = object()
+
+
+def convert_length_to_pixels(length):
+    '''
+    Return the number of pixels of a CSS length (e.g. '150pt'), or None if
+    it can't be converted.
+
+    >>> convert_length_to_pixels('1.5in')
+    144.0
+    >>> convert_length_to_pixels('50%') is None
+    True
+    '''
+    if not length:
+        return None
+    match = LENGTH_PATTERN.match(str(length).lower())
+    if not match:
+        return None
+    value, unit = match.groups()
+    pixels_per_unit = PIXELS_PER_UNIT.get(unit)
+    if pixels_per_unit is None:
+        return None
+    return float(value) * pixels_per_unit
+
+
+class ImageProcessor(object):
+    '''
+    Resizes and transcodes the images exported by the HTML exporter:
+
+    processor = ImageProcessor(dpi_factor=2)
+    html = PyDocXHTMLExporter(path, image_processor=processor).export()
+
+    The processor (and its cache) may be shared by many exports, including
+    exports running in other threads.
+    '''
+
+    # The Pillow formats that are resized, and kept in their format
+    resized_formats = ('JPEG', 'PNG')
+
+    # The Pillow formats that are always transcoded, to PNG if the image is
+    # transparent, bilevel or has a palette, and to JPEG otherwise
+    transcoded_formats = ('TIFF', 'BMP')
+
+    # The image modes that are transcoded to PNG
+    lossless_modes = ('1', 'P', 'PA', 'LA', 'RGBA')
+
+    def __init__(self, dpi_factor=2, jpeg_quality=85, max_cached_images=256):
+        self.dpi_factor = dpi_factor
+        self.jpeg_quality = jpeg_quality
+        self.max_cached_images = max_cached_images
+        # The processed (data, extension) of each image, or None if the
+        # image is left as it is, by content hash and target size
+        self.cache = OrderedDict()
+        # Reordering the cache isn't atomic, and the processor may be shared
+        # by exports in several threads
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return '{0}(dpi_factor={1!r}, jpeg_quality={2!r}, pillow={3!r})'.format(
+            type(self).__name__,
+            self.dpi_factor,
+            self.jpeg_quality,
+            Image is not None,
+        )
+
+    def is_available(self):
+        return Image is not None
+
+    def get_target_size(self, width, height):
+        '''
+        Return the size in pixels that an image displayed at the given CSS
+        width and height is resized to fit, or None if the size is unknown.
+        '''
+        width = convert_length_to_pixels(width)
+        height = convert_length_to_pixels(height)
+        if not width or not height:
+            return None
+        return (
+            max(1, int(round(width * self.dpi_factor))),
+            max(1, int(round(height * self.dpi_factor))),
+        )
+
+    def process(self, data, width=None, height=None):
+        '''
+        Return the (data, extension) of the image with the given data, as it
+        should be embedded when displayed at the given CSS width and height,
+        or None if the image should be embedded as it is.
+        '''
+        if not self.is_available():
+            return None
+        target_size = self.get_target_size(width, height)
+        key = (hashlib.sha256(data).hexdigest(), target_size)
+        with self.lock:
+            result = self.cache.pop(key, NOT_CACHED)
+            if result is not NOT_CACHED:
+                self.cache[key] = result
+        if result is NOT_CACHED:
+            # The image is processed outside of the lock, so another thread
+            # may process the same image at the same time
+            result = self.process_image(data, target_size)
+            with self.lock:
+                self.cache.pop(key, None)
+                self.cache[key] = result
+                while len(self.cache) > self.max_cached_images:
+                    self.cache.popitem(last=False)
+        else:
+            count('image_cache_hits')
+        return result
+
+    def process_image(self, data, target_size):
+        try:
+            image = Image.open(BytesIO(data))
+            image_format = image.format
+            if image_format in self.transcoded_formats:
+                return self.transcode(image, target_size)
+            if image_format in self.resized_formats:
+                return self.resize(image, image_format, data, target_size)
+        except (IOError, OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+            # Images that Pillow can't read are embedded as they are
+            pass
+        return None
+
+    def is_larger_than(self, image, target_size):
+        if target_size is None:
+            return False
+        width, height = target_size
+        return image.width > width or image.height > height
+
+    def shrink(self, image, target_size):
+        '''
+        Return the image reduced to fit within the target size, keeping its
+        aspect ratio.
+        '''
+        if not self.is_larger_than(image, target_size):
+            return image
+        if image.format == 'JPEG':
+            # Decode the image at the smallest scale that is still larger
+            # than the target, which is much faster for large images
+            image.draft(image.mode, target_size)
+        resampling = getattr(Image, 'Resampling', Image)
+        image.thumbnail(target_size, resampling.LANCZOS)
+        return image
+
+    def resize(self, image, image_format, data, target_size):
+        if not self.is_larger_than(image, target_size):
+            return None
+        image = self.shrink(image, target_size)
+        if image_format == 'JPEG':
+            result = self.save_jpeg(image)
+        else:
+            result = self.save_png(image)
+        if len(result[0]) >= len(data):
+            return None
+        count('images_resized')
+        return result
+
+    def transcode(self, image, target_size):
+        image = self.shrink(image, target_size)
+        count('images_transcoded')
+        if image.mode in self.lossless_modes or 'transparency' in image.info:
+            return self.save_png(image)
+        return self.save_jpeg(image)
+
+    def save_jpeg(self, image):
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        output = BytesIO()
+        image.save(output, 'JPEG', quality=self.jpeg_quality)
+        return output.getvalue(), 'jpeg'
+
+    def save_png(self, image):
+        if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        output = BytesIO()
+        image.save(output, 'PNG')
+        return output.getvalue(), 'png'
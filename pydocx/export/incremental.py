@@ -0,0 +1,310 @@
+# coding: utf-8
+'''
+Incremental re-conversion of documents that are converted repeatedly while
+they are edited, e.g. once for each saved revision.
+
+Each top level block of the body (a paragraph, a table or a whole list) is
+identified by a hash of its content, taken after complex fields have been
+converted and lists have been built, together with everything else its
+output depends on: the styles and numbering definitions it uses, the targets
+of its hyperlinks, the images it shows and the configuration of the
+exporter. The output of each block is kept in a BlockCache under that hash,
+so that converting a new revision only renders the blocks that changed.
+
+Footnote references are rendered with a placeholder instead of their
+ordinal, which is filled in when the outputs are stitched together, so that
+adding or removing a footnote doesn't invalidate the blocks that follow it.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from pydocx.export.numbering_span import NumberingItem, NumberingSpan
+from pydocx.models import XmlField, XmlModel
+from pydocx.openxml import vml, wordprocessing
+from pydocx.types import SimpleType
+from pydocx.util.stats import count
+from pydocx.util.uri import uri_is_external
+
+# Rendered in place of footnote ordinals. NUL can't appear in XML documents,
+# so it never appears in the output otherwise.
+FOOTNOTE_ORDINAL_PLACEHOLDER = '\x00'
+
+try:
+    string_types = (str, unicode)
+except NameError:  # python 3
+    string_types = (str,)
+
+# The types of field values that are added to keys as they are
+SCALAR_TYPES = (bool, float, int, SimpleType) + string_types
+
+# The sorted names of the fields of each model class
+_model_fields = {}
+
+
+def get_model_fields(model_class):
+    fields = _model_fields.get(model_class)
+    if fields is None:
+        fields = sorted(
+            field_name
+            for field_name, field in model_class.__dict__.items()
+            if isinstance(field, XmlField)
+        )
+        _model_fields[model_class] = fields
+    return fields
+
+
+class BlockCache(object):
+    '''
+    An in-memory cache of the rendered output of body blocks, which may be
+    shared by the exports of many documents (and of their revisions), in
+    any number of threads. The least recently used blocks are discarded once
+    there are more than `max_blocks`.
+
+    Example:
+
+    cache = BlockCache()
+    html = PyDocXHTMLExporter(path, block_cache=cache).export()
+    # After the document is edited, only the changed blocks are rendered
+    html = PyDocXHTMLExporter(path, block_cache=cache).export()
+    '''
+
+    def __init__(self, max_blocks=10000):
+        self.max_blocks = max_blocks
+        self.blocks = OrderedDict()
+        # Reordering the blocks isn't atomic (OrderedDict is implemented in
+        # Python on Python 2), so exports in other threads must wait
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.blocks.pop(key, None)
+            if entry is not None:
+                self.blocks[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        with self.lock:
+            self.blocks.pop(key, None)
+            self.blocks[key] = entry
+            while len(self.blocks) > self.max_blocks:
+                self.blocks.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.blocks.clear()
+
+
+class BlockHasher(object):
+    '''
+    Computes the cache keys of the top level blocks exported by `exporter`.
+
+    The content of a block is flattened into a list of tokens (the class of
+    each model followed by its fields, in a fixed order, with brackets around
+    models and collections) which is hashed once.
+    '''
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+        self.namespace = exporter.get_block_cache_namespace()
+        # The digests of the styles and numbering definitions, which are
+        # shared by many blocks, by id. The definitions are kept as well, so
+        # that their ids aren't reused.
+        self.definition_digests = {}
+
+    def get_key(self, block):
+        '''
+        Return the key of the given block, and its footnote references.
+        '''
+        tokens = [self.namespace]
+        footnote_references = []
+        self.add_tokens(tokens, block, footnote_references)
+        return self.hash_tokens(tokens), footnote_references
+
+    def hash_tokens(self, tokens):
+        data = '\x1f'.join(tokens).encode('utf-8')
+        return hashlib.sha256(data).hexdigest()
+
+    def add_tokens(self, tokens, value, footnote_references=None):
+        if isinstance(value, XmlModel):
+            tokens.append(type(value).__name__)
+            for field_name in get_model_fields(type(value)):
+                field_value = getattr(value, field_name, None)
+                if field_value is None or isinstance(field_value, SCALAR_TYPES):
+                    tokens.append(repr(field_value))
+                else:
+                    self.add_tokens(tokens, field_value, footnote_references)
+            if footnote_references is not None:
+                self.add_dependencies(tokens, value, footnote_references)
+            tokens.append(')')
+        elif isinstance(value, (list, tuple)):
+            tokens.append('[')
+            for item in value:
+                self.add_tokens(tokens, item, footnote_references)
+            tokens.append(']')
+        elif isinstance(value, NumberingSpan):
+            tokens.append('NumberingSpan')
+            self.add_definition(tokens, value.numbering_level)
+            self.add_definition(tokens, value.numbering_definition)
+            self.add_tokens(tokens, value.children, footnote_references)
+            tokens.append(')')
+        elif isinstance(value, NumberingItem):
+            tokens.append('NumberingItem')
+            self.add_tokens(tokens, value.children, footnote_references)
+            tokens.append(')')
+        elif hasattr(value, 'tag') and hasattr(value, 'attrib'):
+            # An element of a field that isn't loaded as a model
+            tokens.append('<' + value.tag)
+            tokens.append(repr(sorted(value.attrib.items())))
+            tokens.append(repr(value.text))
+            for child in value:
+                self.add_tokens(tokens, child)
+            tokens.append('>')
+        else:
+            tokens.append(repr(value))
+
+    def add_definition(self, tokens, definition):
+        '''
+        Add the digest of a style or numbering definition (or level).
+        '''
+        if definition is None:
+            tokens.append('None')
+            return
+        digest = self.definition_digests.get(id(definition))
+        if digest is None:
+            definition_tokens = []
+            self.add_tokens(definition_tokens, definition)
+            digest = self.hash_tokens(definition_tokens)
+            self.definition_digests[id(definition)] = digest, definition
+        else:
+            digest, _ = digest
+        tokens.append(digest)
+
+    def add_dependencies(self, tokens, model, footnote_references):
+        '''
+        Add what the output of the model depends on besides its own fields.
+        '''
+        if isinstance(model, (wordprocessing.Paragraph, wordprocessing.Run)):
+            if model.properties and model.properties.parent_style:
+                for style in model.get_style_chain_stack() or ():
+                    self.add_definition(tokens, style)
+        if isinstance(model, wordprocessing.Paragraph):
+            if self.exporter.numbering:
+                self.add_definition(tokens, model.get_numbering_definition())
+        elif isinstance(model, wordprocessing.Hyperlink):
+            tokens.append(repr(model.target_uri))
+        elif isinstance(model, wordprocessing.Drawing):
+            self.add_image(tokens, model, model.get_picture_relationship_id())
+        elif isinstance(model, vml.ImageData):
+            self.add_image(tokens, model, model.relationship_id)
+        elif isinstance(model, wordprocessing.FootnoteReference):
+            tokens.append(repr(model.footnote is not None))
+            footnote_references.append(model)
+
+    def add_image(self, tokens, model, relationship_id):
+        image = None
+        if relationship_id:
+            try:
+                image = model.container.get_part_by_id(
+                    relationship_id=relationship_id,
+                )
+            except KeyError:
+                pass
+        if image is None:
+            tokens.append('None')
+        elif uri_is_external(image.uri):
+            tokens.append(image.uri)
+        else:
+            package = image.open_xml_package.package
+            tokens.append(image.uri)
+            tokens.append(repr(package.get_member_checksum(image.uri)))
+
+
+def render_block(exporter, block, footnote_references):
+    '''
+    Render the block with placeholders for the footnote ordinals. Return its
+    output, the footnote references it rendered, and the positions of those
+    within `footnote_references` (or None if they aren't all in there, in
+    which case the output can't be cached).
+    '''
+    context = exporter.context
+    tracker_length = len(context.footnote_tracker)
+    context.footnote_ordinal_placeholder = FOOTNOTE_ORDINAL_PLACEHOLDER
+    try:
+        output = ''.join(
+            exporter.get_result_text(result)
+            for result in exporter.export_node(block)
+        )
+    finally:
+        context.footnote_ordinal_placeholder = None
+    rendered_references = context.footnote_tracker[tracker_length:]
+    del context.footnote_tracker[tracker_length:]
+
+    positions_by_id = dict(
+        (id(reference), position)
+        for position, reference in enumerate(footnote_references)
+    )
+    positions = [
+        positions_by_id.get(id(reference))
+        for reference in rendered_references
+    ]
+    if None in positions:
+        positions = None
+    return output, rendered_references, positions
+
+
+def stitch(exporter, output, rendered_references):
+    '''
+    Replace the footnote placeholders in the output of a block with the
+    ordinals of the given references, adding them to the footnote tracker.
+    '''
+    if not rendered_references:
+        return output
+    # Each reference was rendered (with a placeholder) as it was tracked
+    footnote_tracker = exporter.context.footnote_tracker
+    first_ordinal = len(footnote_tracker) + 1
+    footnote_tracker.extend(rendered_references)
+    pieces = output.split(FOOTNOTE_ORDINAL_PLACEHOLDER)
+    results = [pieces[0]]
+    for ordinal, piece in enumerate(pieces[1:], first_ordinal):
+        results.append('{0}'.format(ordinal))
+        results.append(piece)
+    return ''.join(results)
+
+
+def export_blocks(exporter, blocks):
+    '''
+    Yield the output of each of the given top level blocks of the body,
+    taking it from the exporter's block cache if it was already rendered.
+    '''
+    hasher = BlockHasher(exporter)
+    cache = exporter.block_cache
+    for block in blocks:
+        key, footnote_references = hasher.get_key(block)
+        entry = cache.get(key)
+        if entry is None:
+            count('block_cache_misses')
+            output, rendered_references, positions = render_block(
+                exporter,
+                block,
+                footnote_references,
+            )
+            if positions is not None:
+                cache.set(key, (output, positions))
+        else:
+            count('block_cache_hits')
+            output, positions = entry
+            rendered_references = [
+                footnote_references[position]
+                for position in positions
+            ]
+        yield stitch(exporter, output, rendered_references)
@@ -791,8 +791,7 @@ class FakeNumberingDetection(object):
             return False
         if level.num_format != current_level.num_format:
             return False
-        level_start = int(level.start)
-        return level_start == next_span_position
+        return level.start == next_span_position
 
     @memoized
     def get_left_position_for_paragraph(self, paragraph):
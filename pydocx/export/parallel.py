@@ -0,0 +1,295 @@
+# coding: utf-8
+'''
+Rendering the top level blocks of a document's body in several processes.
+
+By the time the body is rendered, the state that crosses blocks has already
+been computed sequentially: complex fields have been rewritten into simple
+fields (after the first pass), and the numbering spans have been built, so
+that each list is a single block. The only state left is the footnote
+ordinals, which are numbered in the order in which the footnote references
+are rendered. Those are counted for each segment ahead of time, so that each
+segment can start numbering at the right ordinal.
+
+The blocks are split into contiguous segments of roughly equal size, which
+are rendered by forked worker processes (that share the loaded document with
+the parent) and concatenated in order. If a segment turns out to render a
+different number of footnote references than were counted, the body is
+rendered sequentially instead, so the output is always the same as a
+sequential export.
+
+The counters (and node counts) that the workers record into the export's
+ConversionStats are added to the parent's stats. The time spent in each
+phase within the workers isn't reported separately; it is part of the
+parent's render phase.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import multiprocessing
+import os
+
+from pydocx.models import XmlChild, XmlCollection, XmlModel
+from pydocx.openxml.wordprocessing import FootnoteReference
+from pydocx.util.stats import count, get_active_stats
+
+# Each process renders this many segments (on average), so that the work is
+# balanced even if some segments are slower to render than others
+SEGMENTS_PER_PROCESS = 4
+
+# The export being rendered in parallel. Set before the worker processes are
+# forked, so that they inherit it instead of receiving it pickled.
+_active_render = None
+
+# The names of the fields of each model class that may contain models
+_model_fields = {}
+
+
+def get_model_fields(model_class):
+    fields = _model_fields.get(model_class)
+    if fields is None:
+        fields = [
+            (field_name, isinstance(field, XmlCollection))
+            for field_name, field in model_class.__dict__.items()
+            if isinstance(field, (XmlChild, XmlCollection))
+        ]
+        _model_fields[model_class] = fields
+    return fields
+
+
+def iterate_children(node):
+    if not isinstance(node, XmlModel):
+        # e.g. numbering spans and items
+        for child in getattr(node, 'children', ()):
+            yield child
+        return
+    for field_name, is_collection in get_model_fields(type(node)):
+        value = getattr(node, field_name, None)
+        if is_collection:
+            for child in value or ():
+                yield child
+        elif isinstance(value, XmlModel):
+            yield value
+
+
+def iterate_descendants(node):
+    '''
+    Yield the given node and all of its descendants, depth first.
+    '''
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = list(iterate_children(node))
+        children.reverse()
+        stack.extend(children)
+
+
+def partition(weights, segment_count):
+    '''
+    Split the items with the given weights into at most `segment_count`
+    contiguous, non empty segments of roughly equal total weight. Return the
+    (start, end) index of each segment.
+
+    >>> partition([1, 1, 1, 1], 2)
+    [(0, 2), (2, 4)]
+    >>> partition([5, 1, 1, 1, 1, 1], 2)
+    [(0, 1), (1, 6)]
+    >>> partition([1], 4)
+    [(0, 1)]
+    '''
+    total = sum(weights)
+    segments = []
+    start = 0
+    weight = 0
+    for index, item_weight in enumerate(weights):
+        weight += item_weight
+        remaining_segments = segment_count - len(segments) - 1
+        if remaining_segments and weight * segment_count >= total * (len(segments) + 1):  # noqa
+            segments.append((start, index + 1))
+            start = index + 1
+    if start < len(weights):
+        segments.append((start, len(weights)))
+    return segments
+
+
+def can_fork():
+    if not hasattr(os, 'fork'):
+        return False
+    # Daemonic processes (e.g. multiprocessing pool workers) may not have
+    # children
+    return not multiprocessing.current_process().daemon
+
+
+def get_pool(processes):
+    try:
+        context = multiprocessing.get_context('fork')
+    except AttributeError:  # python < 3.4, which always forks
+        context = multiprocessing
+    return context.Pool(processes)
+
+
+class ParallelRender(object):
+    '''
+    Renders the given blocks (the top level children of the body) with the
+    exporter, in `exporter.render_processes` processes.
+    '''
+
+    def __init__(self, exporter, blocks):
+        self.exporter = exporter
+        self.blocks = blocks
+        self.segments = []
+        # The footnote references that each segment is expected to render
+        self.footnote_references = []
+        # The footnote ordinal (less one) that each segment starts at
+        self.footnote_offsets = []
+
+    def prepare(self):
+        weights = []
+        references = []
+        for block in self.blocks:
+            weight = 0
+            block_references = []
+            for node in iterate_descendants(block):
+                weight += 1
+                if isinstance(node, FootnoteReference) and self.exporter.footnotes:
+                    if node.footnote is not None:
+                        block_references.append(node)
+            weights.append(weight)
+            references.append(block_references)
+
+        segment_count = self.exporter.render_processes * SEGMENTS_PER_PROCESS
+        self.segments = partition(weights, segment_count)
+        offset = 0
+        for start, end in self.segments:
+            segment_references = [
+                reference
+                for block_references in references[start:end]
+                for reference in block_references
+            ]
+            self.footnote_references.append(segment_references)
+            self.footnote_offsets.append(offset)
+            offset += len(segment_references)
+
+    def render_segment(self, index):
+        '''
+        Render a segment (in a worker process). Return its output, the
+        positions of the footnote references it rendered within
+        `footnote_references` (or None if those aren't the expected ones),
+        and the stats it recorded (see `get_stats_changes`).
+        '''
+        stats = get_active_stats()
+        stats_before = get_stats_changes(stats)
+        output, positions = self._render_segment(index)
+        return output, positions, get_stats_changes(stats, stats_before)
+
+    def _render_segment(self, index):
+        exporter = self.exporter
+        start, end = self.segments[index]
+        offset = self.footnote_offsets[index]
+        # The ordinal of each footnote is the length of the tracker
+        exporter.context.footnote_tracker = [None] * offset
+        output = ''.join(
+            exporter.get_result_text(result)
+            for result in exporter.yield_nested(
+                self.blocks[start:end],
+                exporter.export_node,
+            )
+        )
+        rendered_references = exporter.context.footnote_tracker[offset:]
+        expected_references = self.footnote_references[index]
+        if len(rendered_references) != len(expected_references):
+            return output, None
+        positions_by_id = dict(
+            (id(reference), position)
+            for position, reference in enumerate(expected_references)
+        )
+        positions = [
+            positions_by_id.get(id(reference))
+            for reference in rendered_references
+        ]
+        if None in positions:
+            return output, None
+        return output, positions
+
+    def render(self):
+        '''
+        Return the output of each segment, or None if the blocks must be
+        rendered sequentially. Once rendered, the exporter's footnote tracker
+        holds every rendered footnote reference, in order.
+        '''
+        global _active_render
+
+        self.prepare()
+        if len(self.segments) < 2:
+            return
+        _active_render = self
+        try:
+            pool = get_pool(self.exporter.render_processes)
+        finally:
+            _active_render = None
+        try:
+            results = pool.map(render_segment, range(len(self.segments)), 1)
+        finally:
+            pool.close()
+            pool.join()
+
+        footnote_tracker = []
+        for index, (_, positions, _) in enumerate(results):
+            if positions is None:
+                return
+            references = self.footnote_references[index]
+            footnote_tracker.extend(references[position] for position in positions)
+        self.exporter.context.footnote_tracker = footnote_tracker
+        # Only the stats of the output that is used are added, since the
+        # sequential render records its own
+        stats = get_active_stats()
+        if stats is not None:
+            for _, _, (counters, node_counts) in results:
+                for name, amount in counters.items():
+                    stats.counters[name] += amount
+                for name, amount in node_counts.items():
+                    stats.node_counts[name] += amount
+        count('render_segments', len(self.segments))
+        return [output for output, _, _ in results]
+
+
+def render_segment(index):
+    return _active_render.render_segment(index)
+
+
+def get_stats_changes(stats, before=None):
+    '''
+    Return the (counters, node counts) of the given ConversionStats, less
+    those in `before` (a previous result of this function), as dicts.
+    '''
+    if stats is None:
+        return {}, {}
+    changes = []
+    for values, previous_values in zip(
+        (stats.counters, stats.node_counts),
+        before or ({}, {}),
+    ):
+        changes.append(dict(
+            (name, amount - previous_values.get(name, 0))
+            for name, amount in values.items()
+            if amount != previous_values.get(name, 0)
+        ))
+    return tuple(changes)
+
+
+def export_blocks(exporter, blocks):
+    '''
+    Yield the results of exporting the given top level blocks of the body,
+    in parallel if possible.
+    '''
+    if len(blocks) >= exporter.parallel_render_min_blocks and can_fork():
+        outputs = ParallelRender(exporter, blocks).render()
+        if outputs is not None:
+            for output in outputs:
+                yield output
+            return
+    for result in exporter.yield_nested(blocks, exporter.export_node):
+        yield result
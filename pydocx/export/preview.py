@@ -0,0 +1,35 @@
+# coding: utf-8
+'''
+Rendering the start of a body that was loaded for a preview (see
+`pydocx.util.preview`). Since whole blocks are rendered, lists, tables and
+the document itself are always closed properly.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+
+def export_blocks(exporter, blocks):
+    '''
+    Yield the output of the given top level blocks of the body, until the
+    preview is full.
+    '''
+    preview = exporter.preview
+    chars = 0
+    byte_count = 0
+    for block in blocks:
+        tracker_length = len(exporter.context.footnote_tracker)
+        output = ''.join(
+            exporter.get_result_text(result)
+            for result in exporter.export_node(block)
+        )
+        chars += len(output)
+        if preview.max_bytes is not None:
+            byte_count += len(output.encode('utf-8'))
+        if preview.is_exceeded(chars=chars, byte_count=byte_count):
+            # The footnotes of the block that doesn't fit aren't exported
+            del exporter.context.footnote_tracker[tracker_length:]
+            break
+        yield output
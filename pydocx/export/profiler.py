@@ -0,0 +1,123 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+from collections import OrderedDict, defaultdict
+from timeit import default_timer
+
+
+class ProfileEntry(object):
+    def __init__(self):
+        self.calls = 0
+        self.inclusive_seconds = 0
+        self.exclusive_seconds = 0
+        # The number of frames of this entry on the stack. Inclusive time is
+        # only recorded by the outermost one, so that recursive nodes (e.g.
+        # nested tables) aren't counted more than once.
+        self.active = 0
+
+    def to_dict(self):
+        return OrderedDict([
+            ('calls', self.calls),
+            ('inclusive_seconds', self.inclusive_seconds),
+            ('exclusive_seconds', self.exclusive_seconds),
+        ])
+
+
+class ExportProfiler(object):
+    '''
+    Records the number of calls and the inclusive and exclusive time spent
+    exporting each node type, and in each export handler. Pass an instance to
+    an exporter to enable it:
+
+    profiler = ExportProfiler()
+    html = PyDocXHTMLExporter(path, profiler=profiler).export()
+    print(profiler.to_dict())
+
+    Export handlers are mostly generators, so a node isn't exported when its
+    handler is called, but as its results are consumed. The time spent in the
+    handler call and in each step of the results is attributed to the node,
+    and the time spent exporting its children is excluded from its exclusive
+    time. Both passes of the export are included.
+    '''
+
+    timer = staticmethod(default_timer)
+
+    def __init__(self):
+        self.node_types = defaultdict(ProfileEntry)
+        self.handlers = defaultdict(ProfileEntry)
+        # One [node type entry, handler entry, start time, nested time] item
+        # for each node that is currently running, innermost last
+        self.stack = []
+
+    def enter(self, node_type_entry, handler_entry):
+        node_type_entry.active += 1
+        handler_entry.active += 1
+        self.stack.append([node_type_entry, handler_entry, self.timer(), 0])
+
+    def exit(self):
+        node_type_entry, handler_entry, start, nested_seconds = self.stack.pop()
+        seconds = self.timer() - start
+        if self.stack:
+            self.stack[-1][3] += seconds
+        for entry in (node_type_entry, handler_entry):
+            entry.active -= 1
+            entry.exclusive_seconds += seconds - nested_seconds
+            if not entry.active:
+                entry.inclusive_seconds += seconds
+
+    def profile(self, node, handler):
+        '''
+        Call the handler with the given node, and return its results wrapped
+        so that their consumption is profiled.
+        '''
+        node_type_entry = self.node_types[type(node).__name__]
+        handler_name = getattr(handler, '__name__', type(handler).__name__)
+        handler_entry = self.handlers[handler_name]
+        node_type_entry.calls += 1
+        handler_entry.calls += 1
+
+        self.enter(node_type_entry, handler_entry)
+        try:
+            results = handler(node)
+        finally:
+            self.exit()
+        if results is None:
+            return
+        return self.profile_results(node_type_entry, handler_entry, results)
+
+    def profile_results(self, node_type_entry, handler_entry, results):
+        iterator = iter(results)
+        while True:
+            self.enter(node_type_entry, handler_entry)
+            try:
+                result = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.exit()
+            yield result
+
+    def to_dict(self):
+        '''
+        Return the report, with the entries ordered by descending exclusive
+        time.
+        '''
+        def sort_entries(entries):
+            return OrderedDict(
+                (name, entry.to_dict())
+                for name, entry in sorted(
+                    entries.items(),
+                    key=lambda item: item[1].exclusive_seconds,
+                    reverse=True,
+                )
+            )
+
+        return OrderedDict([
+            ('node_types', sort_entries(self.node_types)),
+            ('handlers', sort_entries(self.handlers)),
+        ])
@@ -0,0 +1,165 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import copy
+
+from pydocx.models import XmlModel
+from pydocx.openxml import wordprocessing
+from pydocx.types import SimpleType
+
+
+def get_model_key(value):
+    '''
+    Return a hashable value that describes `value` by its contents, so that
+    two models (or simple types) that were loaded separately can be compared.
+
+    >>> from pydocx.openxml.wordprocessing import RunProperties
+    >>> from pydocx.types import OnOff
+    >>> a = RunProperties(bold=OnOff('1'), sz='24')
+    >>> b = RunProperties(sz='24', bold=OnOff('1'))
+    >>> get_model_key(a) == get_model_key(b)
+    True
+    >>> get_model_key(a) == get_model_key(RunProperties(bold=OnOff('1')))
+    False
+    '''
+    if isinstance(value, XmlModel):
+        fields = sorted(
+            (field_name, get_model_key(field_value))
+            for field_name, field_value in value.fields
+        )
+        return (value.__class__, tuple(fields))
+    if isinstance(value, SimpleType):
+        return (value.__class__, value.value)
+    return value
+
+
+def get_run_formatting_key(run):
+    '''
+    Two runs that have the same formatting key are rendered identically, so
+    their children may be rendered as part of a single run.
+
+    Both the directly applied and the effective properties are considered,
+    since some of the exporters (e.g. color, faked superscripts) look at the
+    directly applied properties. The effective properties include the values
+    of the directly applied ones, so only the names of the directly applied
+    properties are added to the key of the effective properties.
+    '''
+    effective_properties = run.effective_properties
+    if effective_properties is None:
+        return ()
+    directly_applied = set()
+    if run.properties is not None:
+        directly_applied.update(field_name for field_name, _ in run.properties.fields)
+    return tuple(sorted(
+        (field_name, field_name in directly_applied, get_model_key(field_value))
+        for field_name, field_value in effective_properties.fields
+    ))
+
+
+def copy_model(model, **fields):
+    '''
+    Return a shallow copy of `model` in which the given fields are replaced.
+    The copy has the same parent as `model`, and the children of `model` are
+    not re-parented, so neither `model` nor its children are modified.
+    '''
+    model.load_fields()
+    model_copy = copy.copy(model)
+    model_copy.__dict__.update(fields)
+    return model_copy
+
+
+def coalesce_texts(children):
+    '''
+    Return the given children of a run, in which each sequence of text nodes
+    is replaced by a single text node.
+    '''
+    coalesced_children = []
+    texts = []
+    for child in list(children) + [None]:
+        if type(child) is wordprocessing.Text:
+            texts.append(child)
+            continue
+        if len(texts) > 1:
+            text = ''.join(text.text or '' for text in texts)
+            coalesced_children.append(copy_model(texts[0], text=text))
+        else:
+            coalesced_children.extend(texts)
+        texts = []
+        if child is not None:
+            coalesced_children.append(child)
+    return coalesced_children
+
+
+def coalesce_run_group(runs):
+    '''
+    Return a single run with the children of the given runs, which have the
+    same formatting, or the only run if nothing needs to be coalesced.
+    '''
+    children = []
+    for run in runs:
+        children.extend(run.children)
+    coalesced_children = coalesce_texts(children)
+    if len(runs) == 1 and len(coalesced_children) == len(children):
+        return runs[0]
+    return copy_model(runs[0], children=coalesced_children)
+
+
+def coalesce_runs(container):
+    '''
+    Return the children of `container`, in which each run is merged into the
+    run that directly precedes it, if both runs have the same formatting.
+    Sequential text nodes within each run are joined together as well.
+    Containers nested within `container` (hyperlinks, fields, smart tags,
+    etc) are coalesced recursively, but runs are never merged across
+    container boundaries.
+
+    Neither the container nor its children are modified. The merged runs and
+    text nodes, and the nested containers that have merged runs, are
+    replaced by copies (see `copy_model`).
+    '''
+    coalesced_children = []
+    runs = []
+    previous_key = None
+    for child in list(container.children or []) + [None]:
+        if type(child) is wordprocessing.Run:
+            key = get_run_formatting_key(child)
+            if runs and key == previous_key:
+                runs.append(child)
+                continue
+        if runs:
+            coalesced_children.append(coalesce_run_group(runs))
+            runs = []
+        if type(child) is wordprocessing.Run:
+            runs.append(child)
+            previous_key = key
+        elif child is not None:
+            coalesced_children.append(coalesce_container(child))
+    return coalesced_children
+
+
+def coalesce_container(container):
+    '''
+    Return `container`, or a copy of it with its runs coalesced if any of
+    them were merged (see `coalesce_runs`).
+    '''
+    if isinstance(container, wordprocessing.SdtRun):
+        if container.content is None:
+            return container
+        content = coalesce_container(container.content)
+        if content is container.content:
+            return container
+        return copy_model(container, content=content)
+    if not getattr(container, 'children', None):
+        return container
+    children = coalesce_runs(container)
+    unchanged = len(children) == len(container.children) and all(
+        child is original
+        for child, original in zip(children, container.children)
+    )
+    if unchanged:
+        return container
+    return copy_model(container, children=children)
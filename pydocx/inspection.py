@@ -0,0 +1,315 @@
+# coding: utf-8
+'''
+Inspecting documents without converting them, e.g. to decide how to process
+them.
+
+The body of the main document is scanned as it is decompressed, without
+loading any models, and only the styles part is loaded (to find which
+paragraphs are headings). The document properties are read from the core
+and extended properties parts, if the package has them:
+
+    report = inspect_document('file.docx')
+    report['counts']['words'], report['estimated_pages']
+
+Like exports, inspections of untrusted documents should be limited by
+ResourceLimits. Each scanned element counts as a node:
+
+    report = inspect_document('file.docx', limits=ResourceLimits(timeout=10))
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import posixpath
+from collections import OrderedDict
+
+from pydocx.exceptions import MalformedDocxException
+from pydocx.openxml.packaging import WordprocessingDocument
+from pydocx.util.limits import enforce_budget, get_active_budget
+from pydocx.util.stats import stats_phase
+from pydocx.util.xml import get_local_name, iterparse_xml, parse_xml_from_string
+
+CORE_PROPERTIES_RELATIONSHIP_TYPE = '/'.join([
+    'http://schemas.openxmlformats.org',
+    'package',
+    '2006',
+    'relationships',
+    'metadata',
+    'core-properties',
+])
+
+EXTENDED_PROPERTIES_RELATIONSHIP_TYPE = '/'.join([
+    'http://schemas.openxmlformats.org',
+    'officeDocument',
+    '2006',
+    'relationships',
+    'extended-properties',
+])
+
+# The properties that are reported, by their tag in each properties part
+CORE_PROPERTIES = [
+    ('title', 'title'),
+    ('subject', 'subject'),
+    ('creator', 'creator'),
+    ('keywords', 'keywords'),
+    ('description', 'description'),
+    ('lastModifiedBy', 'last_modified_by'),
+    ('revision', 'revision'),
+    ('created', 'created'),
+    ('modified', 'modified'),
+]
+
+EXTENDED_PROPERTIES = [
+    ('Application', 'application'),
+    ('Pages', 'pages'),
+    ('Words', 'words'),
+    ('Characters', 'characters'),
+]
+
+# The number of words of a page of text, used to estimate the page count
+WORDS_PER_PAGE = 500
+
+
+def get_attribute(element, name):
+    '''
+    Return the value of the attribute of the element with the given name,
+    whatever its namespace.
+    '''
+    for key, value in element.attrib.items():
+        if get_local_name(key) == name:
+            return value
+
+
+class DocumentInspector(object):
+    '''
+    Gathers the outline, element counts and properties of a document. Use
+    `inspect_document` unless the scan needs to be customized.
+    '''
+
+    words_per_page = WORDS_PER_PAGE
+
+    # The pydocx.util.limits.ResourceLimits applied to every inspection,
+    # unless other limits are passed to the constructor
+    limits = None
+
+    def __init__(self, path, limits=None):
+        self.path = path
+        if limits is not None:
+            self.limits = limits
+        self.document = None
+        self._heading_levels = {}
+
+    def inspect(self):
+        '''
+        Return an OrderedDict with the `metadata`, `counts`, `outline` and
+        `estimated_pages` of the document.
+        '''
+        budget = None
+        if self.limits is not None:
+            budget = self.limits.create_budget()
+        with enforce_budget(budget):
+            return self._inspect()
+
+    def _inspect(self):
+        self.document = WordprocessingDocument(path=self.path)
+        main_document_part = self.document.main_document_part
+        if main_document_part is None:
+            raise MalformedDocxException
+        report = OrderedDict()
+        report['metadata'] = self.get_metadata()
+        with stats_phase('inspect'):
+            counts, outline = self.scan(main_document_part)
+        report['counts'] = counts
+        report['outline'] = outline
+        report['estimated_pages'] = self.estimate_pages(counts)
+        return report
+
+    def get_metadata(self):
+        metadata = OrderedDict()
+        self.add_properties(
+            metadata,
+            CORE_PROPERTIES_RELATIONSHIP_TYPE,
+            CORE_PROPERTIES,
+        )
+        self.add_properties(
+            metadata,
+            EXTENDED_PROPERTIES_RELATIONSHIP_TYPE,
+            EXTENDED_PROPERTIES,
+        )
+        return metadata
+
+    def add_properties(self, metadata, relationship_type, properties):
+        package = self.document.package
+        relationships = package.get_relationships_by_type(relationship_type)
+        if not relationships:
+            return
+        uri = posixpath.join(package.uri, relationships[0].target_uri)
+        if not package.part_exists(uri):
+            return
+        root = parse_xml_from_string(
+            package.get_part(uri).stream.getvalue(),
+            remove_namespaces=True,
+        )
+        values = dict(
+            (child.tag, (child.text or '').strip())
+            for child in root
+        )
+        for tag, name in properties:
+            value = values.get(tag)
+            if not value:
+                continue
+            if value.isdigit():
+                value = int(value)
+            metadata[name] = value
+
+    def get_heading_level(self, style_id):
+        '''
+        Return the level of the heading style with the given id (e.g. 2 for
+        "heading 2"), 0 for a heading style without a level, or None if the
+        style isn't a heading (nor based on one).
+        '''
+        if style_id in self._heading_levels:
+            return self._heading_levels[style_id]
+        level = None
+        styles_part = self.document.main_document_part.style_definitions_part
+        for style in styles_part.get_style_chain_stack('paragraph', style_id):
+            if style.is_a_heading():
+                suffix = style.name.split()[-1]
+                level = int(suffix) if suffix.isdigit() else 0
+                break
+        self._heading_levels[style_id] = level
+        return level
+
+    def scan(self, main_document_part):
+        '''
+        Scan the body of the main document, and return the element counts
+        and the outline of its headings.
+        '''
+        counts = OrderedDict([
+            ('paragraphs', 0),
+            ('headings', 0),
+            ('tables', 0),
+            ('images', 0),
+            ('footnotes', 0),
+            ('hyperlinks', 0),
+            ('sections', 0),
+            ('page_breaks', 0),
+            ('rendered_page_breaks', 0),
+            ('words', 0),
+            ('characters', 0),
+        ])
+        outline = []
+        # The style id and text of the paragraphs being scanned, innermost
+        # last (paragraphs may be nested in text boxes)
+        paragraphs = []
+        # The depth of the AlternateContent Choice being skipped, if any.
+        # Each Choice has a Fallback with the same content, which is what is
+        # converted.
+        skipped_depth = None
+        depth = 0
+        budget = get_active_budget()
+        stream = main_document_part.package_part.open_stream()
+        try:
+            for event, element in iterparse_xml(stream):
+                if event == 'start':
+                    if budget is not None:
+                        budget.enter_node()
+                    depth += 1
+                    if skipped_depth is None:
+                        tag = get_local_name(element.tag)
+                        if tag == 'Choice':
+                            skipped_depth = depth
+                        elif tag == 'p':
+                            paragraphs.append([None, []])
+                    continue
+                if budget is not None:
+                    budget.exit_node()
+                depth -= 1
+                if skipped_depth is not None:
+                    if depth < skipped_depth:
+                        skipped_depth = None
+                    continue
+                self.count_element(element, counts, paragraphs, outline)
+                if depth == 2:
+                    # The body's blocks aren't needed once they are counted
+                    element.clear()
+        finally:
+            stream.close()
+        return counts, outline
+
+    def count_element(self, element, counts, paragraphs, outline):
+        tag = get_local_name(element.tag)
+        if tag == 't':
+            if paragraphs and element.text:
+                paragraphs[-1][1].append(element.text)
+        elif tag == 'tab':
+            # Tab stops (in paragraph properties) have a val
+            if paragraphs and get_attribute(element, 'val') is None:
+                paragraphs[-1][1].append('\t')
+        elif tag == 'pStyle':
+            # The style of a tracked change (in the paragraph properties that
+            # follow) isn't the paragraph's
+            if paragraphs and paragraphs[-1][0] is None:
+                paragraphs[-1][0] = get_attribute(element, 'val')
+        elif tag == 'p':
+            self.count_paragraph(paragraphs.pop(), counts, outline)
+        elif tag == 'tbl':
+            counts['tables'] += 1
+        elif tag == 'hyperlink':
+            counts['hyperlinks'] += 1
+        elif tag == 'footnoteReference':
+            counts['footnotes'] += 1
+        elif tag == 'br':
+            if get_attribute(element, 'type') == 'page':
+                counts['page_breaks'] += 1
+        elif tag == 'pageBreakBefore':
+            if get_attribute(element, 'val') not in ('0', 'false', 'off'):
+                counts['page_breaks'] += 1
+        elif tag == 'lastRenderedPageBreak':
+            counts['rendered_page_breaks'] += 1
+        elif tag == 'sectPr':
+            counts['sections'] += 1
+        elif tag in ('blip', 'imagedata'):
+            # DrawingML and VML pictures
+            counts['images'] += 1
+
+    def count_paragraph(self, paragraph, counts, outline):
+        style_id, texts = paragraph
+        text = ''.join(texts)
+        counts['paragraphs'] += 1
+        counts['words'] += len(text.split())
+        counts['characters'] += len(text)
+        level = None
+        if style_id is not None:
+            level = self.get_heading_level(style_id)
+        if level is not None:
+            counts['headings'] += 1
+            outline.append(OrderedDict([
+                ('level', level),
+                ('text', text.strip()),
+            ]))
+
+    def estimate_pages(self, counts):
+        '''
+        Estimate the page count from the explicit breaks (section breaks
+        are assumed to start new pages), the breaks Word recorded when it
+        last rendered the document, and the amount of text.
+        '''
+        text_pages = -(-counts['words'] // self.words_per_page)
+        return max(
+            1,
+            counts['page_breaks'] + counts['sections'],
+            counts['rendered_page_breaks'] + 1,
+            text_pages,
+        )
+
+
+def inspect_document(path_or_stream, limits=None):
+    '''
+    Return the metadata, element counts, heading outline and estimated page
+    count of a document, without converting it. `limits` are the
+    ResourceLimits of the inspection.
+    '''
+    return DocumentInspector(path_or_stream, limits=limits).inspect()
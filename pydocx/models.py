@@ -9,6 +9,9 @@ import importlib
 import inspect
 from collections import defaultdict
 
+from pydocx.util.limits import get_active_budget
+from pydocx.util.stats import get_active_stats
+
 try:
     unicode_string = unicode
 except NameError:
@@ -50,10 +53,32 @@ class XmlField(object):
         self.default = default
         self.type = type
 
+    def __get__(self, instance, owner):
+        # Only reached if the instance doesn't have a value for the field,
+        # i.e. if the field isn't set, or if the model was loaded lazily and
+        # the field isn't loaded yet
+        if instance is None:
+            return self
+        if instance._lazy_source is None:
+            # The model isn't loaded lazily (or all of its fields are
+            # decoded), so there is nothing to decode
+            field_name = get_own_fields(owner).get(self)
+            if field_name is None:
+                # A field of a base class (which isn't loaded)
+                return self
+            # The field may have been decoded by another thread since this
+            # was called
+            return instance.__dict__.get(field_name, self.default)
+        return instance._load_lazy_field(self)
+
 
 class XmlAttribute(XmlField):
     '''
     Represents that the field to be processed is an attribute
+
+    If specified, the raw value of the attribute (when it is present) will be
+    passed to `type`, e.g. to convert it to a number with one of the measures
+    in `pydocx.types`.
     '''
     pass
 
@@ -180,6 +205,136 @@ class XmlCollection(XmlField):
         return self.name_to_type_map.get(tag)
 
 
+def get_own_fields(model_class):
+    '''
+    Return a dict of the fields defined by the given model class (and not
+    by its bases) to their names.
+    '''
+    fields = _own_fields.get(model_class)
+    if fields is None:
+        fields = dict(
+            (field, field_name)
+            for field_name, field in model_class.__dict__.items()
+            if isinstance(field, XmlField)
+        )
+        _own_fields[model_class] = fields
+    return fields
+
+
+_own_fields = {}
+
+
+def get_child_fields_by_tag_name(model_class):
+    '''
+    Return a dict of the tag names of the XmlChild fields defined by the given
+    model class to lists of the (field name, field) of those fields.
+    '''
+    fields = _child_fields_by_tag_name.get(model_class)
+    if fields is None:
+        fields = defaultdict(list)
+        for field, field_name in get_own_fields(model_class).items():
+            if isinstance(field, XmlChild):
+                tag_name = get_child_tag_name(field_name, field)
+                fields[tag_name].append((field_name, field))
+        fields = dict(fields)
+        _child_fields_by_tag_name[model_class] = fields
+    return fields
+
+
+_child_fields_by_tag_name = {}
+
+
+def get_child_tag_name(field_name, field):
+    '''
+    Return the tag name of the child element of the given XmlChild field.
+    '''
+    # The attribute name is whatever the field name is, unless:
+    # field.name is set, or
+    # field.type.XML_TAG is set
+    tag_name = field_name
+
+    if field.name is not None:
+        tag_name = field.name
+    elif field.type:
+        field_type_tag = getattr(field.type, 'XML_TAG', None)
+        if field_type_tag:
+            tag_name = field_type_tag
+
+    assert tag_name
+    return tag_name
+
+
+def load_attribute(field_name, field, element):
+    attr_name = field_name
+    if field.name is not None:
+        attr_name = field.name
+    value = element.attrib.get(attr_name)
+    if value is None:
+        return field.default
+    if field.type is not None:
+        return field.type(value)
+    return value
+
+
+def load_child(field, child, load_kwargs):
+    '''
+    Return the value of the given XmlChild field for the given child element.
+    '''
+    # If attrname is set, then the value is an attribute on the child
+    if field.attrname:
+        value = child.attrib.get(field.attrname, field.default)
+    else:
+        # Otherwise it's just the child
+        value = child
+
+    # The type may be an XmlModel, if so, construct a new instance using
+    # XmlModel.load
+    if callable(field.type):
+        if inspect.isclass(field.type):
+            if issubclass(field.type, XmlModel):
+                return field.type.load(value, **load_kwargs)
+        return field.type(value)
+    return value
+
+
+def load_collection_item(collection, child, load_kwargs):
+    '''
+    Return the item of the given collection for the given child element.
+    '''
+    # different collection definitions may define different handlers for the
+    # same child
+    handler = collection.get_handler_for_tag(child.tag)
+    # If the handler is a XmlModel we want to use the load method, not the
+    # constructor
+    if issubclass(handler, XmlModel):
+        handler = handler.load
+    if callable(handler):
+        return handler(child, **load_kwargs)
+
+
+def iterate_children_resolving_alternate_content(element, branch):
+    '''
+    Yield the children of the given element, replacing each AlternateContent
+    child with the children of its selected `branch` (see
+    `AlternateContent.select_branch`). Nested AlternateContent elements are
+    resolved the same way.
+    '''
+    from pydocx.openxml.markup_compatibility import AlternateContent
+
+    for child in element:
+        if child.tag != AlternateContent.XML_TAG:
+            yield child
+            continue
+        selected = AlternateContent.select_branch(child, branch)
+        if selected is None:
+            continue
+        for selected_child in iterate_children_resolving_alternate_content(
+            selected,
+            branch,
+        ):
+            yield selected_child
+
+
 class XmlModel(object):
     '''
     Xml models are defined by inheriting this class, and then specifying class
@@ -201,29 +356,153 @@ class XmlModel(object):
     """
 
     person = Person.load(xml)
+
+    If `alternate_content` is passed to `load` (either
+    `AlternateContent.CHOICE` or `AlternateContent.FALLBACK`), each
+    AlternateContent element is replaced by the children of the selected
+    branch while loading, as if those children were defined directly on the
+    parent element. Otherwise AlternateContent elements are loaded as models.
+
+    If `lazy=True` is passed to `load`, the model (and each of its
+    descendants) keeps a reference to its element, and each field is only
+    decoded from the element the first time it is read. Fields that are never
+    read are never decoded.
+
+    Only the fields that are set (i.e. given a value other than their default)
+    are stored on the instance; the others read as their default. Models
+    typically set a few of many fields (e.g. the properties of a run), so
+    `fields` and `merge` only look at the fields that are set.
     '''
 
+    # The (element, load kwargs, depth) of a lazily loaded model, whose
+    # fields are decoded from the element on first access
+    _lazy_source = None
+
     def __init__(
         self,
         parent=None,
         **kwargs
     ):
+        lazy = self._lazy_source is not None
         for field_name, field in self.__class__.__dict__.items():
             if isinstance(field, XmlField):
                 # TODO field.default may only refer to the attr, and not if the
                 # field itself is missing
                 value = kwargs.get(field_name, field.default)
-                if hasattr(value, 'parent'):
-                    value.parent = self
-                if isinstance(field, XmlCollection):
-                    for item in value:
-                        if hasattr(item, 'parent'):
-                            item.parent = self
-                setattr(self, field_name, value)
+                if value is field.default or lazy and value is None:
+                    # Not set (or, if the model is loaded lazily, decoded on
+                    # first access)
+                    continue
+                self._set_field(field_name, field, value)
 
         self._parent = parent
         self.container = kwargs.get('container')
 
+    def _set_field(self, field_name, field, value):
+        if hasattr(value, 'parent'):
+            value.parent = self
+        if isinstance(field, XmlCollection):
+            for item in value:
+                if hasattr(item, 'parent'):
+                    item.parent = self
+        setattr(self, field_name, value)
+
+    def _load_lazy_field(self, field):
+        field_name = get_own_fields(type(self)).get(field)
+        if field_name is None:
+            # A field of a base class (which isn't loaded)
+            return field
+        source = self._lazy_source
+        if source is None:
+            # The field isn't set, or another thread decoded the remaining
+            # fields meanwhile
+            return self.__dict__.get(field_name, field.default)
+        element, load_kwargs, depth = source
+        if isinstance(field, XmlAttribute):
+            # Decoding attributes is cheap, so they are decoded together
+            for attribute, attribute_name in get_own_fields(type(self)).items():
+                if not isinstance(attribute, XmlAttribute):
+                    continue
+                if attribute_name not in self.__dict__:
+                    setattr(self, attribute_name, load_attribute(
+                        attribute_name,
+                        attribute,
+                        element,
+                    ))
+            value = getattr(self, field_name)
+        elif isinstance(field, XmlContent):
+            value = force_unicode(element.text)
+            self._set_field(field_name, field, value)
+        else:
+            budget = get_active_budget()
+            if budget is None:
+                value = self._load_lazy_children(field_name, field, source)
+            else:
+                # The children are as deep as if they were loaded with the
+                # model
+                outer_depth = budget.depth
+                budget.depth = depth
+                try:
+                    value = self._load_lazy_children(field_name, field, source)
+                finally:
+                    budget.depth = outer_depth
+        if all(name in self.__dict__ for name in get_own_fields(type(self)).values()):
+            # Every field is decoded, so the element is no longer needed
+            self._lazy_source = None
+        return value
+
+    def _load_lazy_children(self, field_name, field, source):
+        element, load_kwargs, _ = source
+        children = element
+        alternate_content = load_kwargs.get('alternate_content')
+        if alternate_content:
+            children = iterate_children_resolving_alternate_content(
+                element,
+                alternate_content,
+            )
+        if isinstance(field, XmlCollection):
+            value = [
+                load_collection_item(field, child, load_kwargs)
+                for child in children
+                if child.tag in field.name_to_type_map
+            ]
+            self._set_field(field_name, field, value)
+            return value
+        # The child fields are decoded together, so that the children are
+        # only scanned once. Their models are loaded lazily as well.
+        fields_by_tag_name = get_child_fields_by_tag_name(type(self))
+        values = {}
+        for child in children:
+            for child_field_name, child_field in fields_by_tag_name.get(child.tag, ()):
+                values[child_field_name] = load_child(child_field, child, load_kwargs)
+        for child_fields in fields_by_tag_name.values():
+            for child_field_name, child_field in child_fields:
+                if child_field_name in self.__dict__:
+                    # Already assigned
+                    continue
+                self._set_field(
+                    child_field_name,
+                    child_field,
+                    values.get(child_field_name, child_field.default),
+                )
+        return getattr(self, field_name)
+
+    def load_fields(self):
+        '''
+        Decode all of the fields of a lazily loaded model that haven't been
+        read yet, and release its element.
+        '''
+        if self._lazy_source is None:
+            return
+        for field_name in get_own_fields(type(self)).values():
+            getattr(self, field_name)
+        self._lazy_source = None
+
+    def __getstate__(self):
+        # Elements aren't pickled along with the models (e.g. in snapshots)
+        self.load_fields()
+        return self.__dict__
+
     @property
     def parent(self):
         return self._parent
@@ -259,18 +538,49 @@ class XmlModel(object):
     @property
     def fields(self):
         '''
-        A generator that loops through each of the defined fields for the
+        A generator that loops through each of the fields that are set on the
         model, and yields back only those fields which have been set to a value
         that isn't the field's default.
         '''
-        for field_name, field in self.__class__.__dict__.items():
-            if isinstance(field, XmlField):
-                value = getattr(self, field_name, field.default)
-                if value != field.default:
-                    yield field_name, value
+        if self._lazy_source is not None:
+            self.load_fields()
+        model_fields = self.__class__.__dict__
+        for field_name, value in list(self.__dict__.items()):
+            field = model_fields.get(field_name)
+            if isinstance(field, XmlField) and value != field.default:
+                yield field_name, value
+
+    @classmethod
+    def merge(cls, *models):
+        '''
+        Return a new model with the fields that are set on each of the given
+        models (which may be None), where the fields of the later models
+        take precedence over those of the earlier ones:
+
+        properties = RunProperties.merge(style_properties, run.properties)
+
+        Only the fields that are set are copied. Their values are shared with
+        the given models, and aren't re-parented.
+        '''
+        merged = cls()
+        for model in models:
+            if model is not None:
+                merged.__dict__.update(model.fields)
+        return merged
 
     @classmethod
     def load(cls, element, **load_kwargs):
+        budget = get_active_budget()
+        if budget is None:
+            return cls._load(element, **load_kwargs)
+        budget.enter_node()
+        try:
+            return cls._load(element, **load_kwargs)
+        finally:
+            budget.exit_node()
+
+    @classmethod
+    def _load(cls, element, **load_kwargs):
         xml_tag_decl = getattr(cls, 'XML_TAG', None)
         if element is not None and xml_tag_decl:
             if xml_tag_decl != element.tag:
@@ -282,6 +592,9 @@ class XmlModel(object):
                 )
 
         kwargs = dict(load_kwargs)
+        alternate_content = kwargs.pop('alternate_content', None)
+        if kwargs.pop('lazy', False) and element is not None:
+            return cls._load_lazily(element, kwargs, load_kwargs)
         attribute_fields = {}
         tag_fields = {}
         collections = {}
@@ -304,57 +617,17 @@ class XmlModel(object):
 
         # Evaluate each of the attribute fields against the given element
         for field_name, field in attribute_fields.items():
-            attr_name = field_name
-            if field.name is not None:
-                attr_name = field.name
-            value = element.attrib.get(attr_name, field.default)
-            kwargs[field_name] = value
+            kwargs[field_name] = load_attribute(field_name, field, element)
 
         # Child tag fields may specify a handler/type, which is responsible for
         # parsing the child tag
         tag_name_to_field_names = defaultdict(list)
-        child_handlers = {}
-
-        def create_child_handler(field):
-            def child_handler(child):
-                # If attrname is set, then the value is an attribute on the
-                # child
-                if field.attrname:
-                    value = child.attrib.get(field.attrname, field.default)
-                else:
-                    # Otherwise it's just the child
-                    value = child
-
-                # The type may be an XmlModel, if so, construct a new instance
-                # using XmlModel.load
-                if callable(field.type):
-                    if inspect.isclass(field.type):
-                        if issubclass(field.type, XmlModel):
-                            return field.type.load(value, **load_kwargs)
-                    return field.type(value)
-                return value
-            return child_handler
 
         # Evaluate the child tags
         for field_name, field in tag_fields.items():
-            # The attribute name is whatever the field name is, unless:
-            # field.name is set, or
-            # field.type.XML_TAG is set
-            tag_name = field_name
-
-            if field.name is not None:
-                tag_name = field.name
-            elif field.type:
-                field_type_tag = getattr(field.type, 'XML_TAG', None)
-                if field_type_tag:
-                    tag_name = field_type_tag
-
-            assert tag_name
-
+            tag_name = get_child_tag_name(field_name, field)
             # Based on the tag name, we need to know what the field name is
             tag_name_to_field_names[tag_name].append(field_name)
-            # Save the handler
-            child_handlers[field_name] = create_child_handler(field)
 
         # Build a mapping of tag names to collections
         collection_member_to_collections = defaultdict(list)
@@ -363,16 +636,23 @@ class XmlModel(object):
                 collection_member_to_collections[tag_name].append(field_name)
 
         if element is not None:
+            children = element
+            if alternate_content:
+                children = iterate_children_resolving_alternate_content(
+                    element,
+                    alternate_content,
+                )
             # Process each child
-            for child in element:
+            for child in children:
                 tag = child.tag
                 # Does this child have a corresponding field?
                 field_names = tag_name_to_field_names.get(tag, [])
                 for field_name in field_names:
-                    # Execute the handler
-                    handler = child_handlers.get(field_name, None)
-                    if callable(handler):
-                        kwargs[field_name] = handler(child)
+                    kwargs[field_name] = load_child(
+                        tag_fields[field_name],
+                        child,
+                        load_kwargs,
+                    )
 
                 # Does a this child belong to a collection?
                 parent_collections = collection_member_to_collections.get(
@@ -382,16 +662,25 @@ class XmlModel(object):
                 for field_name in parent_collections:
                     collection = collections.get(field_name)
                     if collection:
-                        # different collection definitions may define different
-                        # handlers for the same child
-                        handler = collection.get_handler_for_tag(tag)
-                        # If the handler is a XmlModel we want to use the load
-                        # method, not the constructor
-                        if issubclass(handler, XmlModel):
-                            handler = handler.load
-                        if callable(handler):
-                            item = handler(child, **load_kwargs)
-                            kwargs[field_name].append(item)
+                        kwargs[field_name].append(
+                            load_collection_item(collection, child, load_kwargs),
+                        )
+
+        stats = get_active_stats()
+        if stats is not None:
+            stats.count_node(cls)
 
         # Create a new instance using the values we've calculated
         return cls(**kwargs)
+
+    @classmethod
+    def _load_lazily(cls, element, kwargs, load_kwargs):
+        stats = get_active_stats()
+        if stats is not None:
+            stats.count_node(cls)
+        budget = get_active_budget()
+        depth = 0 if budget is None else budget.depth
+        model = cls.__new__(cls)
+        model._lazy_source = (element, load_kwargs, depth)
+        model.__init__(**kwargs)
+        return model
@@ -6,10 +6,11 @@ from __future__ import (
 )
 
 from pydocx.models import XmlModel, XmlAttribute
+from pydocx.types import Emu
 
 
 class Extents(XmlModel):
     XML_TAG = 'ext'
 
-    length = XmlAttribute(name='cx')
-    width = XmlAttribute(name='cy')
+    length = XmlAttribute(type=Emu, name='cx')
+    width = XmlAttribute(type=Emu, name='cy')
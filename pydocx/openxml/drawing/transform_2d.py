@@ -7,10 +7,11 @@ from __future__ import (
 
 from pydocx.models import XmlModel, XmlChild, XmlAttribute
 from pydocx.openxml.drawing.extents import Extents
+from pydocx.types import Integer
 
 
 class Transform2D(XmlModel):
     XML_TAG = 'xfrm'
 
     extents = XmlChild(type=Extents)
-    rotate = XmlAttribute(name='rot', default=None)
+    rotate = XmlAttribute(type=Integer, name='rot', default=None)
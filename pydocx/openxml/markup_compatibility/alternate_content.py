@@ -11,4 +11,26 @@ from pydocx.openxml.markup_compatibility.fallback import Fallback
 
 class AlternateContent(XmlModel):
     XML_TAG = 'AlternateContent'
+
+    # Branches that may be selected at load time. See `XmlModel.load`.
+    CHOICE = 'choice'
+    FALLBACK = 'fallback'
+
     children = XmlCollection(Fallback)
+
+    @classmethod
+    def select_branch(cls, element, branch):
+        '''
+        Given an AlternateContent element, return the Choice or Fallback
+        element whose children should replace it, or None if there isn't one.
+
+        If `branch` is CHOICE, the first Choice is selected, and the Fallback
+        is used when there are no Choices.
+        '''
+        fallback = None
+        for child in element:
+            if child.tag == 'Choice' and branch == cls.CHOICE:
+                return child
+            if child.tag == Fallback.XML_TAG and fallback is None:
+                fallback = child
+        return fallback
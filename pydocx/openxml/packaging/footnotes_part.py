@@ -7,6 +7,7 @@ from __future__ import (
 
 from pydocx.openxml.packaging.open_xml_part import OpenXmlPart
 from pydocx.openxml.wordprocessing import Footnotes
+from pydocx.util.stats import stats_phase
 
 
 class FootnotesPart(OpenXmlPart):
@@ -34,6 +35,15 @@ class FootnotesPart(OpenXmlPart):
             self._footnotes = self.load_footnotes()
         return self._footnotes
 
+    def load_models(self):
+        self.footnotes
+
     def load_footnotes(self):
-        self._footnotes = Footnotes.load(self.root_element, container=self)
+        with stats_phase('load_models'):
+            self._footnotes = Footnotes.load(
+                self.root_element,
+                container=self,
+                alternate_content=self.alternate_content,
+                lazy=self.open_xml_package.lazy_models,
+            )
         return self._footnotes
@@ -12,6 +12,8 @@ from pydocx.openxml.packaging.numbering_definitions_part import NumberingDefinit
 from pydocx.openxml.packaging.open_xml_part import OpenXmlPart
 from pydocx.openxml.packaging.style_definitions_part import StyleDefinitionsPart  # noqa
 from pydocx.openxml.wordprocessing import Document
+from pydocx.util.preview import parse_document_prefix
+from pydocx.util.stats import stats_phase
 
 
 class MainDocumentPart(OpenXmlPart):
@@ -42,6 +44,27 @@ class MainDocumentPart(OpenXmlPart):
     def __init__(self, *args, **kwargs):
         super(MainDocumentPart, self).__init__(*args, **kwargs)
         self._document = None
+        # Whether only the start of the body was parsed, for a preview
+        self.is_truncated = False
+
+    @property
+    def root_element(self):
+        preview = self.open_xml_package.preview
+        if preview is None or self._root_element is not None:
+            return super(MainDocumentPart, self).root_element
+        package_part = self.package_part
+        if package_part is None:
+            return
+        stream = package_part.open_stream()
+        try:
+            with stats_phase('parse_xml'):
+                self._root_element, self.is_truncated = parse_document_prefix(
+                    stream,
+                    preview,
+                )
+        finally:
+            stream.close()
+        return self._root_element
 
     @property
     def document(self):
@@ -49,16 +72,30 @@ class MainDocumentPart(OpenXmlPart):
             self._document = self.load_document()
         return self._document
 
+    def load_models(self):
+        self.document
+
     def load_document(self):
-        self._document = Document.load(self.root_element, container=self)
+        with stats_phase('load_models'):
+            self._document = Document.load(
+                self.root_element,
+                container=self,
+                alternate_content=self.alternate_content,
+                lazy=self.open_xml_package.lazy_models,
+            )
         return self._document
 
     def get_relationship_lookup(self):
         package_lookup = self.open_xml_package.get_relationship_lookup()
         return package_lookup.get_part(self.uri)
 
+    def is_part_type_excluded(self, part_class):
+        return part_class in self.open_xml_package.excluded_part_types
+
     @property
     def style_definitions_part(self):
+        if self.is_part_type_excluded(StyleDefinitionsPart):
+            return None
         part = self.get_part_of_class_type(part_class=StyleDefinitionsPart)
         if part is None:
             part = StyleDefinitionsPart(
@@ -70,6 +107,8 @@ class MainDocumentPart(OpenXmlPart):
 
     @property
     def numbering_definitions_part(self):
+        if self.is_part_type_excluded(NumberingDefinitionsPart):
+            return None
         part = self.get_part_of_class_type(part_class=NumberingDefinitionsPart)
         if part is None:
             part = NumberingDefinitionsPart(
@@ -91,4 +130,6 @@ class MainDocumentPart(OpenXmlPart):
 
     @property
     def footnotes_part(self):
+        if self.is_part_type_excluded(FootnotesPart):
+            return None
         return self.get_part_of_class_type(part_class=FootnotesPart)
@@ -7,6 +7,7 @@ from __future__ import (
 
 from pydocx.openxml.packaging.open_xml_part import OpenXmlPart
 from pydocx.openxml.wordprocessing import Numbering
+from pydocx.util.stats import stats_phase
 
 
 class NumberingDefinitionsPart(OpenXmlPart):
@@ -34,6 +35,15 @@ class NumberingDefinitionsPart(OpenXmlPart):
             self._numbering = self.load_numbering()
         return self._numbering
 
+    def load_models(self):
+        self.numbering
+
     def load_numbering(self):
-        self._numbering = Numbering.load(self.root_element, container=self)
+        with stats_phase('load_models'):
+            self._numbering = Numbering.load(
+                self.root_element,
+                container=self,
+                alternate_content=self.alternate_content,
+                lazy=self.open_xml_package.lazy_models,
+            )
         return self._numbering
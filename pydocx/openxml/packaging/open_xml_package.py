@@ -16,6 +16,19 @@ class OpenXmlPackage(OpenXmlPartContainer):
     See also: http://msdn.microsoft.com/en-us/library/documentformat.openxml.packaging.openxmlpackage%28v=office.14%29.aspx  # noqa
     '''
 
+    # The OpenXmlPart classes that are treated as if they didn't exist, so
+    # that they are never decompressed or parsed (e.g. the footnotes when only
+    # the text of the document is needed)
+    excluded_part_types = frozenset()
+
+    # If set to a pydocx.util.preview.PreviewLimits, only the start of the
+    # main document's body is parsed and loaded
+    preview = None
+
+    # If True, the models of the parts are loaded lazily: each field is only
+    # decoded from the XML the first time it is read (see `XmlModel.load`)
+    lazy_models = False
+
     def __init__(self, path):
         super(OpenXmlPackage, self).__init__()
         self.package = ZipPackage(path=path)
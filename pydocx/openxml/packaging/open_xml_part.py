@@ -5,6 +5,7 @@ from __future__ import (
     unicode_literals,
 )
 
+from pydocx.openxml.markup_compatibility import AlternateContent
 from pydocx.openxml.packaging.open_xml_part_container import OpenXmlPartContainer  # noqa
 from pydocx.util.xml import parse_xml_from_string
 
@@ -17,6 +18,11 @@ class OpenXmlPart(OpenXmlPartContainer):
     See also: http://msdn.microsoft.com/en-us/library/documentformat.openxml.packaging.openxmlpart%28v=office.14%29.aspx  # noqa
     '''
 
+    # Each AlternateContent is replaced by the children of this branch when
+    # the part's models are loaded. Set to None to load AlternateContent
+    # models instead.
+    alternate_content = AlternateContent.FALLBACK
+
     def __init__(
         self,
         uri,
@@ -39,6 +45,20 @@ class OpenXmlPart(OpenXmlPartContainer):
             )
         return self._root_element
 
+    def load_models(self):
+        '''
+        Load the models of this part, which are otherwise loaded on first
+        access. Parts that don't have models don't need to do anything.
+        '''
+        pass
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The parsed XML is only needed to load the models, and lxml elements
+        # can't be pickled.
+        state['_root_element'] = None
+        return state
+
     @property
     def package_part(self):
         return self.open_xml_package.package.get_part(self.uri)
@@ -0,0 +1,189 @@
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from io import BytesIO
+
+from pydocx.exceptions import InvalidSnapshotException
+from pydocx.openxml.packaging.word_processing_document import WordprocessingDocument  # noqa
+
+SNAPSHOT_MAGIC = b'PYDOCX-SNAPSHOT'
+
+# Increment this whenever the pickled structure of the packages, parts or
+# models changes in a way that isn't covered by the pydocx version.
+SNAPSHOT_FORMAT_VERSION = 2
+
+# The pickled document is compressed, since it includes the data of every
+# part in the package. Decompressing is fast regardless of the level.
+SNAPSHOT_COMPRESSION_LEVEL = 1
+
+
+def get_snapshot_version():
+    '''
+    Snapshots can only be restored by the same snapshot format and pydocx
+    version that created them.
+    '''
+    from pydocx import __version__
+    version = '{format_version}:{pydocx_version}'.format(
+        format_version=SNAPSHOT_FORMAT_VERSION,
+        pydocx_version=__version__,
+    )
+    return version.encode('utf-8')
+
+
+def read_docx_data(path_or_stream):
+    if hasattr(path_or_stream, 'read'):
+        path_or_stream.seek(0)
+        return path_or_stream.read()
+    with open(path_or_stream, 'rb') as f:
+        return f.read()
+
+
+def get_content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_document_completely(document):
+    '''
+    Load everything that is otherwise loaded on first access: the zip package
+    parts, all of the relationships, the OpenXml parts and their models.
+    '''
+    package = document.package
+    package.relationships
+    for part in package.get_parts():
+        part.relationships
+
+    containers = [document]
+    loaded_parts = set()
+    while containers:
+        container = containers.pop()
+        if not container.child_part_types:
+            continue
+        container.parts
+        for parts in container.parts_of_type.values():
+            for part in parts:
+                if id(part) in loaded_parts:
+                    continue
+                loaded_parts.add(id(part))
+                part.load_models()
+                containers.append(part)
+    return document
+
+
+def dumps_snapshot(document):
+    '''
+    Return the snapshot of the given WordprocessingDocument as bytes. The
+    document is loaded completely first, and must not have been exported yet,
+    since exporting modifies the models.
+    '''
+    load_document_completely(document)
+    return b'\n'.join([
+        SNAPSHOT_MAGIC,
+        get_snapshot_version(),
+        zlib.compress(
+            pickle.dumps(document, pickle.HIGHEST_PROTOCOL),
+            SNAPSHOT_COMPRESSION_LEVEL,
+        ),
+    ])
+
+
+def loads_snapshot(data):
+    '''
+    Restore a WordprocessingDocument from a snapshot created by
+    `dumps_snapshot`. Each call returns a new, independent document.
+
+    Snapshots are pickles, so they must only be loaded from a trusted source.
+
+    Raises InvalidSnapshotException if the snapshot was created by a different
+    pydocx version or snapshot format.
+    '''
+    try:
+        magic, version, compressed = data.split(b'\n', 2)
+    except ValueError:
+        raise InvalidSnapshotException('Not a pydocx snapshot')
+    if magic != SNAPSHOT_MAGIC:
+        raise InvalidSnapshotException('Not a pydocx snapshot')
+    if version != get_snapshot_version():
+        raise InvalidSnapshotException(
+            'The snapshot was created by a different version of pydocx',
+        )
+    return pickle.loads(zlib.decompress(compressed))
+
+
+class DocumentSnapshotCache(object):
+    '''
+    Caches snapshots of documents in `directory`, keyed by the SHA-256 hash of
+    the docx data, so that documents which are converted repeatedly don't need
+    to be unzipped, parsed and loaded each time.
+
+    Snapshots are pickles, so the directory must not be writable by untrusted
+    users.
+
+    Example:
+
+    cache = DocumentSnapshotCache('/var/cache/pydocx')
+    exporter = PyDocXHTMLExporter(path)
+    exporter.document = cache.get_document(path)
+    html = exporter.export()
+    '''
+
+    file_extension = '.pydocx-snapshot'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def get_snapshot_path(self, content_hash):
+        return os.path.join(self.directory, content_hash + self.file_extension)
+
+    def load(self, content_hash):
+        '''
+        Return the document restored from the snapshot with the given content
+        hash, or None if there is no (valid) snapshot.
+        '''
+        path = self.get_snapshot_path(content_hash)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None
+        try:
+            return loads_snapshot(data)
+        except InvalidSnapshotException:
+            return None
+
+    def save(self, content_hash, document):
+        data = dumps_snapshot(document)
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        # Write to a temporary file first, so that a partially written
+        # snapshot is never loaded
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.rename(temp_path, self.get_snapshot_path(content_hash))
+        except (IOError, OSError):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def get_document(self, path_or_stream):
+        '''
+        Return the WordprocessingDocument for the given docx, restoring it
+        from its snapshot if there is one, and creating the snapshot
+        otherwise.
+        '''
+        data = read_docx_data(path_or_stream)
+        content_hash = get_content_hash(data)
+        document = self.load(content_hash)
+        if document is None:
+            document = WordprocessingDocument(path=BytesIO(data))
+            self.save(content_hash, document)
+        return document
@@ -7,6 +7,7 @@ from __future__ import (
 
 from pydocx.openxml.packaging.open_xml_part import OpenXmlPart
 from pydocx.openxml.wordprocessing import Styles
+from pydocx.util.stats import stats_phase
 
 
 class StyleDefinitionsPart(OpenXmlPart):
@@ -32,9 +33,18 @@ class StyleDefinitionsPart(OpenXmlPart):
     def styles(self):
         if self._styles:
             return self._styles
-        self._styles = Styles.load(self.root_element, container=self)
+        with stats_phase('load_models'):
+            self._styles = Styles.load(
+                self.root_element,
+                container=self,
+                alternate_content=self.alternate_content,
+                lazy=self.open_xml_package.lazy_models,
+            )
         return self._styles
 
+    def load_models(self):
+        self.styles
+
     def get_style_chain_stack(self, style_type, style_id):
         '''
         Given a style_type and style_id, return the hierarchy of styles ordered
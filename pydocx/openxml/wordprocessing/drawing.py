@@ -36,12 +36,9 @@ class Drawing(XmlModel):
             extents = graphic.graphic_data.picture.shape_properties.xfrm.extents  # noqa
         except AttributeError:
             pass
-        if extents:
-            try:
-                length = int(extents.length)
-                width = int(extents.width)
-            except (TypeError, ValueError):
-                length = width = 0
+        if extents and extents.length is not None and extents.width is not None:
+            length = extents.length
+            width = extents.width
         return length, width
 
     def get_picture_rotate_angle(self):
@@ -52,18 +49,15 @@ class Drawing(XmlModel):
         except AttributeError:
             pass
         if rotate:
-            try:
-                # according to this link
-                # http://www.ecma-international.org/publications/standards/Ecma-376.htm
-                # §20.1.10.3
-                #
-                # "This simple type represents an angle in 60,000ths of a degree.
-                # Positive angles are clockwise (i.e., towards the positive y axis);
-                # negative angles are counter-clockwise (i.e., towards the negative y axis)."
+            # according to this link
+            # http://www.ecma-international.org/publications/standards/Ecma-376.htm
+            # §20.1.10.3
+            #
+            # "This simple type represents an angle in 60,000ths of a degree.
+            # Positive angles are clockwise (i.e., towards the positive y axis);
+            # negative angles are counter-clockwise (i.e., towards the negative y axis)."
 
-                rotate = int(int(rotate) / 60000)
-            except (TypeError, ValueError):
-                rotate = None
+            rotate = int(rotate / 60000)
 
         return rotate
 
@@ -6,6 +6,7 @@ from __future__ import (
 )
 
 from pydocx.models import XmlModel, XmlChild, XmlAttribute
+from pydocx.types import Integer
 from pydocx.openxml.wordprocessing.run_properties import RunProperties
 from pydocx.openxml.wordprocessing.paragraph_properties import ParagraphProperties  # noqa
 
@@ -14,7 +15,7 @@ class Level(XmlModel):
     XML_TAG = 'lvl'
 
     level_id = XmlAttribute(name='ilvl')
-    start = XmlChild(attrname='val')
+    start = XmlChild(type=Integer, attrname='val')
     num_format = XmlChild(name='numFmt', attrname='val')
     restart = XmlChild(name='lvlRestart', attrname='val')
     paragraph_style = XmlChild(name='pStyle', attrname='val')
@@ -6,6 +6,7 @@ from __future__ import (
 )
 
 from pydocx.models import XmlModel, XmlChild
+from pydocx.types import Twips
 from pydocx.openxml.wordprocessing.numbering_properties import NumberingProperties  # noqa
 
 
@@ -20,10 +21,10 @@ class ParagraphProperties(XmlModel):
 
     # TODO Left/right is for traditional conformance. Need to handle start/end
     # for strict conformance
-    indentation_left = XmlChild(name='ind', attrname='left')
-    indentation_right = XmlChild(name='ind', attrname='right')
-    indentation_first_line = XmlChild(name='ind', attrname='firstLine')
-    indentation_hanging = XmlChild(name='ind', attrname='hanging')
+    indentation_left = XmlChild(type=Twips, name='ind', attrname='left')
+    indentation_right = XmlChild(type=Twips, name='ind', attrname='right')
+    indentation_first_line = XmlChild(type=Twips, name='ind', attrname='firstLine')  # noqa
+    indentation_hanging = XmlChild(type=Twips, name='ind', attrname='hanging')
 
     @property
     def start_margin_position(self):
@@ -33,21 +34,17 @@ class ParagraphProperties(XmlModel):
         # 17.3.1.12 - The firstLine and hanging attributes are mutually
         # exclusive, if both are specified, then the firstLine value is
         # ignored.
-        start_margin = 0
-        if self.indentation_left:
-            start_margin += int(float(self.indentation_left))
+        start_margin = self.indentation_left or 0
         if self.indentation_hanging:
-            start_margin -= int(float(self.indentation_hanging))
+            start_margin -= self.indentation_hanging
         elif self.indentation_first_line:
-            start_margin += int(float(self.indentation_first_line))
-        if start_margin:
-            return start_margin
-        return 0
+            start_margin += self.indentation_first_line
+        return start_margin
 
     def to_int(self, attribute, default=None):
-        # TODO would be nice if this integer conversion was handled
-        # implicitly by the model somehow
-        try:
-            return int(getattr(self, attribute, default))
-        except (ValueError, TypeError):
+        # The indentation fields are converted to numbers when the properties
+        # are loaded, so this only needs to handle missing values
+        value = getattr(self, attribute, None)
+        if value is None:
             return default
+        return value
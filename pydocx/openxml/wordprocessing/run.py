@@ -65,45 +65,32 @@ class Run(XmlModel):
     def _get_properties_inherited_from_parent_paragraph(self):
         from pydocx.openxml.wordprocessing.paragraph import Paragraph
 
-        inherited_properties = {}
-
         parent_paragraph = self.get_first_ancestor(Paragraph)
-        if parent_paragraph:
-            style_stack = parent_paragraph.get_style_chain_stack()
-            for style in reversed(list(style_stack)):
-                if style.run_properties:
-                    inherited_properties.update(
-                        dict(style.run_properties.fields),
-                    )
-        return inherited_properties
+        if not parent_paragraph:
+            return []
+        style_stack = parent_paragraph.get_style_chain_stack()
+        return [style.run_properties for style in reversed(list(style_stack))]
 
     def _get_inherited_properties_from_parent_style(self):
-        inherited_properties = {}
         style_stack = self.get_style_chain_stack()
-        for style in reversed(list(style_stack)):
-            if style.run_properties:
-                inherited_properties.update(
-                    dict(style.run_properties.fields),
-                )
-        return inherited_properties
+        return [style.run_properties for style in reversed(list(style_stack))]
+
+    def _get_inherited_properties_stack(self):
+        '''
+        Return the run properties of the styles this run inherits from, in
+        increasing order of precedence.
+        '''
+        paragraph_properties = self._get_properties_inherited_from_parent_paragraph()
+        style_properties = self._get_inherited_properties_from_parent_style()
+        return paragraph_properties + style_properties
 
     @property
     def inherited_properties(self):
-        properties = {}
-        properties.update(
-            self._get_properties_inherited_from_parent_paragraph(),
-        )
-        properties.update(
-            self._get_inherited_properties_from_parent_style(),
-        )
-        return RunProperties(**properties)
+        return RunProperties.merge(*self._get_inherited_properties_stack())
 
     @property
     @memoized
     def effective_properties(self):
-        inherited_properties = self.inherited_properties
-        effective_properties = {}
-        effective_properties.update(dict(inherited_properties.fields))
-        if self.properties:
-            effective_properties.update(dict(self.properties.fields))
-        return RunProperties(**effective_properties)
+        properties_stack = self._get_inherited_properties_stack()
+        properties_stack.append(self.properties)
+        return RunProperties.merge(*properties_stack)
@@ -6,7 +6,7 @@ from __future__ import (
 )
 
 from pydocx.models import XmlModel, XmlChild
-from pydocx.types import OnOff, Underline
+from pydocx.types import HalfPoints, OnOff, Underline
 from pydocx.openxml.wordprocessing.rfonts import RFonts
 
 
@@ -24,8 +24,8 @@ class RunProperties(XmlModel):
     hidden = XmlChild(type=OnOff, name='webHidden', attrname='val')
     vertical_align = XmlChild(name='vertAlign', attrname='val')
     parent_style = XmlChild(name='rStyle', attrname='val')
-    pos = XmlChild(name='position', attrname='val')
-    sz = XmlChild(name='sz', attrname='val')
+    pos = XmlChild(type=HalfPoints, name='position', attrname='val')
+    sz = XmlChild(type=HalfPoints, name='sz', attrname='val')
     clr = XmlChild(name='color', attrname='val')
     r_fonts = XmlChild(type=RFonts)
 
@@ -47,13 +47,7 @@ class RunProperties(XmlModel):
 
     @property
     def size(self):
-        if self.sz is None:
-            return
-        try:
-            size = float(self.sz)
-        except ValueError:
-            size = None
-        return size
+        return self.sz
 
     def is_superscript(self):
         return self.vertical_align == 'superscript'
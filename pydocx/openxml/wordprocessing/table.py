@@ -5,12 +5,93 @@ from __future__ import (
     unicode_literals,
 )
 
-from collections import defaultdict
+from array import array
 
 from pydocx.models import XmlModel, XmlCollection
 from pydocx.openxml.wordprocessing.table_row import TableRow
 
 
+class TableGrid(object):
+    '''
+    The rowspan and colspan of every cell in a table, stored row by row, cell
+    by cell in two compact arrays. The spans of a cell are looked up by its
+    position: the index of its row, and its index within the row.
+
+    A rowspan of 0 means that the cell continues a vertically merged group of
+    cells started in a previous row, and therefore does not start a new cell.
+    '''
+
+    def __init__(self):
+        self.rowspans = array(str('I'))
+        self.colspans = array(str('I'))
+        # The index in the arrays of the first cell of each row
+        self.row_starts = array(str('I'))
+        # The index of each row of the table
+        self.row_indexes = {}
+
+    def __len__(self):
+        return len(self.rowspans)
+
+    def get_cell_spans(self, row_index, cell_index):
+        index = self.row_starts[row_index] + cell_index
+        return self.rowspans[index], self.colspans[index]
+
+    def get_cell_position(self, cell):
+        '''
+        Return the index of the row of the given cell of the table, and the
+        index of the cell within that row.
+        '''
+        row = cell.parent
+        return self.row_indexes[row], row.cells.index(cell)
+
+    def iter_cell_spans(self):
+        for index in range(len(self)):
+            yield self.rowspans[index], self.colspans[index]
+
+    @classmethod
+    def from_table(cls, table):
+        grid = cls()
+        rowspans = grid.rowspans
+        colspans = grid.colspans
+
+        # The index of the cell which started the currently active vertical
+        # merge, for each grid column
+        active_merge_by_grid_column = {}
+        for row_index, row in enumerate(table.rows):
+            grid.row_starts.append(len(rowspans))
+            grid.row_indexes[row] = row_index
+            grid_column = 0
+            for cell in row.cells:
+                properties = cell.properties
+                colspan = 1
+                vertical_merge = None
+                if properties:
+                    colspan = properties.get_grid_span()
+                    vertical_merge = properties.vertical_merge
+
+                rowspan = 1
+                if vertical_merge is None:
+                    # If this element is omitted, then this cell shall not be
+                    # part of any vertically merged grouping of cells, and any
+                    # vertically merged group of preceding cells shall be
+                    # closed.
+                    active_merge_by_grid_column.pop(grid_column, None)
+                else:
+                    merge = vertical_merge.get('val', 'continue')
+                    if merge == 'restart':
+                        active_merge_by_grid_column[grid_column] = len(rowspans)
+                    elif merge == 'continue':
+                        rowspan = 0
+                        start = active_merge_by_grid_column.get(grid_column)
+                        if start is not None:
+                            rowspans[start] += 1
+
+                rowspans.append(rowspan)
+                colspans.append(colspan)
+                grid_column += colspan
+        return grid
+
+
 class Table(XmlModel):
     XML_TAG = 'tbl'
 
@@ -18,30 +99,5 @@ class Table(XmlModel):
         TableRow,
     )
 
-    def calculate_table_cell_spans(self):
-        if not self.rows:
-            return
-
-        active_rowspan_cells_by_column = {}
-        cell_to_rowspan_count = defaultdict(int)
-        for row in self.rows:
-            for column_index, cell in enumerate(row.cells):
-                properties = cell.properties
-                # If this element is omitted, then this cell shall not be
-                # part of any vertically merged grouping of cells, and any
-                # vertically merged group of preceding cells shall be
-                # closed.
-                if properties is None or properties.vertical_merge is None:
-                    # if properties are missing, this is the same as the
-                    # the element being omitted
-                    active_rowspan_cells_by_column[column_index] = None
-                elif properties:
-                    vertical_merge = properties.vertical_merge.get('val', 'continue')  # noqa
-                    if vertical_merge == 'restart':
-                        active_rowspan_cells_by_column[column_index] = cell
-                        cell_to_rowspan_count[cell] += 1
-                    elif vertical_merge == 'continue':
-                        active_rowspan_for_column = active_rowspan_cells_by_column.get(column_index)  # noqa
-                        if active_rowspan_for_column:
-                            cell_to_rowspan_count[active_rowspan_for_column] += 1  # noqa
-        return dict(cell_to_rowspan_count)
+    def calculate_table_grid(self):
+        return TableGrid.from_table(self)
@@ -6,15 +6,21 @@ from __future__ import (
 )
 
 from pydocx.models import XmlModel, XmlChild
+from pydocx.types import Integer
 
 
 class TableCellProperties(XmlModel):
     XML_TAG = 'tcPr'
 
-    grid_span = XmlChild(name='gridSpan', attrname='val')
+    grid_span = XmlChild(type=Integer, name='gridSpan', attrname='val')
 
     vertical_merge = XmlChild(name='vMerge', type=lambda el: dict(el.attrib))  # noqa
 
+    def get_grid_span(self):
+        if self.grid_span is None:
+            return 1
+        return max(self.grid_span, 1)
+
     def should_close_previous_vertical_merge(self):
         # If vMerge is omitted, then this cell shall not be part of any
         # vertically merged grouping of cells, and any vertically merged group
@@ -10,6 +10,8 @@ from collections import defaultdict
 from io import BytesIO
 
 from pydocx.exceptions import MalformedDocxException
+from pydocx.util import stats
+from pydocx.util.limits import get_active_budget
 from pydocx.util.xml import (
     parse_xml_from_string,
     xml_tag_split,
@@ -163,7 +165,33 @@ class ZipPackagePart(PackageRelationshipManager):
 
     @property
     def stream(self):
-        return self.package.streams[self.uri]
+        return self.package.get_stream(self.uri)
+
+    def open_stream(self):
+        return self.package.open_stream(self.uri)
+
+
+class ZipMemberReader(object):
+    '''
+    Reads a member of a zip archive as it is decompressed, counting the
+    bytes decompressed and checking them against the active ResourceBudget.
+    '''
+
+    def __init__(self, member):
+        self.member = member
+        self.size = 0
+        self.budget = get_active_budget()
+
+    def read(self, size=-1):
+        data = self.member.read(size)
+        self.size += len(data)
+        if self.budget is not None:
+            self.budget.check_member_size(self.size)
+        stats.count('bytes_decompressed', len(data))
+        return data
+
+    def close(self):
+        self.member.close()
 
 
 class ZipPackage(PackageRelationshipManager):
@@ -171,15 +199,29 @@ class ZipPackage(PackageRelationshipManager):
     Represents a container that can that can store multiple data objects using
     a ZIP archive as a data store.
 
+    The compressed archive is read into memory when the parts are loaded, and
+    each part is only decompressed when its stream is first accessed, so that
+    parts which are never used (e.g. images that aren't exported) cost
+    nothing.
+
     See also: http://msdn.microsoft.com/en-us/library/system.io.packaging.zippackage.aspx  # noqa
     '''
 
+    # The size of the chunks in which members are decompressed when their
+    # size is limited by a ResourceBudget
+    read_chunk_size = 64 * 1024
+
     def __init__(self, path):
         super(ZipPackage, self).__init__()
         self.path = path
         self.streams = {}
         self.uri = '/'
         self._parts = None
+        # The compressed data of the archive, until every part is
+        # decompressed
+        self._archive_data = None
+        self._zip_file = None
+        self._member_infos = {}
         self.relationship_uri = ZipPackagePart.get_relationship_part_uri(
             self.uri,
         )
@@ -187,23 +229,117 @@ class ZipPackage(PackageRelationshipManager):
     def _load_parts(self):
         if self.path is None:
             return
+        with stats.stats_phase('unzip'):
+            self._read_archive()
+        for uri in self._member_infos:
+            self.create_part(uri)
+
+    def _read_archive(self):
+        if hasattr(self.path, 'read'):
+            self.path.seek(0)
+            self._archive_data = self.path.read()
+        else:
+            with open(self.path, 'rb') as f:
+                self._archive_data = f.read()
+        budget = get_active_budget()
+        for info in self.zip_file.infolist():
+            if budget is not None:
+                # Refuse members whose declared size is over budget before
+                # decompressing anything
+                budget.check_member_size(info.file_size)
+                budget.add_bytes(info.file_size)
+            self._member_infos[self.uri + info.filename] = info
+
+    @property
+    def zip_file(self):
+        if self._zip_file is None:
+            try:
+                self._zip_file = zipfile.ZipFile(BytesIO(self._archive_data))
+            except zipfile.BadZipfile:
+                raise MalformedDocxException()
+        return self._zip_file
+
+    def get_stream(self, uri):
+        '''
+        Return the stream of the member with the given URI, decompressing it
+        on first access.
+        '''
+        stream = self.streams.get(uri)
+        if stream is None:
+            stream = BytesIO(self._read_member(self._member_infos[uri]))
+            self.streams[uri] = stream
+        return stream
+
+    def open_stream(self, uri):
+        '''
+        Return a file-like object that decompresses the member with the
+        given URI as it is read, so that reading only the start of a large
+        member doesn't decompress all of it. The member is not kept. If it
+        was already decompressed, a copy of its stream is returned instead.
+        '''
+        stream = self.streams.get(uri)
+        if stream is not None:
+            return BytesIO(stream.getvalue())
+        return ZipMemberReader(self.zip_file.open(self._member_infos[uri]))
+
+    def _read_member(self, info):
+        budget = get_active_budget()
+        with stats.stats_phase('unzip'):
+            if budget is None:
+                data = self.zip_file.read(info)
+            else:
+                budget.check_deadline()
+                data = self._read_member_within_budget(info, budget)
+        stats.count('bytes_decompressed', len(data))
+        return data
+
+    def _read_member_within_budget(self, info, budget):
+        # Check the actual size while decompressing, in case the declared size
+        # is wrong
+        chunks = []
+        size = 0
+        member = self.zip_file.open(info)
         try:
-            f = zipfile.ZipFile(self.path)
-        except zipfile.BadZipfile:
-            raise MalformedDocxException()
-        try:
-            uris = f.namelist()
-            for uri in uris:
-                data = f.read(uri)
-                self.streams[self.uri + uri] = BytesIO(data)
+            while True:
+                chunk = member.read(self.read_chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                budget.check_member_size(size)
+                chunks.append(chunk)
         finally:
-            f.close()
-        for uri in self.streams:
-            self.create_part(uri)
+            member.close()
+        return b''.join(chunks)
+
+    def get_member_checksum(self, uri):
+        '''
+        Return the CRC-32 of the member with the given URI (or None if there
+        is no such member), which is recorded in the archive, so that the
+        member doesn't need to be decompressed.
+        '''
+        info = self._member_infos.get(uri)
+        if info is None:
+            return None
+        return info.CRC
 
     def get_part_container(self):
         return self
 
+    def __getstate__(self):
+        if self._archive_data is not None:
+            # Decompress the remaining parts, so that the (already compressed)
+            # archive doesn't need to be pickled as well
+            for uri in self._member_infos:
+                self.get_stream(uri)
+        state = self.__dict__.copy()
+        state['_archive_data'] = None
+        state['_zip_file'] = None
+        if self._parts is not None:
+            # Once the parts are loaded, the path (which may be an open file)
+            # is no longer needed
+            state['path'] = None
+        return state
+
     @property
     def parts(self):
         if self._parts is None:
@@ -5,13 +5,64 @@ from __future__ import (
 )
 
 from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.inspection import inspect_document
 
 
 class PyDocX(object):
     @staticmethod
-    def to_html(path_or_stream):
-        return PyDocXHTMLExporter(path_or_stream).export()
+    def to_html(
+        path_or_stream,
+        stats=None,
+        profiler=None,
+        limits=None,
+        block_cache=None,
+        preview=None,
+        image_processor=None,
+        images=None,
+        footnotes=None,
+        numbering=None,
+        styles=None,
+    ):
+        exporter = PyDocXHTMLExporter(
+            path_or_stream,
+            stats=stats,
+            profiler=profiler,
+            limits=limits,
+            block_cache=block_cache,
+            preview=preview,
+            image_processor=image_processor,
+            images=images,
+            footnotes=footnotes,
+            numbering=numbering,
+            styles=styles,
+        )
+        return exporter.export()
 
     @staticmethod
-    def to_markdown(path_or_stream):
-        return PyDocXMarkdownExporter(path_or_stream).export()
+    def to_markdown(
+        path_or_stream,
+        stats=None,
+        profiler=None,
+        limits=None,
+        block_cache=None,
+        preview=None,
+        footnotes=None,
+        numbering=None,
+        styles=None,
+    ):
+        exporter = PyDocXMarkdownExporter(
+            path_or_stream,
+            stats=stats,
+            profiler=profiler,
+            limits=limits,
+            block_cache=block_cache,
+            preview=preview,
+            footnotes=footnotes,
+            numbering=numbering,
+            styles=styles,
+        )
+        return exporter.export()
+
+    @staticmethod
+    def inspect(path_or_stream, limits=None):
+        return inspect_document(path_or_stream, limits=limits)
@@ -0,0 +1,606 @@
+# coding: utf-8
+'''
+A local conversion server that keeps warm worker processes around, so that
+each conversion doesn't pay for interpreter start up, imports and cold
+caches:
+
+    $ pydocx serve --port 8000 --workers 4
+    $ curl --data-binary @file.docx 'http://127.0.0.1:8000/convert?format=html'
+
+The server process imports and warms up pydocx, then forks the workers,
+which accept connections on the shared listening socket (TCP or Unix). Each
+worker handles one request at a time, and is replaced after
+`max_requests` requests. Conversions are limited to `timeout` seconds (and
+`max_decompressed_bytes`) by ResourceLimits, and workers that are still
+busy `kill_grace` seconds after that (e.g. stuck in a single XML parse, or
+reading a request from a client that sends it very slowly) are killed and
+replaced. Reads from clients time out after `read_timeout` seconds.
+
+Endpoints:
+
+POST /convert?format=html|markdown
+    The request body is the docx. Responds with the converted document.
+GET /health
+    Responds with {"status": "ok"} while the server is up.
+GET /metrics
+    Responds with the conversion counters of all of the workers as JSON.
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import argparse
+import importlib
+import json
+import logging
+import mmap
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from urllib.parse import parse_qs, urlparse
+except ImportError:  # python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from urlparse import parse_qs, urlparse
+
+from pydocx.exceptions import (
+    MalformedDocxException,
+    ResourceLimitExceededException,
+)
+from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.models import XmlCollection, XmlModel
+from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.util.limits import ResourceLimits
+from pydocx.util.zip import create_zip_archive
+
+logger = logging.getLogger(__name__)
+
+EXPORTERS = {
+    'html': (PyDocXHTMLExporter, 'text/html; charset=utf-8'),
+    'markdown': (PyDocXMarkdownExporter, 'text/markdown; charset=utf-8'),
+}
+
+# The modules that define models, which are imported (and their models'
+# collections resolved) before the workers are forked
+MODEL_MODULES = [
+    'pydocx.openxml.drawing',
+    'pydocx.openxml.markup_compatibility',
+    'pydocx.openxml.vml',
+    'pydocx.openxml.wordprocessing',
+]
+
+# A small document that is converted before the workers are forked, to warm
+# up the code paths (and lazy imports) of a typical conversion
+WARM_UP_DOCUMENT = {
+    '_rels/.rels': '''
+        <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+          <Relationship Id="rId1" Type="{type}" Target="word/document.xml"/>
+        </Relationships>
+    '''.format(type=MainDocumentPart.relationship_type),  # noqa
+    'word/document.xml': '''
+        <document><body>
+          <p><pPr><ind left="720"/></pPr><r><rPr><b/><sz val="24"/></rPr><t>Warm</t></r></p>
+          <tbl><tr><tc><p><r><t>up</t></r></p></tc></tr></tbl>
+        </body></document>
+    ''',  # noqa
+}
+
+
+def iterate_model_classes(model_class=XmlModel):
+    for subclass in model_class.__subclasses__():
+        yield subclass
+        for descendant in iterate_model_classes(subclass):
+            yield descendant
+
+
+def warm_up():
+    '''
+    Import the models and exporters, resolve the types of every model
+    collection and run a small conversion, so that forked workers start with
+    all of that in (copy-on-write) memory.
+    '''
+    for module_name in MODEL_MODULES:
+        importlib.import_module(module_name)
+    for model_class in iterate_model_classes():
+        for field in model_class.__dict__.values():
+            if isinstance(field, XmlCollection):
+                field.name_to_type_map
+    docx = create_zip_archive(WARM_UP_DOCUMENT).getvalue()
+    for exporter_class, _ in EXPORTERS.values():
+        convert(exporter_class, docx)
+
+
+def convert(exporter_class, data, limits=None):
+    output = exporter_class(BytesIO(data), limits=limits).export()
+    # The Markdown exporter yields its output in pieces
+    return ''.join(output)
+
+
+class WorkerMetrics(object):
+    '''
+    Conversion counters of each worker, in memory that is shared by the server
+    and its (forked) workers. A slot is only written by its worker while the
+    worker runs, and by the server once the worker has exited (to finish the
+    request of a worker that was killed), so no locking is needed. The
+    counters of a slot accumulate across the workers that have used it.
+    '''
+
+    fields = (
+        'pid',
+        'conversions',
+        'failures',
+        'bytes_received',
+        'bytes_sent',
+        'busy_seconds',
+        # When the current request started, or 0 if the worker is idle
+        'busy_since',
+    )
+    slot_format = str('<{0}d').format(len(fields))
+    slot_size = struct.calcsize(slot_format)
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.memory = mmap.mmap(-1, self.slot_size * workers)
+
+    def read(self, index):
+        offset = index * self.slot_size
+        values = struct.unpack(
+            self.slot_format,
+            self.memory[offset:offset + self.slot_size],
+        )
+        return OrderedDict(zip(self.fields, values))
+
+    def write(self, index, **values):
+        slot = self.read(index)
+        slot.update(values)
+        offset = index * self.slot_size
+        self.memory[offset:offset + self.slot_size] = struct.pack(
+            self.slot_format,
+            *slot.values()
+        )
+
+    def start_request(self, index, bytes_received=0):
+        slot = self.read(index)
+        self.write(
+            index,
+            conversions=slot['conversions'] + 1,
+            bytes_received=slot['bytes_received'] + bytes_received,
+            busy_since=time.time(),
+        )
+
+    def receive(self, index, bytes_received):
+        slot = self.read(index)
+        self.write(index, bytes_received=slot['bytes_received'] + bytes_received)
+
+    def finish_request(self, index, bytes_sent, error=False):
+        slot = self.read(index)
+        self.write(
+            index,
+            failures=slot['failures'] + (1 if error else 0),
+            bytes_sent=slot['bytes_sent'] + bytes_sent,
+            busy_seconds=slot['busy_seconds'] + time.time() - slot['busy_since'],
+            busy_since=0,
+        )
+
+    def to_dict(self):
+        slots = [self.read(index) for index in range(self.workers)]
+        report = OrderedDict()
+        for field in ('conversions', 'failures', 'bytes_received', 'bytes_sent'):
+            report[field] = int(sum(slot[field] for slot in slots))
+        report['busy_seconds'] = sum(slot['busy_seconds'] for slot in slots)
+        report['busy_workers'] = sum(1 for slot in slots if slot['busy_since'])
+        return report
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    server_version = str('pydocx')
+
+    # The number of seconds that reads from the client may take, so that a
+    # client that stops sending (e.g. before the end of the request body)
+    # doesn't stall the worker. Set from the server's `read_timeout`.
+    timeout = 30
+
+    @property
+    def conversion_server(self):
+        return self.server.conversion_server
+
+    def setup(self):
+        self.timeout = self.conversion_server.read_timeout
+        # Whether a conversion request was started in the worker's metrics
+        # and not finished yet
+        self.request_started = False
+        BaseHTTPRequestHandler.setup(self)
+
+    def start_request(self):
+        server = self.conversion_server
+        server.metrics.start_request(server.worker_index)
+        self.request_started = True
+
+    def finish_request(self, bytes_sent, error):
+        if not self.request_started:
+            return
+        self.request_started = False
+        server = self.conversion_server
+        server.metrics.finish_request(server.worker_index, bytes_sent, error=error)
+
+    def address_string(self):
+        # Unix socket clients don't have an address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        logger.info('%s %s', self.address_string(), format % args)
+
+    def send_body(self, status, body, content_type):
+        body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        # The request is counted before its response is sent, so that a
+        # client that reads the metrics once it has the response sees it.
+        # Sending is limited by the socket's timeout instead.
+        self.finish_request(len(body), error=status >= 400)
+        self.wfile.write(body)
+
+    def send_json(self, status, data):
+        self.send_body(status, json.dumps(data), 'application/json')
+
+    def send_error_json(self, status, message, **details):
+        error = dict(details, error=message)
+        self.send_json(status, error)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        elif path == '/metrics':
+            self.send_json(200, self.conversion_server.get_metrics())
+        else:
+            self.send_error_json(404, 'Not found')
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/convert':
+            self.send_error_json(404, 'Not found')
+            return
+        output_format = parse_qs(url.query).get('format', ['html'])[0]
+        if output_format not in EXPORTERS:
+            self.send_error_json(400, 'Unknown format: {0}'.format(output_format))
+            return
+        try:
+            length = int(self.headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            self.send_error_json(411, 'Content-Length is required')
+            return
+        server = self.conversion_server
+        if server.max_request_bytes is not None and length > server.max_request_bytes:
+            self.send_error_json(413, 'The document is too large')
+            return
+
+        # The worker is busy from here on, so that it is killed if reading
+        # the body and converting it take too long
+        self.start_request()
+        try:
+            data = self.read_body(length)
+            server.metrics.receive(server.worker_index, len(data))
+            if len(data) < length:
+                self.close_connection = True
+                self.send_error_json(
+                    408,
+                    'The request body was not received in time',
+                )
+                return
+            self.convert(output_format, data)
+        finally:
+            # If no response could be sent
+            self.finish_request(0, error=True)
+
+    def read_body(self, length):
+        '''
+        Return the request body, which is shorter than `length` if the client
+        stopped sending it or was too slow.
+        '''
+        # read1 returns what has been received so far, instead of waiting for
+        # the whole chunk (and losing it if the read times out)
+        read = getattr(self.rfile, 'read1', self.rfile.read)
+        chunks = []
+        remaining = length
+        try:
+            while remaining > 0:
+                chunk = read(min(remaining, 64 * 1024))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+        except socket.timeout:
+            pass
+        return b''.join(chunks)
+
+    def convert(self, output_format, data):
+        '''
+        Convert the docx and send the response. The output is sent once the
+        conversion is complete (rather than streamed), so that a conversion
+        that fails gets an error response.
+        '''
+        exporter_class, content_type = EXPORTERS[output_format]
+        try:
+            output = convert(
+                exporter_class,
+                data,
+                limits=self.conversion_server.limits,
+            )
+        except MalformedDocxException:
+            self.send_error_json(400, 'The document is not a valid docx')
+            return
+        except ResourceLimitExceededException as e:
+            status = 504 if e.limit_name == 'timeout' else 422
+            self.send_error_json(
+                status,
+                'The document exceeds the {0} limit'.format(e.limit_name),
+                limit=e.limit_name,
+            )
+            return
+        except Exception:
+            logger.exception('Failed to convert a document')
+            self.send_error_json(500, 'The conversion failed')
+            return
+        self.send_body(200, output, content_type)
+
+
+class WorkerHTTPServer(HTTPServer):
+    '''
+    Handles requests from a listening socket created by the
+    ConversionServer, instead of binding its own.
+    '''
+
+    def __init__(self, conversion_server):
+        HTTPServer.__init__(
+            self,
+            conversion_server.address,
+            ConversionRequestHandler,
+            bind_and_activate=False,
+        )
+        self.socket.close()
+        self.socket = conversion_server.socket
+        self.conversion_server = conversion_server
+
+
+class ConversionServer(object):
+    '''
+    A pre-forking HTTP conversion server. `address` is either a (host, port)
+    tuple, or the path of a Unix socket.
+    '''
+
+    # How often the server checks on its workers, in seconds
+    poll_interval = 0.1
+
+    def __init__(
+        self,
+        address,
+        workers=2,
+        max_requests=1000,
+        timeout=60,
+        kill_grace=5,
+        max_request_bytes=100 * 1024 * 1024,
+        max_decompressed_bytes=1024 * 1024 * 1024,
+        read_timeout=ConversionRequestHandler.timeout,
+    ):
+        self.address = address
+        self.workers = workers
+        self.max_requests = max_requests
+        self.timeout = timeout
+        self.kill_grace = kill_grace
+        self.read_timeout = read_timeout
+        self.max_request_bytes = max_request_bytes
+        self.limits = ResourceLimits(
+            max_total_bytes=max_decompressed_bytes,
+            timeout=timeout,
+        )
+        self.socket = None
+        self.metrics = WorkerMetrics(workers)
+        self.worker_pids = {}
+        # The workers that were killed for being overdue, until they exit
+        self.overdue_pids = set()
+        self.worker_index = None
+        self.restarts = 0
+        self.started_at = None
+        self.running = False
+
+    @property
+    def is_unix_socket(self):
+        return not isinstance(self.address, tuple)
+
+    def listen(self):
+        if self.is_unix_socket:
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(self.address)
+        self.socket.listen(128)
+        if not self.is_unix_socket:
+            # The port is chosen by the OS when it is 0
+            self.address = self.socket.getsockname()[:2]
+
+    @property
+    def url(self):
+        if self.is_unix_socket:
+            return 'unix:{0}'.format(self.address)
+        return 'http://{0}:{1}'.format(*self.address)
+
+    def get_metrics(self):
+        metrics = OrderedDict()
+        metrics['workers'] = self.workers
+        metrics['worker_restarts'] = self.restarts
+        metrics['uptime_seconds'] = time.time() - self.started_at
+        metrics.update(self.metrics.to_dict())
+        return metrics
+
+    def spawn_worker(self, index):
+        pid = os.fork()
+        if pid:
+            self.worker_pids[pid] = index
+            return
+        # In the worker. Never return to the server's code.
+        exit_code = 1
+        try:
+            self.run_worker(index)
+            exit_code = 0
+        except Exception:
+            logger.exception('Worker %s failed', os.getpid())
+        finally:
+            os._exit(exit_code)
+
+    def run_worker(self, index):
+        # The server stops the workers (with SIGTERM) when it is interrupted
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.worker_index = index
+        self.metrics.write(index, pid=os.getpid(), busy_since=0)
+        server = WorkerHTTPServer(self)
+        handled = 0
+        while self.max_requests is None or handled < self.max_requests:
+            server.handle_request()
+            handled += 1
+
+    def reap_workers(self):
+        while self.worker_pids:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                return
+            self.worker_exited(pid)
+
+    def worker_exited(self, pid):
+        index = self.worker_pids.pop(pid, None)
+        if index is None:
+            return
+        if pid in self.overdue_pids:
+            self.overdue_pids.remove(pid)
+            # The request of the killed worker is finished now that the
+            # worker can no longer write to its slot
+            self.metrics.finish_request(index, 0, error=True)
+        if self.running:
+            self.restarts += 1
+            self.spawn_worker(index)
+
+    def kill_overdue_workers(self):
+        if self.timeout is None:
+            return
+        deadline = time.time() - self.timeout - self.kill_grace
+        for pid, index in list(self.worker_pids.items()):
+            if pid in self.overdue_pids:
+                continue
+            busy_since = self.metrics.read(index)['busy_since']
+            if busy_since and busy_since < deadline:
+                logger.warning('Killing worker %s, which is overdue', pid)
+                self.overdue_pids.add(pid)
+                os.kill(pid, signal.SIGKILL)
+
+    def stop(self, *args):
+        self.running = False
+
+    def serve_forever(self):
+        warm_up()
+        self.listen()
+        self.started_at = time.time()
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for index in range(self.workers):
+            self.spawn_worker(index)
+        logger.info('Listening on %s', self.url)
+        print('Listening on {0}'.format(self.url))
+        sys.stdout.flush()
+        try:
+            while self.running:
+                self.reap_workers()
+                self.kill_overdue_workers()
+                time.sleep(self.poll_interval)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self.running = False
+        for pid in self.worker_pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        while self.worker_pids:
+            pid, _ = os.waitpid(-1, 0)
+            self.worker_pids.pop(pid, None)
+        self.socket.close()
+        if self.is_unix_socket and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        prog='pydocx serve',
+        description='Run a local conversion server with warm workers.',
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument(
+        '--socket',
+        help='Listen on this Unix socket instead of --host and --port',
+    )
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument(
+        '--max-requests',
+        type=int,
+        default=1000,
+        help='Replace each worker after this many requests (0 to never)',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=60,
+        help='The number of seconds each conversion may take',
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=ConversionRequestHandler.timeout,
+        help='The number of seconds reads from a client may take',
+    )
+    parser.add_argument(
+        '--max-request-bytes',
+        type=int,
+        default=100 * 1024 * 1024,
+        help='The largest docx that is accepted',
+    )
+    parser.add_argument(
+        '--max-decompressed-bytes',
+        type=int,
+        default=1024 * 1024 * 1024,
+        help='The largest decompressed size of a docx that is converted',
+    )
+    args = parser.parse_args(args)
+
+    if not hasattr(os, 'fork'):
+        print('pydocx serve requires a platform that supports fork')
+        return 2
+    address = args.socket or (args.host, args.port)
+    server = ConversionServer(
+        address,
+        workers=args.workers,
+        max_requests=args.max_requests or None,
+        timeout=args.timeout,
+        max_request_bytes=args.max_request_bytes,
+        max_decompressed_bytes=args.max_decompressed_bytes,
+        read_timeout=args.read_timeout,
+    )
+    server.serve_forever()
+    return 0
@@ -12,6 +12,9 @@ class SimpleType(object):
     def __bool__(self):
         return self.__nonzero__()
 
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, self.value)
+
 
 class OnOff(SimpleType):
     '''
@@ -57,3 +60,53 @@ class Underline(SimpleType):
     def __nonzero__(self):
         OFF_VALUES = ['none', '', None]
         return self.value not in OFF_VALUES
+
+
+class Measure(object):
+    '''
+    A numeric simple type, such as a length in twips. Declare it as the type
+    of a field to convert the field's value to a number once, when the model
+    is loaded, instead of each time it is used. Values with a fractional part
+    are accepted (and truncated for integer measures), since some producers
+    write them. Missing and invalid values are None.
+
+    >>> Twips('720')
+    720
+    >>> Twips('-720.6')
+    -720
+    >>> HalfPoints('21')
+    21.0
+    >>> Twips('auto') is None
+    True
+    >>> Twips(None) is None
+    True
+    '''
+
+    def __init__(self, number_type=int):
+        self.number_type = number_type
+
+    def __call__(self, value):
+        if value is None:
+            return None
+        try:
+            return self.number_type(value)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return self.number_type(float(value))
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+
+# http://www.schemacentral.com/sc/ooxml/t-w_ST_SignedTwipsMeasure.html
+Twips = Measure(int)
+
+# http://www.schemacentral.com/sc/ooxml/t-w_ST_SignedHpsMeasure.html
+HalfPoints = Measure(float)
+
+# English Metric Units
+# http://www.schemacentral.com/sc/ooxml/t-a_ST_Coordinate.html
+Emu = Measure(int)
+
+# http://www.schemacentral.com/sc/ooxml/t-w_ST_DecimalNumber.html
+Integer = Measure(int)
@@ -0,0 +1,156 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+import time
+from contextlib import contextmanager
+
+from pydocx.exceptions import ResourceLimitExceededException
+
+# The budget of the conversion running in this thread
+_active = threading.local()
+
+
+class ResourceLimits(object):
+    '''
+    Limits on the resources a single conversion may use. Each limit is
+    disabled when it is None. Pass an instance to an exporter to enforce them
+    while it exports:
+
+    limits = ResourceLimits(max_total_bytes=50 * 1024 * 1024, timeout=30)
+    html = PyDocXHTMLExporter(path, limits=limits).export()
+
+    `max_total_bytes` and `max_member_bytes` limit the decompressed size of
+    the whole docx and of each file within it. The sizes declared by the zip
+    are checked before anything is decompressed (including files that are
+    never used), and the actual sizes are checked while decompressing, in
+    case the declared sizes are wrong.
+
+    `max_nodes` limits the number of models that are loaded, and `max_depth`
+    how deeply they may be nested.
+
+    `timeout` is the number of seconds the conversion may run for. It is
+    checked as each model is loaded and as each node is exported, so a
+    conversion stops soon after its deadline, but only once it is consumed
+    (e.g. by `iter_export`).
+
+    When a limit is exceeded, ResourceLimitExceededException is raised.
+
+    The limits are only enforced while the export runs. Documents that are
+    loaded before exporting them (e.g. by accessing the exporter's
+    main_document_part) aren't limited.
+    '''
+
+    def __init__(
+        self,
+        max_total_bytes=None,
+        max_member_bytes=None,
+        max_nodes=None,
+        max_depth=None,
+        timeout=None,
+    ):
+        self.max_total_bytes = max_total_bytes
+        self.max_member_bytes = max_member_bytes
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    def create_budget(self):
+        '''
+        Return the budget for a new conversion. The deadline starts now.
+        '''
+        return ResourceBudget(self)
+
+
+class ResourceBudget(object):
+    '''
+    Tracks the resources used by a conversion against its ResourceLimits.
+    '''
+
+    # When loading models, the deadline is only checked every this many
+    # nodes
+    deadline_check_interval = 1000
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.total_bytes = 0
+        self.nodes = 0
+        self.depth = 0
+        self.deadline = None
+        if limits.timeout is not None:
+            self.deadline = time.time() + limits.timeout
+
+    def exceeded(self, name, limit):
+        raise ResourceLimitExceededException(
+            'The document exceeds the {name} limit of {limit}'.format(
+                name=name,
+                limit=limit,
+            ),
+            name,
+            limit,
+        )
+
+    def check_member_size(self, size):
+        '''
+        Check the size of a file in the docx (declared or decompressed so
+        far) before decompressing more of it.
+        '''
+        limits = self.limits
+        if limits.max_member_bytes is not None and size > limits.max_member_bytes:
+            self.exceeded('max_member_bytes', limits.max_member_bytes)
+
+    def add_bytes(self, size):
+        '''
+        Add the (declared) size of a file in the docx to the total.
+        '''
+        self.total_bytes += size
+        limits = self.limits
+        if limits.max_total_bytes is not None and self.total_bytes > limits.max_total_bytes:
+            self.exceeded('max_total_bytes', limits.max_total_bytes)
+
+    def enter_node(self):
+        self.nodes += 1
+        self.depth += 1
+        limits = self.limits
+        if limits.max_nodes is not None and self.nodes > limits.max_nodes:
+            self.exceeded('max_nodes', limits.max_nodes)
+        if limits.max_depth is not None and self.depth > limits.max_depth:
+            self.exceeded('max_depth', limits.max_depth)
+        if self.nodes % self.deadline_check_interval == 0:
+            self.check_deadline()
+
+    def exit_node(self):
+        self.depth -= 1
+
+    def check_deadline(self):
+        if self.deadline is not None and time.time() > self.deadline:
+            self.exceeded('timeout', self.limits.timeout)
+
+
+def get_active_budget():
+    '''
+    Return the ResourceBudget of the conversion running in the current
+    thread, or None.
+    '''
+    return getattr(_active, 'budget', None)
+
+
+@contextmanager
+def enforce_budget(budget):
+    '''
+    Make the given budget the active budget of the current thread while the
+    block runs. Does nothing if the budget is None.
+    '''
+    if budget is None:
+        yield
+        return
+    previous_budget = get_active_budget()
+    _active.budget = budget
+    try:
+        yield
+    finally:
+        _active.budget = previous_budget
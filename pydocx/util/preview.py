@@ -0,0 +1,107 @@
+# coding: utf-8
+'''
+Exporting only the start of a document, e.g. for previews of uploads.
+
+The body of the main document is parsed as it is decompressed, and parsing
+stops once there are enough top level blocks (paragraphs, tables, etc.) for
+the preview. The rest of the body is never decompressed, parsed or loaded,
+and so neither are the images it uses. The blocks that were loaded are then
+rendered until the preview is full (see `pydocx.export.preview`).
+'''
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from pydocx.util.stats import count
+from pydocx.util.xml import (
+    get_local_name,
+    iterparse_xml,
+    remove_namespaces_from_tree,
+)
+
+
+class PreviewLimits(object):
+    '''
+    Limits an export to the start of the document. Each limit is disabled
+    when it is None. Pass an instance to an exporter to preview a document:
+
+    preview = PreviewLimits(max_blocks=50, max_chars=5000)
+    html = PyDocXHTMLExporter(path, preview=preview).export()
+
+    `max_blocks` limits the number of top level blocks of the body that are
+    loaded and rendered. Each paragraph of a list counts as a block.
+
+    `max_chars` and `max_bytes` limit the length of the rendered body, in
+    characters and in UTF-8 encoded bytes. Blocks are rendered in order, and
+    rendering stops before the first block that would exceed the limit. The
+    rest of the output (e.g. the HTML head and the footnotes of the rendered
+    blocks) isn't counted. Blocks are only loaded until their text alone
+    would fill the preview, since each block renders at least its text.
+
+    The final section properties of the body (and so the page width) aren't
+    loaded if the body is cut short.
+    '''
+
+    def __init__(self, max_blocks=None, max_chars=None, max_bytes=None):
+        self.max_blocks = max_blocks
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+
+    def is_exceeded(self, blocks=0, chars=0, byte_count=0):
+        limits_and_values = (
+            (self.max_blocks, blocks),
+            (self.max_chars, chars),
+            (self.max_bytes, byte_count),
+        )
+        return any(
+            limit is not None and value > limit
+            for limit, value in limits_and_values
+        )
+
+
+def parse_document_prefix(stream, preview):
+    '''
+    Parse the start of a main document (without namespaces) from the
+    stream, stopping once its body has enough blocks for the preview. Return
+    the root element, and whether parsing stopped before the end of the
+    body.
+    '''
+    root = None
+    body = None
+    depth = 0
+    blocks = 0
+    chars = 0
+    byte_count = 0
+    truncated = False
+    for event, element in iterparse_xml(stream):
+        if event == 'start':
+            if depth == 0:
+                root = element
+            elif depth == 1 and get_local_name(element.tag) == 'body':
+                body = element
+            depth += 1
+            continue
+        depth -= 1
+        if body is None or depth < 2:
+            continue
+        if get_local_name(element.tag) == 't' and element.text:
+            chars += len(element.text)
+            if preview.max_bytes is not None:
+                byte_count += len(element.text.encode('utf-8'))
+        if depth == 2:
+            blocks += 1
+            # The blocks are enough to fill the preview once one more block
+            # would exceed the limits
+            if preview.is_exceeded(blocks + 1, chars + 1, byte_count + 1):
+                truncated = True
+                break
+    if truncated:
+        # The parser may already have read past the last block
+        for child in list(body)[blocks:]:
+            body.remove(child)
+        count('preview_blocks_loaded', blocks)
+    if root is not None:
+        remove_namespaces_from_tree(root)
+    return root, truncated
@@ -0,0 +1,177 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+# The stats that are being collected by the conversion running in this thread
+_active = threading.local()
+
+
+class ConversionStats(object):
+    '''
+    Collects timings and counters for a conversion. Pass an instance to an
+    exporter (or `PyDocX.to_html`) to enable collection, and read the report
+    from `to_dict` or `to_json` afterwards:
+
+    stats = ConversionStats()
+    html = PyDocX.to_html(path, stats=stats)
+    print(stats.to_json(indent=2))
+
+    The time and memory of each phase exclude those of the phases nested
+    within it (e.g. parsing a part while it is first accessed during the
+    render), so the phases add up to the total.
+
+    If `trace_allocations` is enabled, the net memory allocated by each phase
+    and the peak memory usage are measured with tracemalloc. This slows down
+    the conversion considerably, and is not available on Python 2.
+    '''
+
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations and tracemalloc is not None
+        self.seconds = 0
+        self.peak_allocated_bytes = None
+        self.phases = OrderedDict()
+        self.node_counts = defaultdict(int)
+        self.counters = defaultdict(int)
+        # One [name, start time, start memory, nested time, nested memory]
+        # item for each phase that is in progress, innermost phase last
+        self.phase_stack = []
+
+    def get_allocated_bytes(self):
+        if not self.trace_allocations:
+            return 0
+        current, _ = tracemalloc.get_traced_memory()
+        return current
+
+    @contextmanager
+    def phase(self, name):
+        frame = [name, time.time(), self.get_allocated_bytes(), 0, 0]
+        self.phase_stack.append(frame)
+        try:
+            yield
+        finally:
+            self.phase_stack.pop()
+            seconds = time.time() - frame[1]
+            allocated_bytes = self.get_allocated_bytes() - frame[2]
+            if self.phase_stack:
+                parent = self.phase_stack[-1]
+                parent[3] += seconds
+                parent[4] += allocated_bytes
+            phase = self.phases.get(name)
+            if phase is None:
+                phase = OrderedDict([
+                    ('seconds', 0),
+                    ('calls', 0),
+                ])
+                if self.trace_allocations:
+                    phase['allocated_bytes'] = 0
+                self.phases[name] = phase
+            phase['seconds'] += seconds - frame[3]
+            phase['calls'] += 1
+            if self.trace_allocations:
+                phase['allocated_bytes'] += allocated_bytes - frame[4]
+
+    @contextmanager
+    def collect(self):
+        '''
+        Make these the active stats of the current thread while the block
+        runs. Conversions may not be nested within the block.
+        '''
+        previous_stats = getattr(_active, 'stats', None)
+        _active.stats = self
+        started_tracing = False
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        start = time.time()
+        try:
+            yield self
+        finally:
+            self.seconds += time.time() - start
+            if self.trace_allocations:
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak_allocated_bytes = max(
+                    peak,
+                    self.peak_allocated_bytes or 0,
+                )
+            if started_tracing:
+                tracemalloc.stop()
+            _active.stats = previous_stats
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def count_node(self, node_type):
+        self.node_counts[node_type.__name__] += 1
+
+    def to_dict(self):
+        report = OrderedDict()
+        report['seconds'] = self.seconds
+        if self.trace_allocations:
+            report['peak_allocated_bytes'] = self.peak_allocated_bytes
+        report['phases'] = self.phases
+        report['counters'] = OrderedDict(sorted(self.counters.items()))
+        report['nodes'] = OrderedDict(sorted(self.node_counts.items()))
+        return report
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def get_active_stats():
+    '''
+    Return the ConversionStats being collected in the current thread, or None.
+    '''
+    return getattr(_active, 'stats', None)
+
+
+@contextmanager
+def activate_stats(stats):
+    '''
+    Make the given stats the active stats of the current thread while the
+    block runs, without measuring the block as `ConversionStats.collect`
+    does. Does nothing if the stats are None.
+    '''
+    if stats is None:
+        yield
+        return
+    previous_stats = get_active_stats()
+    _active.stats = stats
+    try:
+        yield
+    finally:
+        _active.stats = previous_stats
+
+
+@contextmanager
+def stats_phase(name):
+    '''
+    Measure the block as the given phase of the active stats, if any.
+    '''
+    stats = get_active_stats()
+    if stats is None:
+        yield
+    else:
+        with stats.phase(name):
+            yield
+
+
+def count(name, amount=1):
+    stats = get_active_stats()
+    if stats is not None:
+        stats.count(name, amount)
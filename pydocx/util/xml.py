@@ -9,12 +9,156 @@ from xml.etree import cElementTree
 from xml.parsers.expat import ExpatError
 
 try:
-    from defusedxml.cElementTree import fromstring
+    from defusedxml.cElementTree import fromstring, iterparse
     cElementTree.fromstring = fromstring
+    cElementTree.iterparse = iterparse
 except ImportError:
     pass
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 from pydocx.exceptions import MalformedDocxException
+from pydocx.util.stats import stats_phase
+
+try:
+    unicode_string = unicode
+except NameError:
+    unicode_string = str
+
+
+class ElementTreeXmlBackend(object):
+    '''
+    Parses XML using ElementTree from the standard library. If defusedxml is
+    installed, it is used to protect against entity expansion attacks.
+    '''
+
+    name = 'etree'
+
+    def fromstring(self, xml):
+        return cElementTree.fromstring(xml)
+
+    def iterparse(self, stream, events):
+        return cElementTree.iterparse(stream, events=events)
+
+    def tostring(self, element):
+        return cElementTree.tostring(element, encoding='utf-8')
+
+    def remove_namespaces(self, root):
+        for child in el_iter(root):
+            child.tag = child.tag.split("}")[-1]
+            child.attrib = dict(
+                (k.split("}")[-1], v)
+                for k, v in child.attrib.items()
+            )
+
+
+class LxmlXmlBackend(object):
+    '''
+    Parses XML using lxml, which must be installed.
+
+    The parser never resolves entities, loads DTDs or accesses the network.
+    Entity references are dropped from the parsed tree. `huge_tree` disables
+    libxml2's limits on the depth and size of the tree and must only be
+    enabled for trusted documents.
+    '''
+
+    name = 'lxml'
+
+    def __init__(self, huge_tree=False):
+        if lxml_etree is None:
+            raise ImportError('lxml is not installed')
+        self.huge_tree = huge_tree
+        self.parser = lxml_etree.XMLParser(**self.get_parser_options())
+
+    def get_parser_options(self):
+        return dict(
+            resolve_entities=False,
+            load_dtd=False,
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True,
+            huge_tree=self.huge_tree,
+        )
+
+    def fromstring(self, xml):
+        if isinstance(xml, unicode_string):
+            # lxml refuses unicode strings that have an encoding declaration
+            xml = xml.encode('utf-8')
+        root = lxml_etree.fromstring(xml, parser=self.parser)
+        if root.getroottree().docinfo.internalDTD is not None:
+            # Only documents that have a DTD can contain entity references
+            lxml_etree.strip_elements(root, lxml_etree.Entity, with_tail=False)
+        return root
+
+    def iterparse(self, stream, events):
+        # Unlike `fromstring`, entity references (which can only be defined
+        # by a DTD) aren't stripped, but they are never resolved either, and
+        # are skipped by `remove_namespaces`
+        return lxml_etree.iterparse(
+            stream,
+            events=events,
+            **self.get_parser_options()
+        )
+
+    def tostring(self, element):
+        return lxml_etree.tostring(
+            element,
+            encoding='utf-8',
+            xml_declaration=False,
+        )
+
+    def remove_namespaces(self, root):
+        for child in root.iter(lxml_etree.Element):
+            child.tag = child.tag.split("}")[-1]
+            attrib = child.attrib
+            if attrib:
+                attributes = [
+                    (k.split("}")[-1], v)
+                    for k, v in attrib.items()
+                ]
+                attrib.clear()
+                attrib.update(attributes)
+        lxml_etree.cleanup_namespaces(root)
+
+
+def get_default_xml_backend():
+    '''
+    Return ElementTree, which is always available. lxml is only used once it
+    is chosen with `set_xml_backend`, so that installing it doesn't change
+    the parser of existing users.
+    '''
+    return ElementTreeXmlBackend()
+
+
+xml_backends = {
+    ElementTreeXmlBackend.name: ElementTreeXmlBackend,
+    LxmlXmlBackend.name: LxmlXmlBackend,
+}
+
+_xml_backend = get_default_xml_backend()
+
+
+def get_xml_backend():
+    return _xml_backend
+
+
+def set_xml_backend(backend):
+    '''
+    Set the backend used to parse XML. `backend` is either a backend instance
+    (e.g. `LxmlXmlBackend(huge_tree=True)`) or the name of a backend ('lxml'
+    or 'etree'). Returns the previous backend.
+    '''
+    global _xml_backend
+    if isinstance(backend, (str, unicode_string)):
+        if backend not in xml_backends:
+            raise ValueError('Unknown XML backend: {0}'.format(backend))
+        backend = xml_backends[backend]()
+    previous_backend = _xml_backend
+    _xml_backend = backend
+    return previous_backend
 
 
 def filter_children(element, tags):
@@ -42,26 +186,57 @@ def xml_remove_namespaces(xml_bytes):
     Given a stream of xml bytes, strip all namespaces from tag and attribute
     names.
     """
-    try:
-        root = parse_xml_from_string(xml_bytes, remove_namespaces=False)
-    except (SyntaxError, ExpatError):
-        raise MalformedDocxException('This document cannot be converted.')
-    for child in el_iter(root):
-        child.tag = child.tag.split("}")[-1]
-        child.attrib = dict(
-            (k.split("}")[-1], v)
-            for k, v in child.attrib.items()
-        )
+    backend = get_xml_backend()
+    root = _parse_xml_removing_namespaces(xml_bytes, backend)
     # Regardless of whatever the original encoding was
     # (fromstring deals with it for us), always deal in terms of utf-8
     # internally.
-    return cElementTree.tostring(root, encoding='utf-8')
+    return backend.tostring(root)
+
+
+def _parse_xml_removing_namespaces(xml, backend):
+    try:
+        with stats_phase('parse_xml'):
+            root = backend.fromstring(xml)
+    except (SyntaxError, ExpatError):
+        raise MalformedDocxException('This document cannot be converted.')
+    with stats_phase('remove_namespaces'):
+        backend.remove_namespaces(root)
+    return root
+
+
+def iterparse_xml(stream, events=('start', 'end')):
+    '''
+    Return an iterator of the (event, element) pairs of parsing the XML read
+    from the stream, which is only read as far as the iterator is consumed.
+    Namespaces aren't removed. Parse errors are raised while iterating, as
+    MalformedDocxException.
+    '''
+    backend = get_xml_backend()
+    # The event names have to be native strings, as Python 2's cElementTree
+    # rejects unicode ones
+    events = tuple(str(event) for event in events)
+    try:
+        for event, element in backend.iterparse(stream, events):
+            yield event, element
+    except (SyntaxError, ExpatError):
+        raise MalformedDocxException('This document cannot be converted.')
+
+
+def remove_namespaces_from_tree(root):
+    '''
+    Remove the namespaces of the tags and attributes of a parsed tree.
+    '''
+    with stats_phase('remove_namespaces'):
+        get_xml_backend().remove_namespaces(root)
 
 
 def parse_xml_from_string(xml, remove_namespaces=False):
+    backend = get_xml_backend()
     if remove_namespaces:
-        xml = xml_remove_namespaces(xml)
-    return cElementTree.fromstring(xml)
+        return _parse_xml_removing_namespaces(xml, backend)
+    with stats_phase('parse_xml'):
+        return backend.fromstring(xml)
 
 
 def convert_dictionary_to_style_fragment(style):
@@ -87,6 +262,14 @@ def xml_tag_split(tag):
     return groups[1], groups[2]
 
 
+def get_local_name(tag):
+    '''
+    Return the tag name of a xml node tag, without its namespace (a faster
+    `xml_tag_split` for scanning many nodes).
+    '''
+    return tag.rpartition('}')[2]
+
+
 class XmlNamespaceManager(object):
     '''
     Provides an interface for iterating through elements within an XML tree
@@ -27,7 +27,8 @@ def create_zip_archive(paths_to_data):
 
     `paths_to_data` (dictionary) - For each key, value, the key is treated as a
     path within the zip archive. The value is the data that will be stored at
-    that path specified by the key.
+    that path specified by the key. Text is stored encoded as UTF-8, and bytes
+    (e.g. images) are stored as is.
 
     Each path MUST NOT include an initial '/'. Each path MUST use '/' as a file
     separator (this is requried by the zip specification).
@@ -41,5 +42,7 @@ def create_zip_archive(paths_to_data):
         for arcname, data in paths_to_data.items():
             if data is None:
                 continue
-            zf.writestr(arcname, data.encode('utf-8'))
+            if not isinstance(data, bytes):
+                data = data.encode('utf-8')
+            zf.writestr(arcname, data)
     return archive
@@ -212,6 +212,55 @@ class HyperlinkTestCase(DocumentGeneratorTestCase):
         '''
         self.assert_document_generates_html(document, expected_html)
 
+    def test_multiple_fields_in_multiple_paragraphs(self):
+        field_xml = '''
+            <r>
+                <fldChar fldCharType="begin"/>
+            </r>
+            <r>
+                <instrText> HYPERLINK "http://www.{0}.com/"</instrText>
+            </r>
+            <r>
+                <fldChar fldCharType="separate"/>
+            </r>
+            <r>
+                <t>{0}</t>
+            </r>
+            <r>
+                <fldChar fldCharType="end"/>
+            </r>
+        '''
+        document_xml = '''
+            <p>
+                {aaa}
+                <r><t>,</t></r>
+                {bbb}
+                <r><t>,</t></r>
+                {ccc}
+            </p>
+            <p>
+                <r><t>Link: </t></r>
+                {ddd}
+            </p>
+        '''.format(
+            aaa=field_xml.format('aaa'),
+            bbb=field_xml.format('bbb'),
+            ccc=field_xml.format('ccc'),
+            ddd=field_xml.format('ddd'),
+        )
+        document = WordprocessingDocumentFactory()
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '''
+            <p>
+                <a href="http://www.aaa.com/">aaa</a>,
+                <a href="http://www.bbb.com/">bbb</a>,
+                <a href="http://www.ccc.com/">ccc</a>
+            </p>
+            <p>Link: <a href="http://www.ddd.com/">ddd</a></p>
+        '''
+        self.assert_document_generates_html(document, expected_html)
+
     def test_missing_fld_char_end(self):
         # According to 17.16.18, "If a complex field is not closed before the
         # end of a document story, then no field shall be generated and each
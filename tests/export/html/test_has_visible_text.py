@@ -0,0 +1,75 @@
+# coding: utf-8
+
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from unittest import TestCase
+
+from pydocx.export.html import PyDocXHTMLExporter
+from pydocx.openxml.wordprocessing import (
+    Break,
+    DeletedRun,
+    DeletedText,
+    Hyperlink,
+    Paragraph,
+    Run,
+    Text,
+)
+
+
+class HasVisibleTextTestCase(TestCase):
+    def setUp(self):
+        self.exporter = PyDocXHTMLExporter(path=None)
+
+    def test_empty_paragraph(self):
+        paragraph = Paragraph()
+        self.assertFalse(self.exporter.has_visible_text(paragraph))
+
+    def test_paragraph_with_only_whitespace_text(self):
+        paragraph = Paragraph(children=[
+            Run(children=[Text(text=' '), Text(text='\t')]),
+            Run(children=[Text()]),
+        ])
+        self.assertFalse(self.exporter.has_visible_text(paragraph))
+
+    def test_paragraph_with_text(self):
+        paragraph = Paragraph(children=[
+            Run(children=[Text(text=' ')]),
+            Run(children=[Break(), Text(text='foo')]),
+        ])
+        self.assertTrue(self.exporter.has_visible_text(paragraph))
+
+    def test_text_within_a_hyperlink(self):
+        hyperlink = Hyperlink(children=[Run(children=[Text(text='foo')])])
+        paragraph = Paragraph(children=[hyperlink])
+        self.assertTrue(self.exporter.has_visible_text(hyperlink))
+        self.assertTrue(self.exporter.has_visible_text(paragraph))
+
+    def test_deleted_text_is_not_considered(self):
+        paragraph = Paragraph(children=[
+            DeletedRun(children=[
+                Run(children=[DeletedText(text='foo')]),
+            ]),
+        ])
+        self.assertFalse(self.exporter.has_visible_text(paragraph))
+
+    def test_value_is_computed_once_per_node(self):
+        self.exporter.context.first_pass = False
+        text = Text(text='foo')
+        run = Run(children=[text])
+        paragraph = Paragraph(children=[run])
+        self.assertTrue(self.exporter.has_visible_text(paragraph))
+        text.text = ''
+        self.assertTrue(self.exporter.has_visible_text(paragraph))
+        self.assertTrue(self.exporter.has_visible_text(run))
+
+    def test_value_is_not_kept_in_the_first_pass(self):
+        self.exporter.context.first_pass = True
+        text = Text(text='foo')
+        paragraph = Paragraph(children=[Run(children=[text])])
+        self.assertTrue(self.exporter.has_visible_text(paragraph))
+        text.text = ''
+        self.assertFalse(self.exporter.has_visible_text(paragraph))
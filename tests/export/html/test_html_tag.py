@@ -0,0 +1,78 @@
+# coding: utf-8
+
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from unittest import TestCase
+
+from pydocx.export.html import HtmlTag, TABLE_TAG
+
+
+class HtmlTagTestCase(TestCase):
+    def test_to_html(self):
+        tag = HtmlTag('a', href='#foo', name='bar')
+        self.assertEqual(tag.to_html(), '<a href="#foo" name="bar">')
+        self.assertEqual(tag.close().to_html(), '</a>')
+
+    def test_self_closing_tag(self):
+        tag = HtmlTag('br', allow_self_closing=True)
+        self.assertEqual(tag.to_html(), '<br />')
+        self.assertEqual(
+            [result.to_html() for result in tag.apply([])],
+            ['<br />'],
+        )
+
+    def test_apply(self):
+        tag = HtmlTag('p')
+        results = [
+            result.to_html() if isinstance(result, HtmlTag) else result
+            for result in tag.apply(['foo'])
+        ]
+        self.assertEqual(results, ['<p>', 'foo', '</p>'])
+
+    def test_apply_not_allowing_empty_results(self):
+        tag = HtmlTag('p')
+        self.assertEqual(list(tag.apply([' '], allow_empty=False)), [])
+
+    def test_tags_are_immutable(self):
+        tag = HtmlTag('p')
+        with self.assertRaises(AttributeError):
+            tag.tag = 'div'
+
+    def test_attributes_are_immutable(self):
+        with self.assertRaises(TypeError):
+            TABLE_TAG.attrs['class'] = 'data'
+        with self.assertRaises(TypeError):
+            TABLE_TAG.attrs.update({'class': 'data'})
+        self.assertEqual(TABLE_TAG.attrs, {'border': '1'})
+        self.assertEqual(TABLE_TAG.to_html(), '<table border="1">')
+
+    def test_closing_tags_are_shared(self):
+        self.assertIs(HtmlTag('p').close(), HtmlTag('p').close())
+
+    def test_rendered_html_is_cached(self):
+        cache = {}
+        first = HtmlTag('span', id='foo')
+        self.assertEqual(first.to_html(cache), '<span id="foo">')
+        self.assertEqual(list(cache.values()), ['<span id="foo">'])
+        # Equal tags get the cached HTML
+        self.assertIs(HtmlTag('span', id='foo').to_html(cache), first.to_html())
+
+    def test_attributes_that_are_not_hashable(self):
+        cache = {}
+        tag = HtmlTag('span', **{'data-values': ['1', '2']})
+        self.assertIsNone(tag.get_cache_key())
+        self.assertEqual(tag.to_html(cache), '<span data-values="[\'1\', \'2\']">')
+        self.assertEqual(cache, {})
+
+    def test_tags_with_the_same_attributes_render_the_same_html(self):
+        first = HtmlTag('span', style='color:#FF0000', id='foo')
+        second = HtmlTag('span', id='foo', style='color:#FF0000')
+        self.assertEqual(first.to_html(), second.to_html())
+        self.assertNotEqual(
+            first.to_html(),
+            HtmlTag('span', id='foo', allow_self_closing=True).to_html(),
+        )
@@ -163,14 +163,10 @@ class TableTestCase(DocumentGeneratorTestCase):
         self.assert_document_generates_html(document, expected_html)
 
     def test_fallback_has_invalid_children(self):
-        # Currently, we are cheating when we define the valid children of a
-        # Fallback element. Right now we are saying that all children are
-        # valid. This is not technically true. In the loosest of senses, yes
-        # the Fallback can include any child element. However, the valid
-        # children for Fallback need to be inherited by it's grand parents.
-        # This test is showing an invalid child for Fallback. When #215 gets
-        # fixed, this test should fail. When it does, you'll want to strip out
-        # the table from the expected_html.
+        # The children of the Fallback are loaded as if they were children of
+        # the AlternateContent's parent, so the valid children for Fallback
+        # are inherited from its grand parent. A table is not a valid child of
+        # a run, so it is ignored (#215).
         document_xml = '''
             <p>
                 <r><t>AAA</t></r>
@@ -201,13 +197,7 @@ class TableTestCase(DocumentGeneratorTestCase):
         document.add(MainDocumentPart, document_xml)
 
         expected_html = '''
-            <p>AAABBB
-                <table border="1">
-                    <tr>
-                        <td>CCC</td>
-                    </tr>
-                </table>
-            DDDEEE</p>
+            <p>AAABBBDDDEEE</p>
         '''
         self.assert_document_generates_html(document, expected_html)
 
@@ -0,0 +1,214 @@
+# coding: utf-8
+
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from io import BytesIO
+from unittest import TestCase
+
+from pydocx.export.html import PyDocXHTMLExporter
+from pydocx.openxml.packaging import MainDocumentPart, StyleDefinitionsPart
+from pydocx.openxml.wordprocessing import Run
+from pydocx.test import DocumentGeneratorTestCase
+from pydocx.test.testcases import DocXFixtureTestCaseFactory
+from pydocx.test.utils import (
+    PyDocXHTMLExporterNoStyle,
+    WordprocessingDocumentFactory,
+)
+from pydocx.util.zip import create_zip_archive
+
+
+class PyDocXHTMLExporterCoalescingRuns(PyDocXHTMLExporter):
+    coalesce_runs = True
+
+
+class PyDocXHTMLExporterNoStyleCoalescingRuns(PyDocXHTMLExporterNoStyle):
+    coalesce_runs = True
+
+
+class RunCoalescingTestCase(DocumentGeneratorTestCase):
+    exporter = PyDocXHTMLExporterNoStyleCoalescingRuns
+
+    def test_runs_with_the_same_formatting_are_merged(self):
+        document_xml = '''
+            <p>
+              <r><rPr><b /></rPr><t>Foo-</t></r>
+              <r><rPr><b /></rPr><t>Bar</t></r>
+              <r><rPr><b /></rPr><t>-Baz</t></r>
+            </p>
+        '''
+        document = WordprocessingDocumentFactory()
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '<p><strong>Foo-Bar-Baz</strong></p>'
+        self.assert_document_generates_html(document, expected_html)
+
+    def test_runs_with_different_formatting_are_not_merged(self):
+        document_xml = '''
+            <p>
+              <r><rPr><b /></rPr><t>Foo</t></r>
+              <r><rPr><b /><i /></rPr><t>Bar</t></r>
+              <r><rPr><b /><i /></rPr><t>Baz</t></r>
+              <r><t>Zoo</t></r>
+            </p>
+        '''
+        document = WordprocessingDocumentFactory()
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '''
+            <p>
+              <strong>Foo</strong>
+              <em><strong>BarBaz</strong></em>
+              Zoo
+            </p>
+        '''
+        self.assert_document_generates_html(document, expected_html)
+
+    def test_runs_with_different_styles_are_not_merged(self):
+        style_xml = '''
+            <style styleId="bold" type="character">
+              <rPr><b /></rPr>
+            </style>
+        '''
+        document_xml = '''
+            <p>
+              <r><rPr><rStyle val="bold" /></rPr><t>Foo</t></r>
+              <r><rPr><b /></rPr><t>Bar</t></r>
+              <r><rPr><rStyle val="bold" /></rPr><t>Baz</t></r>
+            </p>
+        '''
+        document = WordprocessingDocumentFactory()
+        document.add(StyleDefinitionsPart, style_xml)
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '''
+            <p>
+              <strong>Foo</strong>
+              <strong>Bar</strong>
+              <strong>Baz</strong>
+            </p>
+        '''
+        self.assert_document_generates_html(document, expected_html)
+
+    def test_runs_are_merged_within_but_not_across_hyperlinks(self):
+        document_xml = '''
+            <p>
+              <r><t>Foo</t></r>
+              <hyperlink id="foobar">
+                <r><t>Bar</t></r>
+                <r><t>Baz</t></r>
+              </hyperlink>
+              <r><t>Zoo</t></r>
+            </p>
+        '''
+        document = WordprocessingDocumentFactory()
+        document_rels = document.relationship_format.format(
+            id='foobar',
+            type='foo/hyperlink',
+            target='http://google.com',
+            target_mode='External',
+        )
+        document.add(MainDocumentPart, document_xml, document_rels)
+
+        expected_html = '''
+            <p>Foo<a href="http://google.com">BarBaz</a>Zoo</p>
+        '''
+        self.assert_document_generates_html(document, expected_html)
+
+    def test_sequential_text_nodes_are_joined(self):
+        document_xml = '''
+            <p>
+              <r>
+                <t>Foo</t>
+                <t>Bar</t>
+                <br />
+                <t>Baz</t>
+              </r>
+            </p>
+        '''
+        document = WordprocessingDocumentFactory()
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '<p>FooBar<br />Baz</p>'
+        self.assert_document_generates_html(document, expected_html)
+
+
+class CoalescingRunsDocXFixtureTestCase(DocXFixtureTestCaseFactory):
+    '''
+    Coalescing runs must not change the output of any of the fixtures.
+    '''
+
+    exporter = PyDocXHTMLExporterCoalescingRuns
+
+    cases = (
+        'all_configured_styles',
+        'export_from_googledocs',
+        'has_title',
+        'inline_tags',
+        'justification',
+        'list_in_table',
+        'lists_with_styles',
+        'nested_lists',
+        'nested_table_rowspan',
+        'no_break_hyphen',
+        'shift_enter',
+        'simple',
+        'special_chars',
+        'styled_bolding',
+        'styled_color',
+        'tables_in_lists',
+        'textbox',
+        'track_changes_on',
+    )
+
+
+CoalescingRunsDocXFixtureTestCase.generate()
+
+
+class RunCoalescingModelTestCase(TestCase):
+    def setUp(self):
+        document_xml = '''
+            <p>
+              <r><rPr><b /></rPr><t>Foo-</t></r>
+              <r><rPr><b /></rPr><t>Bar</t></r>
+              <hyperlink id="foobar">
+                <r><t>Baz</t></r>
+                <r><t>Zoo</t></r>
+              </hyperlink>
+            </p>
+        '''
+        document = WordprocessingDocumentFactory()
+        document_rels = document.relationship_format.format(
+            id='foobar',
+            type='foo/hyperlink',
+            target='http://google.com',
+            target_mode='External',
+        )
+        document.add(MainDocumentPart, document_xml, document_rels)
+        data = create_zip_archive(document.to_zip_dict()).getvalue()
+        self.exporter = PyDocXHTMLExporterNoStyleCoalescingRuns(BytesIO(data))
+
+    def get_texts(self, container):
+        return [
+            [text.text for text in run.children]
+            for run in container.children
+            if isinstance(run, Run)
+        ]
+
+    def test_the_document_is_not_modified(self):
+        html = self.exporter.export()
+        self.assertIn('<strong>Foo-Bar</strong>', html)
+        self.assertIn('>BazZoo</a>', html)
+
+        paragraph = self.exporter.main_document_part.document.body.children[0]
+        self.assertEqual(self.get_texts(paragraph), [['Foo-'], ['Bar']])
+        hyperlink = paragraph.children[2]
+        self.assertEqual(self.get_texts(hyperlink), [['Baz'], ['Zoo']])
+        self.assertIs(hyperlink.children[0].parent, hyperlink)
+
+    def test_repeated_exports(self):
+        html = self.exporter.export()
+        self.assertEqual(self.exporter.export(), html)
@@ -0,0 +1,155 @@
+# coding: utf-8
+
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from unittest import TestCase
+
+from pydocx import PyDocX
+from pydocx.export.html import PyDocXHTMLExporter
+from pydocx.openxml.packaging import (
+    FootnotesPart,
+    MainDocumentPart,
+    NumberingDefinitionsPart,
+    StyleDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+
+class SkipImagesExporter(PyDocXHTMLExporter):
+    images = 'skip'
+
+
+class ExternalImagesExporter(PyDocXHTMLExporter):
+    images = 'external'
+
+
+class TextOnlyExporter(PyDocXHTMLExporter):
+    images = 'skip'
+    footnotes = False
+    numbering = False
+    styles = False
+
+
+class SelectiveLoadingTestCase(TestCase):
+    document_xml = '''
+        <p>
+          <pPr><pStyle val="heading1"/></pPr>
+          <r><t>Heading</t></r>
+        </p>
+        <p>
+          <pPr><numPr><ilvl val="0"/><numId val="1"/></numPr></pPr>
+          <r><t>Item</t></r>
+        </p>
+        <p>
+          <r><t>Foo</t></r>
+          <r><footnoteReference id="abc"/></r>
+        </p>
+    '''
+
+    footnotes_xml = '''
+        <footnote id="abc">
+          <p><r><footnoteRef/><t>Bar</t></r></p>
+        </footnote>
+    '''
+
+    numbering_xml = '''
+        <num numId="1"><abstractNumId val="1"/></num>
+        <abstractNum abstractNumId="1">
+          <lvl ilvl="0"><numFmt val="decimal"/></lvl>
+        </abstractNum>
+    '''
+
+    styles_xml = '''
+        <style styleId="heading1" type="paragraph">
+          <name val="Heading 1"/>
+        </style>
+    '''
+
+    def get_docx(self):
+        document = WordprocessingDocumentFactory()
+        document.add(FootnotesPart, self.footnotes_xml)
+        document.add(NumberingDefinitionsPart, self.numbering_xml)
+        document.add(StyleDefinitionsPart, self.styles_xml)
+        document.add(MainDocumentPart, self.document_xml)
+        return create_zip_archive(document.to_zip_dict())
+
+    def get_body(self, exporter):
+        html = exporter.export()
+        return html[html.index('<body>'):]
+
+    def get_decompressed_uris(self, exporter):
+        return set(exporter.document.package.streams.keys())
+
+    def test_everything_is_loaded_by_default(self):
+        exporter = PyDocXHTMLExporter(self.get_docx())
+        body = self.get_body(exporter)
+        self.assertIn('<h1>Heading</h1>', body)
+        self.assertIn('<ol class="pydocx-list-style-type-decimal">', body)
+        self.assertIn('name="footnote-abc"', body)
+        self.assertTrue(set([
+            '/word/footnotes.xml',
+            '/word/numbering.xml',
+            '/word/styles.xml',
+        ]) <= self.get_decompressed_uris(exporter))
+
+    def test_excluded_parts_are_never_decompressed(self):
+        exporter = TextOnlyExporter(self.get_docx())
+        body = self.get_body(exporter)
+        self.assertEqual(
+            body,
+            '<body><p>Heading</p><p>Item</p><p>Foo</p></body></html>',
+        )
+        decompressed_uris = self.get_decompressed_uris(exporter)
+        self.assertIn('/word/document.xml', decompressed_uris)
+        self.assertNotIn('/word/footnotes.xml', decompressed_uris)
+        self.assertNotIn('/word/numbering.xml', decompressed_uris)
+        self.assertNotIn('/word/styles.xml', decompressed_uris)
+
+    def test_skip_images(self):
+        exporter = SkipImagesExporter('tests/fixtures/has_image.docx')
+        self.assertNotIn('<img', exporter.export())
+        self.assertNotIn(
+            '/word/media/image1.gif',
+            self.get_decompressed_uris(exporter),
+        )
+
+    def test_external_images(self):
+        exporter = ExternalImagesExporter('tests/fixtures/has_image.docx')
+        html = exporter.export()
+        self.assertIn('src="word/media/image1.gif"', html)
+        self.assertNotIn('base64', html)
+        self.assertNotIn(
+            '/word/media/image1.gif',
+            self.get_decompressed_uris(exporter),
+        )
+
+    def test_options_may_be_passed_to_the_constructor(self):
+        exporter = PyDocXHTMLExporter(
+            self.get_docx(),
+            images='skip',
+            footnotes=False,
+            numbering=False,
+            styles=False,
+        )
+        self.assertEqual(
+            self.get_body(exporter),
+            self.get_body(TextOnlyExporter(self.get_docx())),
+        )
+        self.assertTrue(PyDocXHTMLExporter.footnotes)
+
+    def test_to_html_passes_the_options_to_the_exporter(self):
+        html = PyDocX.to_html('tests/fixtures/has_image.docx', images='external')
+        self.assertIn('src="word/media/image1.gif"', html)
+        html = PyDocX.to_html(self.get_docx(), footnotes=False)
+        self.assertNotIn('footnote-abc', html)
+
+    def test_unknown_images_mode(self):
+        class Exporter(PyDocXHTMLExporter):
+            images = 'foo'
+
+        self.assertRaises(ValueError, Exporter, 'tests/fixtures/has_image.docx')
@@ -0,0 +1,61 @@
+# coding: utf-8
+
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from unittest import TestCase
+
+from pydocx.export.html import PyDocXHTMLExporter
+from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.zip import create_zip_archive
+
+
+class PyDocXHTMLExporterInterningStyles(PyDocXHTMLExporter):
+    intern_styles = True
+
+
+class StyleInterningTestCase(TestCase):
+    document_xml = '''
+        <p><r><rPr><color val="FF0000" /></rPr><t>AAA</t></r></p>
+        <p><r><rPr><color val="31849B" /></rPr><t>BBB</t></r></p>
+        <p>
+          <pPr><ind left="720" /></pPr>
+          <r><rPr><color val="FF0000" /></rPr><t>CCC</t></r>
+        </p>
+        <p>
+          <pPr><ind left="720" /></pPr>
+          <r><t>DDD</t></r>
+        </p>
+    '''
+
+    def export(self, exporter_class):
+        document = WordprocessingDocumentFactory()
+        document.add(MainDocumentPart, self.document_xml)
+        zip_archive = create_zip_archive(document.to_zip_dict())
+        return exporter_class(zip_archive).export()
+
+    def test_each_distinct_style_is_defined_once_in_the_style_block(self):
+        html = self.export(PyDocXHTMLExporterInterningStyles)
+        style_block = html[html.index('<style>'):html.index('</style>')]
+        self.assertIn('.pydocx-s0 {color:#FF0000}', style_block)
+        self.assertIn('.pydocx-s1 {color:#31849B}', style_block)
+        self.assertIn('.pydocx-s2 {margin-left:3.00em}', style_block)
+        self.assertNotIn('.pydocx-s3', style_block)
+
+    def test_inline_styles_are_replaced_by_classes(self):
+        html = self.export(PyDocXHTMLExporterInterningStyles)
+        body = html[html.index('<body>'):]
+        self.assertNotIn('style=', body)
+        self.assertEqual(body.count('<span class="pydocx-s0">'), 2)
+        self.assertEqual(body.count('<span class="pydocx-s1">'), 1)
+        self.assertEqual(body.count('<span class="pydocx-s2">'), 2)
+
+    def test_inline_styles_are_used_by_default(self):
+        html = self.export(PyDocXHTMLExporter)
+        self.assertNotIn('pydocx-s0', html)
+        self.assertEqual(html.count('<span style="color:#FF0000">'), 2)
+        self.assertEqual(html.count('<span style="margin-left:3.00em">'), 2)
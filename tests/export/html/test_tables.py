@@ -6,8 +6,12 @@ from __future__ import (
     unicode_literals,
 )
 
+from pydocx.export.html import TABLE_ROW_TAG
 from pydocx.test import DocumentGeneratorTestCase
-from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.test.utils import (
+    PyDocXHTMLExporterNoStyle,
+    WordprocessingDocumentFactory,
+)
 from pydocx.openxml.packaging import MainDocumentPart
 
 
@@ -501,3 +505,98 @@ class TableTestCase(DocumentGeneratorTestCase):
             </table>
         '''
         self.assert_document_generates_html(document, expected_html)
+
+    def test_paragraphs_after_a_nested_table(self):
+        document_xml = '''
+            <tbl>
+                <tr>
+                    <tc>
+                        <tbl>
+                            <tr>
+                                <tc>
+                                    <p>
+                                        <r>
+                                            <t>Inner</t>
+                                        </r>
+                                    </p>
+                                </tc>
+                            </tr>
+                        </tbl>
+                        <p>
+                            <r>
+                                <t>Outer</t>
+                            </r>
+                        </p>
+                    </tc>
+                </tr>
+            </tbl>
+        '''
+
+        document = WordprocessingDocumentFactory()
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '''
+            <table border="1">
+                <tr>
+                    <td>
+                        <table border="1">
+                            <tr>
+                                <td>Inner</td>
+                            </tr>
+                        </table>
+                        Outer
+                    </td>
+                </tr>
+            </table>
+        '''
+        self.assert_document_generates_html(document, expected_html)
+
+
+class PyDocXHTMLExporterReversedCells(PyDocXHTMLExporterNoStyle):
+    def export_table_row(self, table_row):
+        results = self.yield_nested(reversed(table_row.cells), self.export_node)
+        return TABLE_ROW_TAG.apply(results)
+
+
+class ReorderedTableCellsTestCase(DocumentGeneratorTestCase):
+    exporter = PyDocXHTMLExporterReversedCells
+
+    def test_cell_spans_follow_the_cells(self):
+        document_xml = '''
+            <tbl>
+                <tr>
+                    <tc>
+                        <tcPr><vMerge val="restart" /></tcPr>
+                        <p><r><t>Foo</t></r></p>
+                    </tc>
+                    <tc>
+                        <tcPr><gridSpan val="2" /></tcPr>
+                        <p><r><t>Bar</t></r></p>
+                    </tc>
+                </tr>
+                <tr>
+                    <tc>
+                        <tcPr><vMerge val="continue" /></tcPr>
+                    </tc>
+                    <tc><p><r><t>One</t></r></p></tc>
+                    <tc><p><r><t>Two</t></r></p></tc>
+                </tr>
+            </tbl>
+        '''
+
+        document = WordprocessingDocumentFactory()
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '''
+            <table border="1">
+                <tr>
+                    <td colspan="2">Bar</td>
+                    <td rowspan="2">Foo</td>
+                </tr>
+                <tr>
+                    <td>Two</td>
+                    <td>One</td>
+                </tr>
+            </table>
+        '''
+        self.assert_document_generates_html(document, expected_html)
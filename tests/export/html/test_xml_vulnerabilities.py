@@ -11,9 +11,17 @@ from nose import SkipTest
 from pydocx.test import DocumentGeneratorTestCase
 from pydocx.test.utils import WordprocessingDocumentFactory
 from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.util.xml import lxml_etree, set_xml_backend
 
 
 class XMLVulnerabilitiesTestCase(DocumentGeneratorTestCase):
+    # defusedxml only protects the ElementTree backend
+    def setUp(self):
+        self.previous_backend = set_xml_backend('etree')
+
+    def tearDown(self):
+        set_xml_backend(self.previous_backend)
+
     def test_exponential_entity_expansion(self):
         try:
             import defusedxml
@@ -81,3 +89,53 @@ class XMLVulnerabilitiesTestCase(DocumentGeneratorTestCase):
             )
         except defusedxml.EntitiesForbidden:
             pass
+
+
+class LxmlXMLVulnerabilitiesTestCase(DocumentGeneratorTestCase):
+    def setUp(self):
+        if lxml_etree is None:
+            raise SkipTest('This test case only applies when lxml is installed')
+        self.previous_backend = set_xml_backend('lxml')
+
+    def tearDown(self):
+        set_xml_backend(self.previous_backend)
+
+    def test_entities_are_not_expanded(self):
+        document_xml = '''
+            <p>
+              <r>
+                <t>A&c;B</t>
+              </r>
+            </p>
+        '''
+        xml_header = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE xml [
+ <!ENTITY a "123">
+ <!ENTITY b "&a;&a;">
+ <!ENTITY c "&b;&b;">
+]>
+        '''
+        document = WordprocessingDocumentFactory(xml_header=xml_header)
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '<p>AB</p>'
+        self.assert_document_generates_html(document, expected_html)
+
+    def test_external_entities_are_not_resolved(self):
+        document_xml = '''
+            <p>
+              <r>
+                <t>A&a;B</t>
+              </r>
+            </p>
+        '''
+        xml_header = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE xml [
+ <!ENTITY a SYSTEM "file:///etc/passwd">
+]>
+        '''
+        document = WordprocessingDocumentFactory(xml_header=xml_header)
+        document.add(MainDocumentPart, document_xml)
+
+        expected_html = '<p>AB</p>'
+        self.assert_document_generates_html(document, expected_html)
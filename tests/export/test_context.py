@@ -0,0 +1,211 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+from io import BytesIO
+from unittest import TestCase
+
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.export.context import HtmlRenderContext
+from pydocx.export.incremental import BlockCache
+from pydocx.openxml.packaging import FootnotesPart, MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.limits import ResourceLimits, get_active_budget
+from pydocx.util.stats import ConversionStats, get_active_stats
+from pydocx.util.zip import create_zip_archive
+
+BLOCK = '''
+    <p>
+      <r><rPr><b/></rPr><t>Paragraph {index}</t></r>
+      <r><footnoteReference id="{index}"/></r>
+    </p>
+    <p>
+      <hyperlink id="rIdLink"><r><rPr><u val="single"/></rPr><t>Link</t></r></hyperlink>
+      <r><rPr><u val="single"/></rPr><t>Underlined</t></r>
+    </p>
+    <tbl>
+      <tr><tc><p><r><t>Cell {index}</t></r></p></tc></tr>
+    </tbl>
+'''
+
+
+FAKED_LIST = '<p><r><t>1. Foo-1</t></r></p><p><r><t>2. Foo-2</t></r></p>'
+
+
+class InternedStylesExporter(PyDocXHTMLExporter):
+    intern_styles = True
+
+
+class LazyModelsExporter(InternedStylesExporter):
+    lazy_models = True
+
+
+def build_faked_list_docx():
+    document = WordprocessingDocumentFactory()
+    table = '<tbl><tr><tc>{0}</tc></tr></tbl>'.format(FAKED_LIST)
+    document.add(MainDocumentPart, FAKED_LIST + table)
+    return create_zip_archive(document.to_zip_dict()).getvalue()
+
+
+def build_docx(block_count):
+    document = WordprocessingDocumentFactory()
+    document.add(FootnotesPart, ''.join(
+        '<footnote id="{0}"><p><r><t>Footnote {0}</t></r></p></footnote>'.format(index)
+        for index in range(block_count)
+    ))
+    relationships = document.relationship_format.format(
+        id='rIdLink',
+        type='http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink',  # noqa
+        target='http://example.com/',
+        target_mode='External',
+    )
+    document.add(
+        MainDocumentPart,
+        ''.join(BLOCK.format(index=index) for index in range(block_count)),
+        relationships,
+    )
+    return create_zip_archive(document.to_zip_dict()).getvalue()
+
+
+def export_interleaved(iterators):
+    results = [[] for _ in iterators]
+    finished = set()
+    while len(finished) < len(iterators):
+        for index, iterator in enumerate(iterators):
+            if index in finished:
+                continue
+            try:
+                results[index].append(next(iterator))
+            except StopIteration:
+                finished.add(index)
+    return [''.join(result) for result in results]
+
+
+def export_in_threads(exporter):
+    outputs = []
+
+    def export():
+        for _ in range(3):
+            outputs.append(exporter.export())
+
+    threads = [threading.Thread(target=export) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outputs
+
+
+class RenderContextTestCase(TestCase):
+    def setUp(self):
+        self.data = build_docx(20)
+        self.expected = InternedStylesExporter(BytesIO(self.data)).export()
+
+    def test_each_export_has_its_own_context(self):
+        exporter = InternedStylesExporter(BytesIO(self.data))
+        self.assertIsInstance(exporter.context, HtmlRenderContext)
+        initial_context = exporter.context
+        exporter.export()
+        self.assertIsNot(exporter.context, initial_context)
+        self.assertEqual(len(exporter.footnote_tracker), 20)
+        self.assertFalse(exporter.first_pass)
+
+    def test_repeated_exports(self):
+        exporter = InternedStylesExporter(BytesIO(self.data))
+        self.assertEqual(exporter.export(), self.expected)
+        self.assertEqual(exporter.export(), self.expected)
+
+    def test_interleaved_exports(self):
+        exporter = InternedStylesExporter(BytesIO(self.data))
+        results = export_interleaved([exporter.iter_export(), exporter.iter_export()])
+        self.assertEqual(results, [self.expected] * 2)
+
+    def test_suspended_exports_are_not_active(self):
+        limits = ResourceLimits(max_nodes=10 ** 6)
+        exporters = [
+            InternedStylesExporter(BytesIO(self.data), limits=limits, stats=ConversionStats())
+            for _ in range(2)
+        ]
+        iterators = [exporter.iter_export() for exporter in exporters]
+        for iterator in iterators:
+            next(iterator)
+            # The budget and stats of an export are only active while it runs
+            self.assertIsNone(get_active_budget())
+            self.assertIsNone(get_active_stats())
+        results = export_interleaved(iterators)
+        self.assertEqual(len(results), 2)
+        for exporter in exporters:
+            self.assertEqual(exporter.stats.phases['render']['calls'], 1)
+
+    def test_hyperlinks_are_not_underlined(self):
+        self.assertIn('<a href="http://example.com/">Link</a>', self.expected)
+        self.assertIn(
+            '<span class="pydocx-underline">Underlined</span>',
+            self.expected,
+        )
+
+    def test_concurrent_exports_with_a_shared_block_cache(self):
+        block_cache = BlockCache()
+        expected = PyDocXHTMLExporter(BytesIO(self.data)).export()
+        outputs = []
+
+        def export():
+            for _ in range(3):
+                exporter = PyDocXHTMLExporter(
+                    BytesIO(self.data),
+                    block_cache=block_cache,
+                )
+                outputs.append(exporter.export())
+
+        threads = [threading.Thread(target=export) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(outputs), 12)
+        for output in outputs:
+            self.assertEqual(output, expected)
+
+    def test_exporter_shared_by_threads(self):
+        exporter = InternedStylesExporter(BytesIO(self.data))
+        outputs = export_in_threads(exporter)
+        self.assertEqual(outputs, [self.expected] * 12)
+
+    def test_exporter_with_lazy_models_shared_by_threads(self):
+        exporter = LazyModelsExporter(BytesIO(self.data))
+        outputs = export_in_threads(exporter)
+        self.assertEqual(outputs, [self.expected] * 12)
+
+    def test_each_thread_has_its_own_context(self):
+        exporter = InternedStylesExporter(BytesIO(self.data))
+        exporter.export()
+        contexts = []
+        thread = threading.Thread(target=lambda: contexts.append(exporter.context))
+        thread.start()
+        thread.join()
+        self.assertIsNot(contexts[0], exporter.context)
+        self.assertEqual(contexts[0].footnote_tracker, [])
+
+
+class FakedListRenderContextTestCase(TestCase):
+    def setUp(self):
+        self.data = build_faked_list_docx()
+        self.expected = PyDocXHTMLExporter(BytesIO(self.data)).export()
+
+    def test_faked_list_is_detected(self):
+        self.assertEqual(self.expected.count('<li>Foo-1</li>'), 2)
+        self.assertNotIn('1. Foo-1', self.expected)
+
+    def test_repeated_exports(self):
+        exporter = PyDocXHTMLExporter(BytesIO(self.data))
+        self.assertEqual(exporter.export(), self.expected)
+        self.assertEqual(exporter.export(), self.expected)
+
+    def test_exporter_shared_by_threads(self):
+        exporter = PyDocXHTMLExporter(BytesIO(self.data))
+        outputs = export_in_threads(exporter)
+        self.assertEqual(outputs, [self.expected] * 12)
@@ -81,6 +81,18 @@ class ConvertDocxToHtmlTestCase(DocXFixtureTestCaseFactory):
 ConvertDocxToHtmlTestCase.generate()
 
 
+class LazyModelsExporter(PyDocXHTMLExporter):
+    lazy_models = True
+
+
+class ConvertDocxToHtmlWithLazyModelsTestCase(DocXFixtureTestCaseFactory):
+    cases = ConvertDocxToHtmlTestCase.cases
+    exporter = LazyModelsExporter
+
+
+ConvertDocxToHtmlWithLazyModelsTestCase.generate()
+
+
 def get_image_data(docx_file_path, image_name):
     """
     Return base 64 encoded data for the image_name that is stored in the
@@ -0,0 +1,234 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import base64
+import re
+import threading
+from io import BytesIO
+from unittest import TestCase
+
+from nose import SkipTest
+
+from pydocx.constants import EMUS_PER_PIXEL
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.export.images import ImageProcessor, convert_length_to_pixels
+from pydocx.openxml.packaging import ImagePart, MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.stats import ConversionStats
+from pydocx.util.zip import create_zip_archive
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+DRAWING = '''
+    <p><r><drawing><inline>
+      <graphic><graphicData><pic>
+        <blipFill><blip embed="rIdImage"/></blipFill>
+        <spPr><xfrm><ext cx="{cx}" cy="{cy}"/></xfrm></spPr>
+      </pic></graphicData></graphic>
+    </inline></drawing></r></p>
+'''
+
+VML_IMAGE = '''
+    <p><r><pict>
+      <shape style="width:{width};height:{height}">
+        <imagedata id="rIdImage"/>
+      </shape>
+    </pict></r></p>
+'''
+
+
+def build_image(image_format, size=(400, 200), mode='RGB'):
+    image = Image.new(mode, size)
+    # A gradient, so that the image isn't trivially compressible
+    image.putdata([
+        (x % 256, y % 256, (x + y) % 256)[:len(mode)] if mode != 'L' else x % 256
+        for y in range(size[1])
+        for x in range(size[0])
+    ])
+    output = BytesIO()
+    image.save(output, image_format)
+    return output.getvalue()
+
+
+def open_image(data):
+    return Image.open(BytesIO(data))
+
+
+def build_docx(body, image, extension):
+    document = WordprocessingDocumentFactory()
+    relationships = document.relationship_format.format(
+        id='rIdImage',
+        type=ImagePart.relationship_type,
+        target='media/image.{0}'.format(extension),
+        target_mode='Internal',
+    )
+    document.add(MainDocumentPart, body, relationships)
+    zip_dict = document.to_zip_dict()
+    zip_dict['word/media/image.{0}'.format(extension)] = image
+    return BytesIO(create_zip_archive(zip_dict).getvalue())
+
+
+def get_image_sources(html):
+    return re.findall(r'src="data:image/(\w+);base64,([^"]+)"', html)
+
+
+class ConvertLengthToPixelsTestCase(TestCase):
+    def test_units(self):
+        self.assertEqual(convert_length_to_pixels('10px'), 10)
+        self.assertEqual(convert_length_to_pixels('10'), 10)
+        self.assertEqual(convert_length_to_pixels('72pt'), 96)
+        self.assertEqual(convert_length_to_pixels('2in'), 192)
+        self.assertAlmostEqual(convert_length_to_pixels('2.54cm'), 96)
+
+    def test_unknown_lengths(self):
+        self.assertIsNone(convert_length_to_pixels(None))
+        self.assertIsNone(convert_length_to_pixels('auto'))
+        self.assertIsNone(convert_length_to_pixels('10em'))
+
+
+class ImageProcessorTestCase(TestCase):
+    def setUp(self):
+        if Image is None:
+            raise SkipTest('Pillow is not installed')
+        self.processor = ImageProcessor(dpi_factor=2)
+
+    def test_target_size(self):
+        self.assertEqual(self.processor.get_target_size('50px', '25px'), (100, 50))
+        self.assertIsNone(self.processor.get_target_size(None, '25px'))
+
+    def test_large_images_are_downscaled(self):
+        data, extension = self.processor.process(
+            build_image('JPEG', size=(400, 200)),
+            width='50px',
+            height='25px',
+        )
+        self.assertEqual(extension, 'jpeg')
+        self.assertEqual(open_image(data).size, (100, 50))
+
+    def test_aspect_ratio_is_kept(self):
+        data, extension = self.processor.process(
+            build_image('PNG', size=(800, 400)),
+            width='100px',
+            height='100px',
+        )
+        self.assertEqual(extension, 'png')
+        self.assertEqual(open_image(data).size, (200, 100))
+
+    def test_small_images_are_left_as_they_are(self):
+        image = build_image('JPEG', size=(400, 200))
+        self.assertIsNone(self.processor.process(image, width='200px', height='100px'))
+        self.assertIsNone(self.processor.process(image))
+
+    def test_tiff_images_are_transcoded(self):
+        result = self.processor.process(build_image('TIFF'))
+        self.assertEqual(result[1], 'jpeg')
+        self.assertEqual(open_image(result[0]).size, (400, 200))
+
+        result = self.processor.process(build_image('TIFF', mode='RGBA'))
+        self.assertEqual(result[1], 'png')
+
+    def test_bmp_images_are_transcoded_and_downscaled(self):
+        data, extension = self.processor.process(
+            build_image('BMP', mode='L'),
+            width='50px',
+            height='25px',
+        )
+        self.assertEqual(extension, 'jpeg')
+        self.assertEqual(open_image(data).size, (100, 50))
+
+    def test_unreadable_images_are_left_as_they_are(self):
+        self.assertIsNone(self.processor.process(b'not an image', '1px', '1px'))
+
+    def test_results_are_cached(self):
+        image = build_image('JPEG')
+        stats = ConversionStats()
+        with stats.collect():
+            first = self.processor.process(image, width='50px', height='25px')
+            second = self.processor.process(image, width='50px', height='25px')
+            self.processor.process(image, width='60px', height='30px')
+        self.assertIs(first, second)
+        self.assertEqual(stats.counters['image_cache_hits'], 1)
+        self.assertEqual(stats.counters['images_resized'], 2)
+
+    def test_least_recently_used_results_are_discarded(self):
+        processor = ImageProcessor(max_cached_images=1)
+        image = build_image('TIFF')
+        processor.process(image)
+        processor.process(image, width='50px', height='25px')
+        self.assertEqual(len(processor.cache), 1)
+
+    def test_concurrent_use(self):
+        processor = ImageProcessor(max_cached_images=20)
+        images = [
+            'not an image {0}'.format(index).encode('ascii')
+            for index in range(40)
+        ]
+
+        def process_images(offset):
+            for index in range(500):
+                processor.process(images[(index + offset) % len(images)])
+
+        threads = [
+            threading.Thread(target=process_images, args=(offset,))
+            for offset in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(processor.cache), 20)
+        self.assertEqual(len(list(processor.cache)), 20)
+
+
+class HtmlImageProcessingTestCase(TestCase):
+    def setUp(self):
+        if Image is None:
+            raise SkipTest('Pillow is not installed')
+
+    def export(self, data, image_processor=None):
+        stats = ConversionStats()
+        exporter = PyDocXHTMLExporter(
+            data,
+            image_processor=image_processor,
+            stats=stats,
+        )
+        return exporter.export(), stats.counters
+
+    def test_drawings_are_downscaled_to_their_extents(self):
+        body = DRAWING.format(cx=50 * EMUS_PER_PIXEL, cy=25 * EMUS_PER_PIXEL)
+        image = build_image('JPEG')
+        data = build_docx(body, image, 'jpeg')
+        html, counters = self.export(data, ImageProcessor(dpi_factor=2))
+        [(extension, source)] = get_image_sources(html)
+        self.assertEqual(extension, 'jpeg')
+        self.assertEqual(open_image(base64.b64decode(source)).size, (100, 50))
+        self.assertIn('width="50px"', html)
+        self.assertLess(counters['image_bytes_encoded'], len(image))
+
+    def test_vml_images_are_downscaled_to_their_style(self):
+        body = VML_IMAGE.format(width='75pt', height='37.5pt')
+        data = build_docx(body, build_image('PNG'), 'png')
+        html, _ = self.export(data, ImageProcessor(dpi_factor=1))
+        [(extension, source)] = get_image_sources(html)
+        self.assertEqual(open_image(base64.b64decode(source)).size, (100, 50))
+
+    def test_tiff_fixture_is_transcoded(self):
+        html, counters = self.export(
+            'tests/fixtures/attachment_is_tiff.docx',
+            ImageProcessor(),
+        )
+        [(extension, _)] = get_image_sources(html)
+        self.assertEqual(extension, 'jpeg')
+        self.assertEqual(counters['images_transcoded'], 1)
+
+    def test_without_a_processor_images_are_embedded_as_they_are(self):
+        html, _ = self.export('tests/fixtures/attachment_is_tiff.docx')
+        [(extension, _)] = get_image_sources(html)
+        self.assertEqual(extension, 'tiff')
@@ -0,0 +1,246 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import threading
+from io import BytesIO
+from unittest import TestCase
+
+from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.export.incremental import BlockCache
+from pydocx.openxml.packaging import (
+    FootnotesPart,
+    ImagePart,
+    MainDocumentPart,
+    NumberingDefinitionsPart,
+    StyleDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.stats import ConversionStats
+from pydocx.util.zip import create_zip_archive
+
+PARAGRAPH = '<p><r><t>Paragraph {index}</t></r></p>'
+
+STYLED_PARAGRAPH = '''
+    <p>
+      <pPr><pStyle val="Emphasis"/></pPr>
+      <r><t>Styled {index}</t></r>
+    </p>
+'''
+
+FOOTNOTE_PARAGRAPH = '''
+    <p>
+      <r><t>Paragraph {index}</t></r>
+      <r><footnoteReference id="{index}"/></r>
+    </p>
+'''
+
+LIST_ITEM = '''
+    <p>
+      <pPr><numPr><ilvl val="0"/><numId val="1"/></numPr></pPr>
+      <r><t>Item {index}</t></r>
+    </p>
+'''
+
+IMAGE_PARAGRAPH = '''
+    <p><r><pict><shape><imagedata id="rIdImage"/></shape></pict></r></p>
+'''
+
+HYPERLINK_PARAGRAPH = '''
+    <p><hyperlink id="rIdLink"><r><t>link</t></r></hyperlink></p>
+'''
+
+STYLES = '''
+    <style styleId="Emphasis" type="paragraph">
+      <name val="Emphasis"/>
+      <rPr>{properties}</rPr>
+    </style>
+'''
+
+NUMBERING = '''
+    <num numId="1"><abstractNumId val="1"/></num>
+    <abstractNum abstractNumId="1">
+      <lvl ilvl="0"><numFmt val="{num_format}"/></lvl>
+    </abstractNum>
+'''
+
+
+def build_docx(
+    blocks,
+    footnotes=(),
+    style_properties='<b/>',
+    num_format='decimal',
+    image=b'content',
+    link='http://example.com/',
+):
+    document = WordprocessingDocumentFactory()
+    document.add(StyleDefinitionsPart, STYLES.format(properties=style_properties))
+    document.add(NumberingDefinitionsPart, NUMBERING.format(num_format=num_format))
+    document.add(FootnotesPart, ''.join(
+        '<footnote id="{0}"><p><r><t>Footnote {0}</t></r></p></footnote>'.format(index)
+        for index in footnotes
+    ))
+    relationships = [
+        document.relationship_format.format(
+            id='rIdImage',
+            type=ImagePart.relationship_type,
+            target='media/image.png',
+            target_mode='Internal',
+        ),
+        document.relationship_format.format(
+            id='rIdLink',
+            type='http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink',  # noqa
+            target=link,
+            target_mode='External',
+        ),
+    ]
+    document.add(MainDocumentPart, ''.join(blocks), ''.join(relationships))
+    zip_dict = document.to_zip_dict()
+    zip_dict['word/media/image.png'] = image
+    return create_zip_archive(zip_dict).getvalue()
+
+
+class IncrementalExportTestCase(TestCase):
+    exporter_class = PyDocXHTMLExporter
+
+    def setUp(self):
+        self.cache = BlockCache()
+
+    def export(self, data, block_cache=None):
+        stats = ConversionStats()
+        exporter = self.exporter_class(
+            BytesIO(data),
+            stats=stats,
+            block_cache=block_cache,
+        )
+        return ''.join(exporter.export()), stats.counters
+
+    def assert_reconverted(self, data, expected_misses):
+        '''
+        Convert the data with the cache, and check that the output is the same
+        as without the cache, and that only the expected number of blocks were
+        rendered.
+        '''
+        output, counters = self.export(data, self.cache)
+        expected, _ = self.export(data)
+        self.assertEqual(output, expected)
+        self.assertEqual(counters.get('block_cache_misses', 0), expected_misses)
+        return output
+
+    def build_blocks(self, count=10):
+        return [PARAGRAPH.format(index=index) for index in range(count)]
+
+    def test_unchanged_document_is_not_rendered(self):
+        data = build_docx(self.build_blocks())
+        self.assert_reconverted(data, expected_misses=10)
+        self.assert_reconverted(data, expected_misses=0)
+
+    def test_only_changed_blocks_are_rendered(self):
+        blocks = self.build_blocks()
+        self.assert_reconverted(build_docx(blocks), expected_misses=10)
+        blocks[3] = PARAGRAPH.format(index='three')
+        blocks.insert(5, PARAGRAPH.format(index='new'))
+        self.assert_reconverted(build_docx(blocks), expected_misses=2)
+
+    def test_blocks_using_a_changed_style_are_rendered(self):
+        blocks = self.build_blocks()
+        blocks[2] = STYLED_PARAGRAPH.format(index=2)
+        self.assert_reconverted(build_docx(blocks), expected_misses=10)
+        data = build_docx(blocks, style_properties='<i/>')
+        self.assert_reconverted(data, expected_misses=1)
+
+    def test_lists_using_a_changed_numbering_definition_are_rendered(self):
+        blocks = self.build_blocks()
+        blocks[2:2] = [LIST_ITEM.format(index=index) for index in range(3)]
+        # The list items are a single block
+        self.assert_reconverted(build_docx(blocks), expected_misses=11)
+        data = build_docx(blocks, num_format='lowerRoman')
+        self.assert_reconverted(data, expected_misses=1)
+
+    def test_changing_a_list_item_renders_the_list(self):
+        blocks = self.build_blocks()
+        blocks[2:2] = [LIST_ITEM.format(index=index) for index in range(3)]
+        self.assert_reconverted(build_docx(blocks), expected_misses=11)
+        blocks[3] = LIST_ITEM.format(index='changed')
+        self.assert_reconverted(build_docx(blocks), expected_misses=1)
+
+    def test_footnotes_are_renumbered(self):
+        blocks = [FOOTNOTE_PARAGRAPH.format(index=index) for index in range(5)]
+        footnotes = range(6)
+        self.assert_reconverted(build_docx(blocks, footnotes), expected_misses=5)
+        # Adding a footnote at the start changes the ordinals of all of the
+        # footnotes, but only the new block is rendered
+        blocks.insert(0, FOOTNOTE_PARAGRAPH.format(index=5))
+        self.assert_reconverted(build_docx(blocks, footnotes), expected_misses=1)
+
+    def test_images_that_changed_are_rendered(self):
+        blocks = self.build_blocks()
+        blocks.append(IMAGE_PARAGRAPH)
+        self.assert_reconverted(build_docx(blocks), expected_misses=11)
+        self.assert_reconverted(build_docx(blocks, image=b'other'), expected_misses=1)
+
+    def test_hyperlinks_with_a_changed_target_are_rendered(self):
+        blocks = self.build_blocks()
+        blocks.append(HYPERLINK_PARAGRAPH)
+        self.assert_reconverted(build_docx(blocks), expected_misses=11)
+        data = build_docx(blocks, link='http://example.org/')
+        self.assert_reconverted(data, expected_misses=1)
+
+    def test_exporters_with_other_options_do_not_share_blocks(self):
+        data = build_docx(self.build_blocks())
+        self.assert_reconverted(data, expected_misses=10)
+
+        class Exporter(self.exporter_class):
+            styles = False
+
+        self.exporter_class = Exporter
+        self.assert_reconverted(data, expected_misses=10)
+
+
+class IncrementalMarkdownExportTestCase(IncrementalExportTestCase):
+    exporter_class = PyDocXMarkdownExporter
+
+
+class BlockCacheTestCase(TestCase):
+    def test_least_recently_used_blocks_are_discarded(self):
+        cache = BlockCache(max_blocks=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_concurrent_use(self):
+        cache = BlockCache(max_blocks=50)
+
+        def use_cache(offset):
+            for index in range(2000):
+                key = (index + offset) % 100
+                if cache.get(key) is None:
+                    cache.set(key, key)
+
+        threads = [
+            threading.Thread(target=use_cache, args=(offset,))
+            for offset in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(cache), 50)
+        self.assertEqual(len(list(cache.blocks)), 50)
+        for key, entry in cache.blocks.items():
+            self.assertEqual(key, entry)
+
+    def test_interned_styles_are_not_cached(self):
+        class Exporter(PyDocXHTMLExporter):
+            intern_styles = True
+
+        exporter = Exporter(None, block_cache=BlockCache())
+        self.assertFalse(exporter.can_cache_blocks())
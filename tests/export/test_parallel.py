@@ -0,0 +1,243 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from unittest import TestCase
+
+from nose import SkipTest
+
+from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.export import parallel
+from pydocx.openxml.packaging import (
+    FootnotesPart,
+    ImagePart,
+    MainDocumentPart,
+    NumberingDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.stats import ConversionStats
+from pydocx.util.zip import create_zip_archive
+
+PARAGRAPH = '<p><r><t>Paragraph {index}</t></r></p>'
+
+LIST_ITEM = '''
+    <p>
+      <pPr><numPr><ilvl val="{level}"/><numId val="1"/></numPr></pPr>
+      <r><t>Item {index}</t></r>
+    </p>
+'''
+
+FOOTNOTE_PARAGRAPH = '''
+    <p>
+      <r><t>Paragraph {index}</t></r>
+      <r><footnoteReference id="{index}"/></r>
+    </p>
+'''
+
+FOOTNOTE = '''
+    <footnote id="{index}">
+      <p><r><footnoteRef/><t>Footnote {index}</t></r></p>
+    </footnote>
+'''
+
+FIELD_PARAGRAPH = '''
+    <p>
+      <r><fldChar fldCharType="begin"/></r>
+      <r><instrText> HYPERLINK "http://example.com/{index}" </instrText></r>
+      <r><fldChar fldCharType="separate"/></r>
+      <r><t>link {index}</t></r>
+      <r><fldChar fldCharType="end"/></r>
+    </p>
+'''
+
+IMAGE_PARAGRAPH = '''
+    <p><r><drawing><inline>
+      <graphic><graphicData><pic>
+        <blipFill><blip embed="rIdImage"/></blipFill>
+      </pic></graphicData></graphic>
+    </inline></drawing></r></p>
+'''
+
+TABLE = '<tbl><tr><tc><p><r><t>Cell {index}</t></r></p></tc></tr></tbl>'
+
+NUMBERING = '''
+    <num numId="1"><abstractNumId val="1"/></num>
+    <abstractNum abstractNumId="1">
+      <lvl ilvl="0"><numFmt val="decimal"/></lvl>
+      <lvl ilvl="1"><numFmt val="lowerLetter"/></lvl>
+    </abstractNum>
+'''
+
+
+class ParallelHTMLExporter(PyDocXHTMLExporter):
+    render_processes = 2
+    parallel_render_min_blocks = 1
+
+
+class ParallelMarkdownExporter(PyDocXMarkdownExporter):
+    render_processes = 2
+    parallel_render_min_blocks = 1
+
+
+def build_docx(blocks):
+    document = WordprocessingDocumentFactory()
+    document.add(NumberingDefinitionsPart, NUMBERING)
+    document.add(FootnotesPart, ''.join(
+        FOOTNOTE.format(index=index)
+        for index in range(len(blocks))
+    ))
+    document.add(MainDocumentPart, ''.join(blocks))
+    return create_zip_archive(document.to_zip_dict()).getvalue()
+
+
+def build_mixed_docx(count=40):
+    blocks = []
+    for index in range(count):
+        blocks.append(PARAGRAPH.format(index=index))
+        blocks.append(FOOTNOTE_PARAGRAPH.format(index=index))
+        if index % 10 < 6:
+            blocks.append(LIST_ITEM.format(index=index, level=index % 2))
+        blocks.append(FIELD_PARAGRAPH.format(index=index))
+        blocks.append(TABLE.format(index=index))
+    return build_docx(blocks)
+
+
+class ParallelRenderTestCase(TestCase):
+    def setUp(self):
+        if not parallel.can_fork():
+            raise SkipTest('Rendering in parallel requires fork')
+
+    def export(self, exporter_class, data, **kwargs):
+        from io import BytesIO
+        return ''.join(exporter_class(BytesIO(data), **kwargs).export())
+
+    def assert_same_as_sequential(self, data, parallel_class, sequential_class):
+        stats = ConversionStats()
+        expected = self.export(sequential_class, data)
+        self.assertEqual(self.export(parallel_class, data, stats=stats), expected)
+        return stats.counters['render_segments']
+
+    def test_html_is_the_same_as_sequential(self):
+        segments = self.assert_same_as_sequential(
+            build_mixed_docx(),
+            ParallelHTMLExporter,
+            PyDocXHTMLExporter,
+        )
+        self.assertEqual(segments, 8)
+
+    def test_markdown_is_the_same_as_sequential(self):
+        segments = self.assert_same_as_sequential(
+            build_mixed_docx(),
+            ParallelMarkdownExporter,
+            PyDocXMarkdownExporter,
+        )
+        self.assertEqual(segments, 8)
+
+    def test_stats_recorded_by_the_workers_are_kept(self):
+        document = WordprocessingDocumentFactory()
+        relationships = document.relationship_format.format(
+            id='rIdImage',
+            type=ImagePart.relationship_type,
+            target='media/image.gif',
+            target_mode='Internal',
+        )
+        document.add(
+            MainDocumentPart,
+            ''.join(IMAGE_PARAGRAPH for _ in range(20)),
+            relationships,
+        )
+        zip_dict = document.to_zip_dict()
+        zip_dict['word/media/image.gif'] = b'GIF89a'
+        data = create_zip_archive(zip_dict).getvalue()
+
+        stats = ConversionStats()
+        self.assertEqual(
+            self.export(ParallelHTMLExporter, data, stats=stats),
+            self.export(PyDocXHTMLExporter, data),
+        )
+        self.assertEqual(stats.counters['render_segments'], 8)
+        # The images are encoded by the workers
+        self.assertEqual(stats.counters['images_encoded'], 20)
+        self.assertEqual(stats.counters['image_bytes_encoded'], 20 * 6)
+
+    def test_footnotes_are_numbered_across_segments(self):
+        data = build_docx([
+            FOOTNOTE_PARAGRAPH.format(index=index)
+            for index in range(20)
+        ])
+        html = self.export(ParallelHTMLExporter, data)
+        self.assertIn('Paragraph 19<a href="#footnote-19" name="footnote-ref-19">20</a>', html)  # noqa
+        self.assertEqual(html.count('<li>'), 20)
+        self.assertLess(html.index('Footnote 0'), html.index('Footnote 19'))
+
+    def test_a_list_is_never_split(self):
+        data = build_docx([
+            LIST_ITEM.format(index=index, level=0)
+            for index in range(20)
+        ])
+        html = self.export(ParallelHTMLExporter, data)
+        self.assertEqual(html.count('<ol'), 1)
+
+    def test_small_bodies_are_rendered_sequentially(self):
+        class Exporter(ParallelHTMLExporter):
+            parallel_render_min_blocks = 1000
+
+        stats = ConversionStats()
+        self.export(Exporter, build_mixed_docx(), stats=stats)
+        self.assertNotIn('render_segments', stats.counters)
+
+    def test_unexpected_footnotes_fall_back_to_sequential(self):
+        class Exporter(ParallelHTMLExporter):
+            def export_footnote_reference(self, footnote_reference):
+                # Footnotes in the first half aren't rendered
+                if int(footnote_reference.footnote_id) < 20:
+                    return
+                parent = super(Exporter, self)
+                for result in parent.export_footnote_reference(footnote_reference):
+                    yield result
+
+        class SequentialExporter(Exporter):
+            render_processes = 1
+
+        stats = ConversionStats()
+        data = build_mixed_docx()
+        self.assertEqual(
+            self.export(Exporter, data, stats=stats),
+            self.export(SequentialExporter, data),
+        )
+        self.assertNotIn('render_segments', stats.counters)
+
+    def test_interned_styles_are_rendered_sequentially(self):
+        class Exporter(ParallelHTMLExporter):
+            intern_styles = True
+
+        self.assertFalse(Exporter(None).can_render_in_parallel())
+
+
+class IterateDescendantsTestCase(TestCase):
+    def test_nested_blocks(self):
+        data = build_docx([TABLE.format(index=0), FOOTNOTE_PARAGRAPH.format(index=1)])
+        from io import BytesIO
+        exporter = PyDocXHTMLExporter(BytesIO(data))
+        body = exporter.main_document_part.document.body
+        names = [
+            type(node).__name__
+            for node in parallel.iterate_descendants(body)
+        ]
+        self.assertEqual(names, [
+            'Body',
+            'Table',
+            'TableRow',
+            'TableCell',
+            'Paragraph',
+            'Run',
+            'Text',
+            'Paragraph',
+            'Run',
+            'Text',
+            'Run',
+            'FootnoteReference',
+        ])
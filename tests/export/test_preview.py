@@ -0,0 +1,193 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from io import BytesIO
+from unittest import TestCase
+from zipfile import ZipFile
+
+from pydocx.exceptions import MalformedDocxException
+from pydocx.export import PyDocXHTMLExporter, PyDocXMarkdownExporter
+from pydocx.openxml.packaging import (
+    FootnotesPart,
+    ImagePart,
+    MainDocumentPart,
+    NumberingDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.preview import PreviewLimits
+from pydocx.util.stats import ConversionStats
+from pydocx.util.xml import set_xml_backend
+from pydocx.util.zip import create_zip_archive
+
+PARAGRAPH = '<p><r><t>Paragraph {index}</t></r></p>'
+
+LIST_ITEM = '''
+    <p>
+      <pPr><numPr><ilvl val="0"/><numId val="1"/></numPr></pPr>
+      <r><t>Item {index}</t></r>
+    </p>
+'''
+
+FOOTNOTE_PARAGRAPH = '''
+    <p>
+      <r><t>Paragraph {index}</t></r>
+      <r><footnoteReference id="{index}"/></r>
+    </p>
+'''
+
+IMAGE_PARAGRAPH = '''
+    <p><r><pict><shape><imagedata id="rIdImage"/></shape></pict></r></p>
+'''
+
+NUMBERING = '''
+    <num numId="1"><abstractNumId val="1"/></num>
+    <abstractNum abstractNumId="1">
+      <lvl ilvl="0"><numFmt val="decimal"/></lvl>
+    </abstractNum>
+'''
+
+
+def build_docx(blocks, footnotes=(), image=None):
+    document = WordprocessingDocumentFactory()
+    document.add(NumberingDefinitionsPart, NUMBERING)
+    document.add(FootnotesPart, ''.join(
+        '<footnote id="{0}"><p><r><t>Footnote {0}</t></r></p></footnote>'.format(index)
+        for index in footnotes
+    ))
+    relationships = document.relationship_format.format(
+        id='rIdImage',
+        type=ImagePart.relationship_type,
+        target='media/image.png',
+        target_mode='Internal',
+    )
+    document.add(MainDocumentPart, ''.join(blocks), relationships)
+    zip_dict = document.to_zip_dict()
+    if image is not None:
+        zip_dict['word/media/image.png'] = image
+    return create_zip_archive(zip_dict).getvalue()
+
+
+def build_paragraphs(count):
+    return [PARAGRAPH.format(index=index) for index in range(count)]
+
+
+class PreviewExportTestCase(TestCase):
+    def export(self, data, preview, exporter_class=PyDocXHTMLExporter):
+        self.stats = ConversionStats()
+        self.exporter = exporter_class(BytesIO(data), preview=preview, stats=self.stats)
+        return self.exporter.export()
+
+    def get_body(self, html):
+        start = html.index('<body>') + len('<body>')
+        return html[start:html.index('</body>')]
+
+    def test_without_limits_the_whole_document_is_exported(self):
+        data = build_docx(build_paragraphs(5))
+        html = self.export(data, PreviewLimits())
+        self.assertEqual(html, PyDocXHTMLExporter(BytesIO(data)).export())
+        self.assertFalse(self.exporter.main_document_part.is_truncated)
+
+    def test_max_blocks(self):
+        html = self.export(build_docx(build_paragraphs(50)), PreviewLimits(max_blocks=3))
+        self.assertEqual(
+            self.get_body(html),
+            '<p>Paragraph 0</p><p>Paragraph 1</p><p>Paragraph 2</p>',
+        )
+        self.assertTrue(self.exporter.main_document_part.is_truncated)
+        self.assertEqual(self.stats.counters['preview_blocks_loaded'], 3)
+
+    def test_max_blocks_markdown(self):
+        markdown = self.export(
+            build_docx(build_paragraphs(50)),
+            PreviewLimits(max_blocks=2),
+            exporter_class=PyDocXMarkdownExporter,
+        )
+        markdown = ''.join(markdown)
+        self.assertIn('Paragraph 1', markdown)
+        self.assertNotIn('Paragraph 2', markdown)
+
+    def test_max_chars_stops_before_the_block_that_does_not_fit(self):
+        # Each paragraph is rendered as 18 characters
+        html = self.export(build_docx(build_paragraphs(50)), PreviewLimits(max_chars=53))
+        self.assertEqual(
+            self.get_body(html),
+            '<p>Paragraph 0</p><p>Paragraph 1</p>',
+        )
+        # Only the blocks whose text could fit were loaded
+        self.assertLessEqual(self.stats.counters['preview_blocks_loaded'], 5)
+
+    def test_max_bytes_counts_encoded_bytes(self):
+        blocks = ['<p><r><t>αβγ</t></r></p>'] * 10
+        html = self.export(build_docx(blocks), PreviewLimits(max_bytes=26))
+        # Each paragraph is 13 bytes long
+        self.assertEqual(self.get_body(html).count('<p>'), 2)
+
+    def test_lists_are_closed(self):
+        blocks = [LIST_ITEM.format(index=index) for index in range(10)]
+        html = self.export(build_docx(blocks), PreviewLimits(max_blocks=2))
+        self.assertEqual(
+            self.get_body(html),
+            '<ol class="pydocx-list-style-type-decimal">'
+            '<li>Item 0</li><li>Item 1</li></ol>',
+        )
+
+    def test_complex_fields_cut_short_are_exported(self):
+        blocks = [
+            '<p><r><fldChar fldCharType="begin"/></r>'
+            '<r><instrText> HYPERLINK "http://example.com/" </instrText></r>'
+            '<r><fldChar fldCharType="separate"/></r>'
+            '<r><t>Link</t></r></p>',
+            '<p><r><t>continued</t></r>'
+            '<r><fldChar fldCharType="end"/></r></p>',
+        ]
+        html = self.export(build_docx(blocks), PreviewLimits(max_blocks=1))
+        self.assertIn('Link', self.get_body(html))
+        self.assertNotIn('continued', html)
+
+    def test_footnotes_of_blocks_that_do_not_fit_are_not_exported(self):
+        blocks = [FOOTNOTE_PARAGRAPH.format(index=index) for index in range(1, 10)]
+        data = build_docx(blocks, footnotes=range(1, 10))
+        html = self.export(data, PreviewLimits(max_chars=100))
+        self.assertIn('Footnote 1', html)
+        self.assertNotIn('Paragraph 2', html)
+        self.assertNotIn('Footnote 2', html)
+
+    def test_later_blocks_are_not_decompressed(self):
+        data = build_docx(build_paragraphs(5000))
+        self.export(data, PreviewLimits(max_blocks=5))
+        document_size = ZipFile(BytesIO(data)).getinfo('word/document.xml').file_size
+        self.assertLess(self.stats.counters['bytes_decompressed'], document_size / 4)
+
+    def test_images_of_later_blocks_are_not_decompressed(self):
+        blocks = build_paragraphs(5) + [IMAGE_PARAGRAPH]
+        data = build_docx(blocks, image=b'content')
+        self.export(data, PreviewLimits(max_blocks=5))
+        package = self.exporter.document.package
+        self.assertNotIn('/word/media/image.png', package.streams)
+
+        self.export(data, PreviewLimits(max_blocks=6))
+        package = self.exporter.document.package
+        self.assertIn('/word/media/image.png', package.streams)
+
+    def test_malformed_body_raises_malformed_exception(self):
+        data = build_docx(['<p><r><t>Paragraph</t></p>'])
+        self.assertRaises(
+            MalformedDocxException,
+            lambda: self.export(data, PreviewLimits(max_blocks=5)),
+        )
+
+    def test_etree_backend(self):
+        data = build_docx(build_paragraphs(10))
+        previous_backend = set_xml_backend('etree')
+        try:
+            html = self.export(data, PreviewLimits(max_blocks=2))
+        finally:
+            set_xml_backend(previous_backend)
+        self.assertEqual(
+            self.get_body(html),
+            '<p>Paragraph 0</p><p>Paragraph 1</p>',
+        )
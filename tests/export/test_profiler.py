@@ -0,0 +1,114 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from unittest import TestCase
+
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.export.profiler import ExportProfiler
+
+
+class FakeTimer(object):
+    '''
+    Advances one second each time the time is read
+    '''
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+class Node(object):
+    pass
+
+
+class ChildNode(object):
+    pass
+
+
+class ExportProfilerTestCase(TestCase):
+    def setUp(self):
+        self.profiler = ExportProfiler()
+        self.profiler.timer = FakeTimer()
+
+    def export_child(self, node):
+        yield 'child'
+
+    def export_node(self, node):
+        yield 'before'
+        for result in self.profiler.profile(ChildNode(), self.export_child):
+            yield result
+        yield 'after'
+
+    def test_time_is_attributed_as_the_results_are_consumed(self):
+        results = self.profiler.profile(Node(), self.export_node)
+        report = self.profiler.to_dict()
+        self.assertEqual(report['node_types']['Node']['calls'], 1)
+        self.assertEqual(report['node_types']['Node']['inclusive_seconds'], 1)
+        self.assertNotIn('ChildNode', report['node_types'])
+
+        self.assertEqual(list(results), ['before', 'child', 'after'])
+        report = self.profiler.to_dict()
+        self.assertEqual(report['node_types']['ChildNode'], {
+            'calls': 1,
+            'inclusive_seconds': 3,
+            'exclusive_seconds': 3,
+        })
+        # The handler call and four steps through the results
+        self.assertEqual(report['node_types']['Node'], {
+            'calls': 1,
+            'inclusive_seconds': 11,
+            'exclusive_seconds': 8,
+        })
+        self.assertEqual(
+            list(report['handlers'].keys()),
+            ['export_node', 'export_child'],
+        )
+
+    def test_recursive_nodes_are_only_included_once(self):
+        def export_outer(node):
+            for result in self.profiler.profile(node, export_inner):
+                yield result
+
+        def export_inner(node):
+            yield 'inner'
+
+        results = self.profiler.profile(Node(), export_outer)
+        self.assertEqual(list(results), ['inner'])
+        entry = self.profiler.node_types['Node']
+        self.assertEqual(entry.calls, 2)
+        self.assertEqual(entry.exclusive_seconds, entry.inclusive_seconds)
+
+    def test_handlers_that_return_nothing(self):
+        self.assertIsNone(self.profiler.profile(Node(), lambda node: None))
+        self.assertEqual(self.profiler.node_types['Node'].calls, 1)
+        self.assertEqual(self.profiler.stack, [])
+
+    def test_exporter(self):
+        profiler = ExportProfiler()
+        exporter = PyDocXHTMLExporter(
+            'tests/fixtures/nested_tables.docx',
+            profiler=profiler,
+        )
+        html = exporter.export()
+        unprofiled_html = PyDocXHTMLExporter(
+            'tests/fixtures/nested_tables.docx',
+        ).export()
+        self.assertEqual(html, unprofiled_html)
+
+        report = profiler.to_dict()
+        # Both passes are profiled
+        self.assertEqual(report['node_types']['Document']['calls'], 2)
+        self.assertEqual(report['handlers']['export_table']['calls'], 4)
+        table = report['node_types']['Table']
+        self.assertLessEqual(
+            table['exclusive_seconds'],
+            table['inclusive_seconds'],
+        )
+        self.assertEqual(profiler.stack, [])
@@ -0,0 +1,114 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pydocx.exceptions import InvalidSnapshotException
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import WordprocessingDocument
+from pydocx.openxml.packaging import snapshot
+from pydocx.openxml.packaging.snapshot import (
+    DocumentSnapshotCache,
+    dumps_snapshot,
+    get_content_hash,
+    loads_snapshot,
+)
+
+
+def export_html(path, document=None):
+    exporter = PyDocXHTMLExporter(path)
+    if document is not None:
+        exporter.document = document
+    return exporter.export()
+
+
+class SnapshotTestCase(unittest.TestCase):
+    fixtures = (
+        'tests/fixtures/table_col_row_span.docx',
+        'tests/fixtures/has_image.docx',
+        'tests/fixtures/lists_with_styles.docx',
+        'tests/fixtures/nested_table_rowspan.docx',
+        'tests/fixtures/textbox.docx',
+    )
+
+    def test_restored_documents_export_the_same_html(self):
+        for path in self.fixtures:
+            data = dumps_snapshot(WordprocessingDocument(path=path))
+            expected = export_html(path)
+            # Exporting modifies the models, so each restored document must
+            # be independent
+            self.assertEqual(export_html(path, loads_snapshot(data)), expected)
+            self.assertEqual(export_html(path, loads_snapshot(data)), expected)
+
+    def test_snapshot_of_a_document_opened_from_a_file(self):
+        with open(self.fixtures[0], 'rb') as f:
+            data = dumps_snapshot(WordprocessingDocument(path=f))
+        document = loads_snapshot(data)
+        self.assertIsNone(document.package.path)
+        self.assertIsNotNone(document.main_document_part.document)
+
+    def test_invalid_snapshot(self):
+        self.assertRaises(InvalidSnapshotException, loads_snapshot, b'foo')
+        self.assertRaises(
+            InvalidSnapshotException,
+            loads_snapshot,
+            b'foo\nbar\nbaz',
+        )
+
+    def test_snapshot_from_a_different_version(self):
+        data = dumps_snapshot(WordprocessingDocument(path=self.fixtures[0]))
+        format_version = snapshot.SNAPSHOT_FORMAT_VERSION
+        snapshot.SNAPSHOT_FORMAT_VERSION = format_version + 1
+        try:
+            self.assertRaises(InvalidSnapshotException, loads_snapshot, data)
+        finally:
+            snapshot.SNAPSHOT_FORMAT_VERSION = format_version
+
+
+class DocumentSnapshotCacheTestCase(unittest.TestCase):
+    path = 'tests/fixtures/simple.docx'
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = DocumentSnapshotCache(os.path.join(self.directory, 'x'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_content_hash(self):
+        with open(self.path, 'rb') as f:
+            return get_content_hash(f.read())
+
+    def test_snapshot_is_created_on_first_use(self):
+        content_hash = self.get_content_hash()
+        self.assertIsNone(self.cache.load(content_hash))
+
+        document = self.cache.get_document(self.path)
+        self.assertEqual(export_html(self.path, document), export_html(self.path))
+        self.assertTrue(os.path.exists(
+            self.cache.get_snapshot_path(content_hash),
+        ))
+
+    def test_snapshot_is_used_when_it_exists(self):
+        self.cache.get_document(self.path)
+        with open(self.path, 'rb') as f:
+            document = self.cache.get_document(f)
+        self.assertEqual(export_html(self.path, document), export_html(self.path))
+
+    def test_invalid_snapshot_is_ignored(self):
+        content_hash = self.get_content_hash()
+        self.cache.get_document(self.path)
+        with open(self.cache.get_snapshot_path(content_hash), 'wb') as f:
+            f.write(b'foo')
+        self.assertIsNone(self.cache.load(content_hash))
+
+        document = self.cache.get_document(self.path)
+        self.assertEqual(export_html(self.path, document), export_html(self.path))
+        self.assertIsNotNone(self.cache.load(content_hash))
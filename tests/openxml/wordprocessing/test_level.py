@@ -28,7 +28,7 @@ class LevelTestCase(TestCase):
     def test_starting_position_attribute(self):
         xml = '<lvl><start val="50" /></lvl>'
         level = self._load_from_xml(xml)
-        self.assertEqual(level.start, '50')
+        self.assertEqual(level.start, 50)
 
     def test_num_format_attribute(self):
         xml = '<lvl><numFmt val="decimal" /></lvl>'
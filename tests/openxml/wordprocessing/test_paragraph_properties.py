@@ -43,7 +43,7 @@ class ParagraphPropertiesTestCase(ParagraphPropertiesTestBase):
             </pPr>
         '''
         properties = self._load_from_xml(xml)
-        self.assertEqual(properties.indentation_left, '123')
+        self.assertEqual(properties.indentation_left, 123)
 
     def test_indentation_right(self):
         xml = '''
@@ -52,7 +52,7 @@ class ParagraphPropertiesTestCase(ParagraphPropertiesTestBase):
             </pPr>
         '''
         properties = self._load_from_xml(xml)
-        self.assertEqual(properties.indentation_right, '456')
+        self.assertEqual(properties.indentation_right, 456)
 
     def test_indentation_first_line(self):
         xml = '''
@@ -61,7 +61,26 @@ class ParagraphPropertiesTestCase(ParagraphPropertiesTestBase):
             </pPr>
         '''
         properties = self._load_from_xml(xml)
-        self.assertEqual(properties.indentation_first_line, '789')
+        self.assertEqual(properties.indentation_first_line, 789)
+
+    def test_invalid_indentation_is_None(self):
+        xml = '''
+            <pPr>
+                <ind left="auto" />
+            </pPr>
+        '''
+        properties = self._load_from_xml(xml)
+        self.assertEqual(properties.indentation_left, None)
+        self.assertEqual(properties.to_int('indentation_left', default=0), 0)
+
+    def test_to_int_allows_decimal_indentation(self):
+        xml = '''
+            <pPr>
+                <ind left="123.6" />
+            </pPr>
+        '''
+        properties = self._load_from_xml(xml)
+        self.assertEqual(properties.to_int('indentation_left'), 123)
 
 
 class StartMarginPositionTestCase(ParagraphPropertiesTestBase):
@@ -7,7 +7,8 @@ from __future__ import (
 
 from unittest import TestCase
 
-from pydocx.openxml.wordprocessing import Run
+from pydocx.openxml.wordprocessing import Run, RunProperties
+from pydocx.types import OnOff
 
 
 class RunTestCase(TestCase):
@@ -21,3 +22,10 @@ class RunTestCase(TestCase):
         sentinel = object()
         effective_properties.bold = sentinel
         self.assertEqual(run.effective_properties.bold, sentinel)
+
+    def test_effective_properties_are_a_copy_of_the_properties(self):
+        properties = RunProperties(bold=OnOff('1'), sz='24')
+        run = Run(properties=properties)
+        effective_properties = run.effective_properties
+        self.assertIsNot(effective_properties, properties)
+        self.assertEqual(dict(effective_properties.fields), dict(properties.fields))
@@ -0,0 +1,152 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+from unittest import TestCase
+
+from pydocx.openxml.wordprocessing import Table
+from pydocx.util.xml import parse_xml_from_string
+
+
+class TableGridTestCase(TestCase):
+    def _load_grid(self, xml):
+        table = Table.load(parse_xml_from_string(xml))
+        return table.calculate_table_grid()
+
+    def _get_cell_spans(self, xml):
+        return list(self._load_grid(xml).iter_cell_spans())
+
+    def test_empty_table_has_no_cells(self):
+        self.assertEqual(self._get_cell_spans('<tbl />'), [])
+
+    def test_cells_without_properties_span_one_row_and_column(self):
+        xml = '''
+            <tbl>
+                <tr><tc /><tc /></tr>
+                <tr><tc /><tc /></tr>
+            </tbl>
+        '''
+        cell_spans = self._get_cell_spans(xml)
+        self.assertEqual(cell_spans, [(1, 1)] * 4)
+
+    def test_vertical_merge_is_counted_on_the_restart_cell(self):
+        xml = '''
+            <tbl>
+                <tr>
+                    <tc><tcPr><vMerge val="restart" /></tcPr></tc>
+                    <tc><tcPr><gridSpan val="2" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc><tcPr><vMerge /></tcPr></tc>
+                    <tc><tcPr><gridSpan val="2" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc><tcPr><vMerge val="continue" /></tcPr></tc>
+                    <tc><tcPr><gridSpan val="2" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc />
+                    <tc><tcPr><gridSpan val="2" /></tcPr></tc>
+                </tr>
+            </tbl>
+        '''
+        cell_spans = self._get_cell_spans(xml)
+        self.assertEqual(cell_spans, [
+            (3, 1), (1, 2),
+            (0, 1), (1, 2),
+            (0, 1), (1, 2),
+            (1, 1), (1, 2),
+        ])
+
+    def test_vertical_merge_is_tracked_by_grid_column(self):
+        xml = '''
+            <tbl>
+                <tr>
+                    <tc><tcPr><gridSpan val="2" /></tcPr></tc>
+                    <tc><tcPr><vMerge val="restart" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc />
+                    <tc />
+                    <tc><tcPr><vMerge val="continue" /></tcPr></tc>
+                </tr>
+            </tbl>
+        '''
+        cell_spans = self._get_cell_spans(xml)
+        self.assertEqual(cell_spans, [
+            (1, 2), (2, 1),
+            (1, 1), (1, 1), (0, 1),
+        ])
+
+    def test_invalid_grid_span_is_one_column(self):
+        xml = '''
+            <tbl>
+                <tr>
+                    <tc><tcPr><gridSpan val="foo" /></tcPr></tc>
+                    <tc><tcPr><gridSpan val="0" /></tcPr></tc>
+                </tr>
+            </tbl>
+        '''
+        cell_spans = self._get_cell_spans(xml)
+        self.assertEqual(cell_spans, [(1, 1), (1, 1)])
+
+    def test_merge_is_not_closed_by_a_row_without_a_cell_in_its_column(self):
+        xml = '''
+            <tbl>
+                <tr>
+                    <tc />
+                    <tc><tcPr><vMerge val="restart" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc><tcPr><gridSpan val="2" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc />
+                    <tc><tcPr><vMerge /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc />
+                    <tc><tcPr><vMerge val="restart" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc />
+                    <tc><tcPr><vMerge /></tcPr></tc>
+                </tr>
+            </tbl>
+        '''
+        cell_spans = self._get_cell_spans(xml)
+        self.assertEqual(cell_spans, [
+            (1, 1), (2, 1),
+            (1, 2),
+            (1, 1), (0, 1),
+            (1, 1), (2, 1),
+            (1, 1), (0, 1),
+        ])
+
+    def test_cell_spans_are_looked_up_by_position(self):
+        xml = '''
+            <tbl>
+                <tr>
+                    <tc><tcPr><vMerge val="restart" /></tcPr></tc>
+                    <tc><tcPr><gridSpan val="2" /></tcPr></tc>
+                </tr>
+                <tr>
+                    <tc><tcPr><vMerge /></tcPr></tc>
+                    <tc />
+                    <tc />
+                </tr>
+            </tbl>
+        '''
+        table = Table.load(parse_xml_from_string(xml))
+        grid = table.calculate_table_grid()
+        self.assertEqual(len(grid), 5)
+        self.assertEqual(grid.get_cell_spans(0, 0), (2, 1))
+        self.assertEqual(grid.get_cell_spans(0, 1), (1, 2))
+        self.assertEqual(grid.get_cell_spans(1, 0), (0, 1))
+        self.assertEqual(grid.get_cell_spans(1, 2), (1, 1))
+
+        cell = table.rows[1].cells[2]
+        self.assertEqual(grid.get_cell_position(cell), (1, 2))
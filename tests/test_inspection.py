@@ -0,0 +1,222 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import json
+from io import BytesIO
+from unittest import TestCase
+
+from pydocx import PyDocX
+from pydocx.__main__ import main
+from pydocx.exceptions import (
+    MalformedDocxException,
+    ResourceLimitExceededException,
+)
+from pydocx.inspection import inspect_document
+from pydocx.openxml.packaging import (
+    MainDocumentPart,
+    StyleDefinitionsPart,
+)
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.limits import ResourceLimits
+from pydocx.util.xml import set_xml_backend
+from pydocx.util.zip import create_zip_archive
+
+STYLES = '''
+    <style styleId="Heading1" type="paragraph">
+      <name val="Heading 1"/>
+    </style>
+    <style styleId="Heading2" type="paragraph">
+      <name val="heading 2"/>
+    </style>
+    <style styleId="ChapterTitle" type="paragraph">
+      <name val="Chapter Title"/>
+      <basedOn val="Heading1"/>
+    </style>
+    <style styleId="Quote" type="paragraph">
+      <name val="Quote"/>
+    </style>
+'''
+
+CORE_PROPERTIES = '''<?xml version="1.0" encoding="UTF-8"?>
+    <cp:coreProperties
+        xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties"
+        xmlns:dc="http://purl.org/dc/elements/1.1/">
+      <dc:title>The title</dc:title>
+      <dc:creator>An author</dc:creator>
+      <cp:revision>3</cp:revision>
+    </cp:coreProperties>
+'''
+
+EXTENDED_PROPERTIES = '''<?xml version="1.0" encoding="UTF-8"?>
+    <Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">
+      <Pages>7</Pages>
+      <Application>Word</Application>
+    </Properties>
+'''  # noqa
+
+PACKAGE_RELATIONSHIPS = '''
+    <Relationship Id="rIdCore" Target="docProps/core.xml"
+        Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties"/>
+    <Relationship Id="rIdApp" Target="docProps/app.xml"
+        Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties"/>
+'''  # noqa
+
+
+def build_docx(body, properties=False):
+    document = WordprocessingDocumentFactory()
+    document.add(StyleDefinitionsPart, STYLES)
+    document.add(MainDocumentPart, body)
+    zip_dict = document.to_zip_dict()
+    if properties:
+        zip_dict['_rels/.rels'] = zip_dict['_rels/.rels'].replace(
+            '</Relationships>',
+            PACKAGE_RELATIONSHIPS + '</Relationships>',
+        )
+        zip_dict['docProps/core.xml'] = CORE_PROPERTIES
+        zip_dict['docProps/app.xml'] = EXTENDED_PROPERTIES
+    return BytesIO(create_zip_archive(zip_dict).getvalue())
+
+
+def heading(style_id, text):
+    return '''
+        <p>
+          <pPr><pStyle val="{0}"/></pPr>
+          <r><t>{1}</t></r>
+        </p>
+    '''.format(style_id, text)
+
+
+class InspectDocumentTestCase(TestCase):
+    def test_outline(self):
+        body = ''.join([
+            heading('Heading1', 'Introduction'),
+            '<p><r><t>Some text</t></r></p>',
+            heading('Heading2', 'Background'),
+            heading('Quote', 'Not a heading'),
+            heading('ChapterTitle', 'Based on a heading'),
+            heading('Missing', 'Missing style'),
+        ])
+        report = inspect_document(build_docx(body))
+        self.assertEqual(report['outline'], [
+            {'level': 1, 'text': 'Introduction'},
+            {'level': 2, 'text': 'Background'},
+            {'level': 1, 'text': 'Based on a heading'},
+        ])
+        self.assertEqual(report['counts']['headings'], 3)
+        self.assertEqual(report['counts']['paragraphs'], 6)
+
+    def test_counts(self):
+        body = '''
+            <p>
+              <r><t>One two</t><tab/><t>three</t></r>
+              <r><footnoteReference id="1"/></r>
+              <hyperlink id="rIdLink"><r><t>four</t></r></hyperlink>
+            </p>
+            <tbl>
+              <tr><tc><p><r><t>five</t></r></p></tc></tr>
+            </tbl>
+            <p>
+              <r><drawing><inline><graphic><graphicData><pic>
+                <blipFill><blip embed="rIdImage"/></blipFill>
+              </pic></graphicData></graphic></inline></drawing></r>
+              <r><pict><shape><imagedata id="rIdImage"/></shape></pict></r>
+            </p>
+            <sectPr/>
+        '''
+        counts = inspect_document(build_docx(body))['counts']
+        self.assertEqual(counts['paragraphs'], 3)
+        self.assertEqual(counts['tables'], 1)
+        self.assertEqual(counts['images'], 2)
+        self.assertEqual(counts['footnotes'], 1)
+        self.assertEqual(counts['hyperlinks'], 1)
+        self.assertEqual(counts['sections'], 1)
+        # Text in adjacent runs isn't separated
+        self.assertEqual(counts['words'], 4)
+        self.assertEqual(counts['characters'], len('One two\tthreefourfive'))
+
+    def test_alternate_content_is_counted_once(self):
+        body = '''
+            <p><r><AlternateContent>
+              <Choice><drawing><blip embed="rIdImage"/></drawing></Choice>
+              <Fallback><pict><imagedata id="rIdImage"/></pict></Fallback>
+            </AlternateContent></r></p>
+        '''
+        counts = inspect_document(build_docx(body))['counts']
+        self.assertEqual(counts['images'], 1)
+
+    def test_estimated_pages(self):
+        words = ' '.join(['word'] * 1200)
+        body = '<p><r><t>{0}</t></r></p>'.format(words)
+        self.assertEqual(inspect_document(build_docx(body))['estimated_pages'], 3)
+
+        body = '''
+            <p><r><t>One</t><br type="page"/><t>Two</t></r></p>
+            <p><pPr><pageBreakBefore/></pPr><r><t>Three</t></r></p>
+            <p><pPr><pageBreakBefore val="0"/></pPr><r><t>Three</t></r></p>
+            <sectPr/>
+        '''
+        self.assertEqual(inspect_document(build_docx(body))['estimated_pages'], 3)
+
+    def test_metadata(self):
+        report = inspect_document(build_docx('<p/>', properties=True))
+        self.assertEqual(report['metadata'], {
+            'title': 'The title',
+            'creator': 'An author',
+            'revision': 3,
+            'application': 'Word',
+            'pages': 7,
+        })
+
+    def test_without_properties_parts(self):
+        report = inspect_document(build_docx('<p/>'))
+        self.assertEqual(report['metadata'], {})
+
+    def test_report_is_json_serializable(self):
+        report = PyDocX.inspect('tests/fixtures/simple.docx')
+        self.assertEqual(json.loads(json.dumps(report)), report)
+        self.assertEqual(report['counts']['tables'], 1)
+
+    def test_etree_backend(self):
+        body = heading('Heading1', 'Introduction') + '<p><r><t>Text</t></r></p>'
+        previous_backend = set_xml_backend('etree')
+        try:
+            report = inspect_document(build_docx(body, properties=True))
+        finally:
+            set_xml_backend(previous_backend)
+        self.assertEqual(report['outline'], [
+            {'level': 1, 'text': 'Introduction'},
+        ])
+        self.assertEqual(report['counts']['paragraphs'], 2)
+        self.assertEqual(report['metadata']['title'], 'The title')
+
+    def test_limits(self):
+        body = '<p><r><t>Text</t></r></p>' * 10
+        report = inspect_document(
+            build_docx(body),
+            limits=ResourceLimits(max_nodes=100, max_depth=10),
+        )
+        self.assertEqual(report['counts']['paragraphs'], 10)
+
+        for limits in [
+            ResourceLimits(max_nodes=20),
+            ResourceLimits(max_depth=4),
+            ResourceLimits(max_member_bytes=100),
+        ]:
+            self.assertRaises(
+                ResourceLimitExceededException,
+                lambda: PyDocX.inspect(build_docx(body), limits=limits),
+            )
+
+    def test_malformed_body_raises_malformed_exception(self):
+        self.assertRaises(
+            MalformedDocxException,
+            lambda: inspect_document(build_docx('<p><r></p>')),
+        )
+
+    def test_main_returns_zero(self):
+        self.assertEqual(main(['--inspect', 'tests/fixtures/simple.docx']), 0)
+        self.assertEqual(main(['--inspect']), 1)
@@ -4,6 +4,7 @@ from __future__ import (
     unicode_literals,
 )
 
+import json
 from os import unlink
 from shutil import copyfile
 from subprocess import Popen, PIPE
@@ -12,9 +13,10 @@ from unittest import TestCase
 
 from nose import SkipTest
 
-from pydocx.__main__ import main
+from pydocx.__main__ import convert, main
 from pydocx.test.testcases import BASE_HTML
 from pydocx.test.utils import assert_html_equal
+from pydocx.util.stats import ConversionStats
 
 
 class MainTestCase(TestCase):
@@ -97,3 +99,49 @@ class MainTestCase(TestCase):
                 f.name
             ], stdout=PIPE).wait()
         self.assertEqual(result, 0)
+
+    def test_convert_to_html_with_stats(self):
+        stats = ConversionStats()
+        with NamedTemporaryFile() as f:
+            result = convert(
+                '--html',
+                'tests/fixtures/has_image.docx',
+                f.name,
+                stats=stats,
+            )
+        self.assertEqual(result, 0)
+        report = stats.to_dict()
+        self.assertIn('render', report['phases'])
+        self.assertEqual(report['counters']['images_encoded'], 1)
+        self.assertEqual(report['nodes']['Paragraph'], 1)
+
+    def test_cli_convert_to_html_with_stats(self):
+        with NamedTemporaryFile() as f:
+            process = Popen([
+                'pydocx',
+                '--stats',
+                '--html',
+                'tests/fixtures/inline_tags.docx',
+                f.name
+            ], stdout=PIPE)
+            stdout, _ = process.communicate()
+        self.assertEqual(process.returncode, 0)
+        report = json.loads(stdout.decode('utf-8'))
+        self.assertGreater(report['counters']['output_bytes'], 0)
+
+    def test_cli_convert_to_html_with_stats_and_profile(self):
+        with NamedTemporaryFile() as f:
+            process = Popen([
+                'pydocx',
+                '--html',
+                'tests/fixtures/inline_tags.docx',
+                f.name,
+                '--stats',
+                '--profile',
+            ], stdout=PIPE)
+            stdout, _ = process.communicate()
+        self.assertEqual(process.returncode, 0)
+        report = json.loads(stdout.decode('utf-8'))
+        self.assertIn('render', report['phases'])
+        self.assertIn('Paragraph', report['profile']['node_types'])
+        self.assertIn('export_paragraph', report['profile']['handlers'])
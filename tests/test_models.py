@@ -5,6 +5,7 @@ from __future__ import (
     unicode_literals,
 )
 
+import pickle
 from unittest import TestCase
 
 from pydocx.models import (
@@ -16,6 +17,8 @@ from pydocx.models import (
     XmlRootElementMismatchException,
 )
 
+from pydocx.openxml.markup_compatibility import AlternateContent
+from pydocx.types import Twips
 from pydocx.util.xml import parse_xml_from_string
 
 
@@ -23,6 +26,7 @@ class AppleModel(XmlModel):
     XML_TAG = 'apple'
 
     type = XmlAttribute(default='Honey Crisp')
+    width = XmlAttribute(type=Twips, default=0)
 
 
 class OrangeModel(XmlModel):
@@ -88,6 +92,16 @@ class XmlAttributeTestCase(BaseTestCase):
         apple = self._get_model_instance_from_xml(xml)
         self.assertEqual(apple.type, 'Gala')
 
+    def test_type_converts_the_attribute_when_loaded(self):
+        xml = '<apple width="1440.5" />'
+        apple = self._get_model_instance_from_xml(xml)
+        self.assertEqual(apple.width, 1440)
+
+    def test_type_is_not_applied_to_the_default(self):
+        xml = '<apple />'
+        apple = self._get_model_instance_from_xml(xml)
+        self.assertEqual(apple.width, 0)
+
 
 class XmlChildTestCase(BaseTestCase):
     model = BucketModel
@@ -298,3 +312,210 @@ class XmlCollectionTestCase(BaseTestCase):
             'four',
         ]
         self.assertEqual(types, expected_types)
+
+
+class AlternateContentTestCase(BaseTestCase):
+    model = ItemsModel
+
+    xml = '''
+        <items>
+            <apple type="one" />
+            <AlternateContent>
+                <Choice>
+                    <orange type="choice" />
+                </Choice>
+                <Fallback>
+                    <apple type="fallback" />
+                    <AlternateContent>
+                        <Fallback>
+                            <orange type="nested" />
+                        </Fallback>
+                    </AlternateContent>
+                </Fallback>
+            </AlternateContent>
+            <orange type="two" />
+        </items>
+    '''
+
+    def _load(self, **load_kwargs):
+        root = parse_xml_from_string(self.xml)
+        return self.model.load(root, **load_kwargs)
+
+    def test_alternate_content_is_loaded_as_a_model_by_default(self):
+        items = self._load()
+        classes = [item.__class__ for item in items.children]
+        self.assertEqual(classes, [AppleModel, AlternateContent, OrangeModel])
+
+    def test_fallback_children_are_spliced_into_the_parent(self):
+        items = self._load(alternate_content=AlternateContent.FALLBACK)
+        types = [item.type for item in items.children]
+        self.assertEqual(types, ['one', 'fallback', 'nested', 'two'])
+        for item in items.children:
+            self.assertEqual(item.parent, items)
+
+    def test_choice_children_are_spliced_into_the_parent(self):
+        items = self._load(alternate_content=AlternateContent.CHOICE)
+        types = [item.type for item in items.children]
+        self.assertEqual(types, ['one', 'choice', 'two'])
+
+    def test_fallback_is_used_if_there_are_no_choices(self):
+        self.xml = '''
+            <items>
+                <AlternateContent>
+                    <Fallback>
+                        <apple type="fallback" />
+                    </Fallback>
+                </AlternateContent>
+            </items>
+        '''
+        items = self._load(alternate_content=AlternateContent.CHOICE)
+        types = [item.type for item in items.children]
+        self.assertEqual(types, ['fallback'])
+
+
+class FieldsTestCase(BaseTestCase):
+    model = BucketModel
+
+    xml = '''
+        <bucket>
+            <water>Agua</water>
+            <circle color="red" />
+        </bucket>
+    '''
+
+    def test_only_the_set_fields_are_yielded(self):
+        bucket = self._get_model_instance_from_xml(self.xml)
+        self.assertEqual(dict(bucket.fields), {
+            'agua': bucket.agua,
+            'circle_color': 'red',
+        })
+
+    def test_fields_that_are_not_set_are_not_stored(self):
+        bucket = self._get_model_instance_from_xml(self.xml)
+        self.assertNotIn('items', bucket.__dict__)
+        self.assertNotIn('circle_size', bucket.__dict__)
+        self.assertIsNone(bucket.items)
+        self.assertIsNone(bucket.circle_size)
+
+    def test_assigned_fields_are_yielded(self):
+        bucket = self._get_model_instance_from_xml(self.xml)
+        bucket.circle_size = '2'
+        bucket.circle_color = None
+        self.assertEqual(
+            sorted(field_name for field_name, _ in bucket.fields),
+            ['agua', 'circle_size'],
+        )
+
+
+class MergeTestCase(BaseTestCase):
+    model = AppleModel
+
+    def test_later_models_take_precedence(self):
+        gala = self._get_model_instance_from_xml('<apple type="Gala" width="20" />')
+        wide = self._get_model_instance_from_xml('<apple width="30" />')
+        merged = AppleModel.merge(gala, None, wide)
+        self.assertEqual(merged.type, 'Gala')
+        self.assertEqual(merged.width, 30)
+        self.assertEqual(gala.width, 20)
+
+    def test_fields_that_are_not_set_are_defaults(self):
+        merged = AppleModel.merge(self._get_model_instance_from_xml('<apple />'))
+        self.assertEqual(merged.type, 'Honey Crisp')
+        self.assertEqual(list(merged.fields), [])
+        self.assertEqual(list(AppleModel.merge().fields), [])
+
+    def test_child_models_are_not_reparented(self):
+        self.model = BucketModel
+        bucket = self._get_model_instance_from_xml('''
+            <bucket>
+                <items><apple /></items>
+            </bucket>
+        ''')
+        merged = BucketModel.merge(bucket)
+        self.assertIsNot(merged, bucket)
+        self.assertIs(merged.items, bucket.items)
+        self.assertIs(merged.items.parent, bucket)
+
+
+class LazyLoadMixin(object):
+    def _get_model_instance_from_xml(self, xml):
+        root = parse_xml_from_string(xml)
+        return self.model.load(root, lazy=True)
+
+    def _load(self, **load_kwargs):
+        root = parse_xml_from_string(self.xml)
+        return self.model.load(root, lazy=True, **load_kwargs)
+
+
+class LazyXmlAttributeTestCase(LazyLoadMixin, XmlAttributeTestCase):
+    pass
+
+
+class LazyXmlChildTestCase(LazyLoadMixin, XmlChildTestCase):
+    pass
+
+
+class LazyXmlCollectionTestCase(LazyLoadMixin, XmlCollectionTestCase):
+    pass
+
+
+class LazyAlternateContentTestCase(LazyLoadMixin, AlternateContentTestCase):
+    pass
+
+
+class LazyFieldsTestCase(LazyLoadMixin, FieldsTestCase):
+    pass
+
+
+class LazyMergeTestCase(LazyLoadMixin, MergeTestCase):
+    pass
+
+
+class LazyLoadTestCase(BaseTestCase):
+    model = BucketModel
+
+    xml = '''
+        <bucket>
+            <items>
+                <apple type="Gala" width="20" />
+            </items>
+            <data>Content</data>
+            <circle color="red" sz="2" />
+        </bucket>
+    '''
+
+    def load(self):
+        return self.model.load(parse_xml_from_string(self.xml), lazy=True)
+
+    def test_fields_are_decoded_on_first_access(self):
+        bucket = self.load()
+        self.assertNotIn('items', bucket.__dict__)
+        items = bucket.items
+        self.assertIs(bucket.__dict__['items'], items)
+        self.assertIs(bucket.items, items)
+        # The child models are loaded lazily as well
+        self.assertNotIn('children', items.__dict__)
+        self.assertNotIn('content', bucket.data.__dict__)
+
+    def test_lazily_loaded_models_have_the_same_fields(self):
+        root = parse_xml_from_string(self.xml)
+        self.assertEqual(repr(self.load()), repr(self.model.load(root)))
+
+    def test_fields_can_be_assigned_before_they_are_decoded(self):
+        bucket = self.load()
+        bucket.circle_color = 'blue'
+        self.assertEqual(bucket.circle_color, 'blue')
+        self.assertEqual(bucket.circle_size, '2')
+
+    def test_load_fields_releases_the_element(self):
+        bucket = self.load()
+        bucket.load_fields()
+        self.assertIsNone(bucket._lazy_source)
+        self.assertEqual(bucket.data.content, 'Content')
+
+    def test_pickled_models_are_decoded(self):
+        bucket = pickle.loads(pickle.dumps(self.load()))
+        apple = bucket.items.children[0]
+        self.assertEqual(apple.type, 'Gala')
+        self.assertEqual(apple.width, 20)
+        self.assertIs(apple.parent, bucket.items)
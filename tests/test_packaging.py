@@ -5,7 +5,9 @@ from __future__ import (
     unicode_literals,
 )
 
+import pickle
 import unittest
+import zlib
 
 from pydocx.packaging import ZipPackage
 
@@ -33,3 +35,43 @@ class ZipPackageTestCase(unittest.TestCase):
         data = part.stream.read()
         assert data
         assert data.startswith(b'<?xml version="1.0" encoding="UTF-8"?>')
+
+    def test_parts_are_decompressed_on_first_access(self):
+        self.package.get_parts()
+        self.assertEqual(self.package.streams, {})
+        part = self.package.get_part('/word/document.xml')
+        self.assertIs(part.stream, part.stream)
+        self.assertEqual(list(self.package.streams.keys()), ['/word/document.xml'])
+
+    def test_pickling_decompresses_every_part(self):
+        self.package.get_parts()
+        package = pickle.loads(pickle.dumps(self.package))
+        self.assertIsNone(package.path)
+        self.assertEqual(
+            set(package.streams.keys()),
+            set(part.uri for part in self.package.get_parts()),
+        )
+        data = package.get_part('/_rels/.rels').stream.read()
+        assert data.startswith(b'<?xml version="1.0" encoding="UTF-8"?>')
+
+    def test_member_checksum_does_not_decompress(self):
+        self.package.get_parts()
+        checksum = self.package.get_member_checksum('/word/document.xml')
+        self.assertEqual(self.package.streams, {})
+        data = self.package.get_part('/word/document.xml').stream.read()
+        self.assertEqual(checksum, zlib.crc32(data) & 0xffffffff)
+        self.assertIsNone(self.package.get_member_checksum('/word/missing.xml'))
+
+    def test_open_stream_reads_the_member_without_keeping_it(self):
+        self.package.get_parts()
+        stream = self.package.open_stream('/word/document.xml')
+        data = stream.read()
+        stream.close()
+        self.assertEqual(self.package.streams, {})
+        self.assertEqual(data, self.package.get_part('/word/document.xml').stream.read())
+
+    def test_open_stream_of_a_decompressed_member(self):
+        part = self.package.get_part('/word/document.xml')
+        stream = self.package.open_stream('/word/document.xml')
+        stream.close()
+        assert part.stream.read()
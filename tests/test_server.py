@@ -0,0 +1,259 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from subprocess import Popen, PIPE
+from unittest import TestCase
+
+from nose import SkipTest
+
+from pydocx import PyDocX
+from pydocx.server import ConversionServer, WorkerMetrics
+
+try:
+    from urllib.request import Request, urlopen
+    from urllib.error import HTTPError
+except ImportError:  # python 2
+    from urllib2 import HTTPError, Request, urlopen
+
+
+class WorkerMetricsTestCase(TestCase):
+    def test_counters_are_summed_across_workers(self):
+        metrics = WorkerMetrics(workers=2)
+        metrics.start_request(0, bytes_received=100)
+        metrics.finish_request(0, bytes_sent=10)
+        metrics.start_request(1, bytes_received=50)
+        report = metrics.to_dict()
+        self.assertEqual(report['conversions'], 2)
+        self.assertEqual(report['failures'], 0)
+        self.assertEqual(report['bytes_received'], 150)
+        self.assertEqual(report['bytes_sent'], 10)
+        self.assertEqual(report['busy_workers'], 1)
+
+        metrics.finish_request(1, bytes_sent=20, error=True)
+        report = metrics.to_dict()
+        self.assertEqual(report['failures'], 1)
+        self.assertEqual(report['busy_workers'], 0)
+
+    def test_workers_are_busy_before_the_body_is_received(self):
+        metrics = WorkerMetrics(workers=1)
+        metrics.start_request(0)
+        self.assertEqual(metrics.to_dict()['busy_workers'], 1)
+        metrics.receive(0, bytes_received=30)
+        self.assertEqual(metrics.to_dict()['bytes_received'], 30)
+
+
+class KillOverdueWorkersTestCase(TestCase):
+    def test_workers_busy_past_the_deadline_are_killed(self):
+        server = ConversionServer(
+            ('127.0.0.1', 0),
+            workers=2,
+            timeout=1,
+            kill_grace=1,
+        )
+        overdue = Popen(['sleep', '30'])
+        busy = Popen(['sleep', '30'])
+        try:
+            server.worker_pids = {overdue.pid: 0, busy.pid: 1}
+            server.metrics.write(0, busy_since=time.time() - 3)
+            server.metrics.write(1, busy_since=time.time())
+            server.kill_overdue_workers()
+            self.assertEqual(overdue.wait(), -9)
+            self.assertIsNone(busy.poll())
+            # The slot of the killed worker is only written once it has exited
+            self.assertEqual(server.metrics.to_dict()['failures'], 0)
+            server.worker_exited(overdue.pid)
+            report = server.metrics.to_dict()
+            self.assertEqual(report['failures'], 1)
+            self.assertEqual(report['busy_workers'], 1)
+            self.assertEqual(server.worker_pids, {busy.pid: 1})
+        finally:
+            for process in (overdue, busy):
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+
+class ServerTestCaseBase(TestCase):
+    server_args = []
+
+    @classmethod
+    def setUpClass(cls):
+        if not hasattr(os, 'fork'):
+            raise SkipTest('pydocx serve requires fork')
+        cls.process = Popen(
+            [sys.executable, '-m', 'pydocx', 'serve'] + cls.get_server_args(),
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+        line = cls.process.stdout.readline().decode('utf-8').strip()
+        assert line.startswith('Listening on '), line
+        cls.url = line[len('Listening on '):]
+
+    @classmethod
+    def get_server_args(cls):
+        return ['--port', '0'] + cls.server_args
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.process.terminate()
+        cls.process.wait()
+        cls.process.stdout.close()
+        cls.process.stderr.close()
+
+    def request(self, path, data=None):
+        request = Request(self.url + path, data=data)
+        try:
+            response = urlopen(request)
+        except HTTPError as e:
+            response = e
+        try:
+            return response.getcode(), response.read()
+        finally:
+            response.close()
+
+    def get_json(self, path):
+        status, body = self.request(path)
+        self.assertEqual(status, 200)
+        return json.loads(body.decode('utf-8'))
+
+    def read_fixture(self, name):
+        with open(os.path.join('tests', 'fixtures', name), 'rb') as f:
+            return f.read()
+
+
+class ServerTestCase(ServerTestCaseBase):
+    server_args = ['--workers', '2', '--max-request-bytes', '100000']
+
+    def test_health(self):
+        self.assertEqual(self.get_json('/health'), {'status': 'ok'})
+
+    def test_convert_to_html(self):
+        status, body = self.request(
+            '/convert?format=html',
+            self.read_fixture('inline_tags.docx'),
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            body.decode('utf-8'),
+            PyDocX.to_html('tests/fixtures/inline_tags.docx'),
+        )
+
+    def test_convert_to_markdown(self):
+        status, body = self.request(
+            '/convert?format=markdown',
+            self.read_fixture('inline_tags.docx'),
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            body.decode('utf-8'),
+            ''.join(PyDocX.to_markdown('tests/fixtures/inline_tags.docx')),
+        )
+
+    def test_unknown_format(self):
+        status, _ = self.request('/convert?format=pdf', b'foo')
+        self.assertEqual(status, 400)
+
+    def test_invalid_docx(self):
+        status, body = self.request('/convert', b'not a docx')
+        self.assertEqual(status, 400)
+        self.assertIn('error', json.loads(body.decode('utf-8')))
+
+    def test_document_too_large(self):
+        status, _ = self.request('/convert', b'\x00' * 100001)
+        self.assertEqual(status, 413)
+
+    def test_unknown_path(self):
+        status, _ = self.request('/foo')
+        self.assertEqual(status, 404)
+
+    def test_metrics(self):
+        before = self.get_json('/metrics')
+        self.request('/convert', self.read_fixture('inline_tags.docx'))
+        self.request('/convert', b'not a docx')
+        after = self.get_json('/metrics')
+        self.assertEqual(after['workers'], 2)
+        self.assertEqual(after['conversions'] - before['conversions'], 2)
+        self.assertEqual(after['failures'] - before['failures'], 1)
+        self.assertGreater(after['bytes_sent'], before['bytes_sent'])
+
+
+class ServerRecyclingTestCase(ServerTestCaseBase):
+    server_args = ['--workers', '1', '--max-requests', '2', '--timeout', '0.000001']
+
+    def test_workers_are_replaced_after_max_requests(self):
+        for _ in range(5):
+            self.assertEqual(self.get_json('/health'), {'status': 'ok'})
+        self.assertGreaterEqual(self.get_json('/metrics')['worker_restarts'], 2)
+
+    def test_conversions_that_exceed_the_timeout(self):
+        status, body = self.request(
+            '/convert',
+            self.read_fixture('inline_tags.docx'),
+        )
+        self.assertEqual(status, 504)
+        self.assertEqual(json.loads(body.decode('utf-8'))['limit'], 'timeout')
+
+
+class SlowClientTestCase(ServerTestCaseBase):
+    server_args = ['--workers', '1', '--read-timeout', '0.5']
+
+    def test_clients_that_stop_sending_the_body_time_out(self):
+        host, port = self.url[len('http://'):].split(':')
+        client = socket.create_connection((host, int(port)))
+        try:
+            client.sendall(
+                b'POST /convert HTTP/1.0\r\n'
+                b'Content-Length: 1000\r\n\r\n'
+                b'abc'
+            )
+            # The only worker is free again once the read times out
+            status, _ = self.request('/health')
+            self.assertEqual(status, 200)
+            response = client.makefile('rb').read()
+        finally:
+            client.close()
+        self.assertTrue(response.startswith(b'HTTP/1.0 408'), response)
+        metrics = self.get_json('/metrics')
+        self.assertEqual(metrics['busy_workers'], 0)
+        self.assertEqual(metrics['failures'], 1)
+        self.assertEqual(metrics['bytes_received'], 3)
+
+
+class UnixSocketServerTestCase(ServerTestCaseBase):
+    @classmethod
+    def get_server_args(cls):
+        cls.directory = tempfile.mkdtemp()
+        return ['--socket', os.path.join(cls.directory, 'pydocx.sock')]
+
+    @classmethod
+    def tearDownClass(cls):
+        super(UnixSocketServerTestCase, cls).tearDownClass()
+        shutil.rmtree(cls.directory)
+
+    def test_health(self):
+        self.assertTrue(self.url.startswith('unix:'))
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(self.url[len('unix:'):])
+            client.sendall(b'GET /health HTTP/1.0\r\n\r\n')
+            response = b''
+            while True:
+                data = client.recv(4096)
+                if not data:
+                    break
+                response += data
+        finally:
+            client.close()
+        self.assertTrue(response.startswith(b'HTTP/1.0 200'))
+        self.assertTrue(response.endswith(b'{"status": "ok"}'))
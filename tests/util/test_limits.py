@@ -0,0 +1,130 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import time
+from unittest import TestCase
+
+from pydocx.exceptions import ResourceLimitExceededException
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.openxml.packaging import MainDocumentPart
+from pydocx.test.utils import WordprocessingDocumentFactory
+from pydocx.util.limits import ResourceLimits, get_active_budget
+from pydocx.util.zip import create_zip_archive
+
+
+def build_docx(document_xml, extra_members=None):
+    document = WordprocessingDocumentFactory()
+    document.add(MainDocumentPart, document_xml)
+    zip_dict = document.to_zip_dict()
+    zip_dict.update(extra_members or {})
+    return create_zip_archive(zip_dict)
+
+
+def export(docx, limits, exporter_class=PyDocXHTMLExporter):
+    return exporter_class(docx, limits=limits).export()
+
+
+class ResourceLimitsTestCase(TestCase):
+    def assert_limit_exceeded(self, limit_name, docx, limits, **kwargs):
+        try:
+            export(docx, limits, **kwargs)
+        except ResourceLimitExceededException as e:
+            self.assertEqual(e.limit_name, limit_name)
+            self.assertEqual(e.limit, getattr(limits, limit_name))
+        else:
+            raise AssertionError('Expected ResourceLimitExceededException')
+        self.assertIsNone(get_active_budget())
+
+    def test_documents_within_the_limits_are_exported_normally(self):
+        limits = ResourceLimits(
+            max_total_bytes=1024 * 1024,
+            max_member_bytes=1024 * 1024,
+            max_nodes=100,
+            max_depth=10,
+            timeout=60,
+        )
+        docx = build_docx('<p><r><t>Foo</t></r></p>')
+        expected_html = PyDocXHTMLExporter(docx).export()
+        docx.seek(0)
+        self.assertEqual(export(docx, limits), expected_html)
+
+    def test_max_member_bytes(self):
+        docx = build_docx(
+            '<p><r><t>Foo</t></r></p>',
+            {'word/media/bomb.bin': b'\x00' * 100000},
+        )
+        limits = ResourceLimits(max_member_bytes=50000)
+        self.assert_limit_exceeded('max_member_bytes', docx, limits)
+
+    def test_max_total_bytes(self):
+        docx = build_docx('<p><r><t>Foo</t></r></p>', dict(
+            ('word/media/{0}.bin'.format(index), b'\x00' * 20000)
+            for index in range(5)
+        ))
+        limits = ResourceLimits(
+            max_total_bytes=50000,
+            max_member_bytes=50000,
+        )
+        self.assert_limit_exceeded('max_total_bytes', docx, limits)
+
+    def test_decompressed_sizes_are_checked_as_they_grow(self):
+        budget = ResourceLimits(
+            max_total_bytes=100,
+            max_member_bytes=60,
+        ).create_budget()
+        budget.check_member_size(60)
+        self.assertRaises(
+            ResourceLimitExceededException,
+            budget.check_member_size,
+            61,
+        )
+        budget.add_bytes(60)
+        budget.add_bytes(40)
+        self.assertRaises(
+            ResourceLimitExceededException,
+            budget.add_bytes,
+            1,
+        )
+
+    def test_max_nodes(self):
+        docx = build_docx('<p>{0}</p>'.format('<r></r>' * 1000))
+        limits = ResourceLimits(max_nodes=500)
+        self.assert_limit_exceeded('max_nodes', docx, limits)
+
+    def test_max_depth(self):
+        docx = build_docx(
+            '<tbl><tr><tc>' * 20 + '<p/>' + '</tc></tr></tbl>' * 20,
+        )
+        limits = ResourceLimits(max_depth=20)
+        self.assert_limit_exceeded('max_depth', docx, limits)
+
+    def test_timeout(self):
+        class SlowExporter(PyDocXHTMLExporter):
+            def export_paragraph(self, paragraph):
+                time.sleep(0.1)
+                return super(SlowExporter, self).export_paragraph(paragraph)
+
+        docx = build_docx('<p><r><t>Foo</t></r></p>' * 5)
+        limits = ResourceLimits(timeout=0.05)
+        start = time.time()
+        self.assert_limit_exceeded(
+            'timeout',
+            docx,
+            limits,
+            exporter_class=SlowExporter,
+        )
+        self.assertLess(time.time() - start, 0.5)
+
+    def test_limits_may_be_set_on_the_exporter_class(self):
+        class LimitedExporter(PyDocXHTMLExporter):
+            limits = ResourceLimits(max_nodes=10)
+
+        docx = build_docx('<p>{0}</p>'.format('<r></r>' * 100))
+        self.assertRaises(
+            ResourceLimitExceededException,
+            LimitedExporter(docx).export,
+        )
@@ -0,0 +1,91 @@
+# coding: utf-8
+from __future__ import (
+    absolute_import,
+    print_function,
+    unicode_literals,
+)
+
+import json
+import time
+from unittest import TestCase
+
+from pydocx.export import PyDocXHTMLExporter
+from pydocx.util.stats import (
+    ConversionStats,
+    count,
+    get_active_stats,
+    stats_phase,
+    tracemalloc,
+)
+
+
+class ConversionStatsTestCase(TestCase):
+    def test_nested_phases_are_excluded_from_the_outer_phase(self):
+        stats = ConversionStats()
+        with stats.collect():
+            with stats_phase('outer'):
+                with stats_phase('inner'):
+                    time.sleep(0.05)
+                with stats_phase('inner'):
+                    pass
+        self.assertLess(stats.phases['outer']['seconds'], 0.04)
+        self.assertGreaterEqual(stats.phases['inner']['seconds'], 0.04)
+        self.assertEqual(stats.phases['outer']['calls'], 1)
+        self.assertEqual(stats.phases['inner']['calls'], 2)
+        self.assertGreaterEqual(stats.seconds, 0.05)
+
+    def test_collection_only_happens_while_collecting(self):
+        stats = ConversionStats()
+        with stats_phase('foo'):
+            count('bar')
+        self.assertIsNone(get_active_stats())
+        with stats.collect():
+            self.assertIs(get_active_stats(), stats)
+            with stats_phase('foo'):
+                count('bar', 2)
+        self.assertIsNone(get_active_stats())
+        self.assertEqual(list(stats.phases.keys()), ['foo'])
+        self.assertEqual(dict(stats.counters), {'bar': 2})
+
+    def test_trace_allocations(self):
+        stats = ConversionStats(trace_allocations=True)
+        with stats.collect():
+            with stats_phase('foo'):
+                data = [object() for _ in range(1000)]
+        del data
+        report = stats.to_dict()
+        if tracemalloc is None:
+            self.assertNotIn('peak_allocated_bytes', report)
+        else:
+            self.assertGreater(report['phases']['foo']['allocated_bytes'], 0)
+            self.assertGreater(report['peak_allocated_bytes'], 0)
+            self.assertFalse(tracemalloc.is_tracing())
+
+    def test_export_stats(self):
+        stats = ConversionStats()
+        exporter = PyDocXHTMLExporter(
+            'tests/fixtures/nested_lists.docx',
+            stats=stats,
+        )
+        html = exporter.export()
+        report = json.loads(stats.to_json())
+        self.assertEqual(
+            set(report['phases'].keys()),
+            set([
+                'unzip',
+                'parse_xml',
+                'remove_namespaces',
+                'load_models',
+                'first_pass',
+                'post_first_pass',
+                'numbering_spans',
+                'render',
+            ]),
+        )
+        self.assertEqual(
+            report['counters']['output_bytes'],
+            len(html.encode('utf-8')),
+        )
+        self.assertGreater(report['counters']['bytes_decompressed'], 0)
+        self.assertEqual(report['nodes']['Document'], 1)
+        self.assertGreater(report['nodes']['Paragraph'], 1)
@@ -5,12 +5,22 @@ from __future__ import (
     unicode_literals,
 )
 
+from io import BytesIO
 from unittest import TestCase
 
+from nose import SkipTest
+
 from pydocx.exceptions import MalformedDocxException
 from pydocx.util.xml import (
+    ElementTreeXmlBackend,
+    LxmlXmlBackend,
     el_iter,
+    get_default_xml_backend,
+    get_xml_backend,
+    iterparse_xml,
+    lxml_etree,
     parse_xml_from_string,
+    set_xml_backend,
     xml_remove_namespaces,
     xml_tag_split,
     XmlNamespaceManager,
@@ -116,3 +126,101 @@ class XmlNamespaceManagerTestCase(TestCase):
             '{http://example2/test2}dog',
         ]
         self.assertEqual(tags, expected_tags)
+
+
+class ElementTreeXmlBackendTestCase(TestCase):
+    backend_name = 'etree'
+
+    def setUp(self):
+        self.previous_backend = set_xml_backend(self.backend_name)
+
+    def tearDown(self):
+        set_xml_backend(self.previous_backend)
+
+    def test_backend_is_used(self):
+        self.assertEqual(get_xml_backend().name, self.backend_name)
+
+    def test_parse_xml_removing_namespaces(self):
+        xml = b'''<?xml version="1.0" encoding="UTF-8"?>
+            <w:one xmlns:w="foo" w:val="1"><!-- comment --><w:two/></w:one>
+        '''
+        root = parse_xml_from_string(xml, remove_namespaces=True)
+        self.assertEqual(root.tag, 'one')
+        self.assertEqual(dict(root.attrib), {'val': '1'})
+        self.assertEqual(list(elements_to_tags(root)), ['two'])
+
+    def test_parse_unicode_xml_with_encoding_declaration(self):
+        xml = '<?xml version="1.0" encoding="UTF-8"?><one>\u0391</one>'
+        root = parse_xml_from_string(xml)
+        self.assertEqual(root.text, '\u0391')
+
+    def test_malformed_xml_causes_malformed_exception(self):
+        self.assertRaises(
+            MalformedDocxException,
+            lambda: parse_xml_from_string(b'<one>', remove_namespaces=True),
+        )
+
+    def test_iterparse_yields_start_and_end_events(self):
+        xml = b'<w:one xmlns:w="foo"><w:two/></w:one>'
+        events = [
+            (event, element.tag)
+            for event, element in iterparse_xml(BytesIO(xml))
+        ]
+        self.assertEqual(events, [
+            ('start', '{foo}one'),
+            ('start', '{foo}two'),
+            ('end', '{foo}two'),
+            ('end', '{foo}one'),
+        ])
+
+    def test_iterparse_passes_native_event_names_to_the_backend(self):
+        backend = get_xml_backend()
+        events = []
+
+        def iterparse(stream, iterparse_events):
+            events.extend(iterparse_events)
+            return iter(())
+
+        backend.iterparse = iterparse
+        try:
+            list(iterparse_xml(BytesIO(b'<one/>'), events=('start', 'end')))
+        finally:
+            del backend.iterparse
+        self.assertEqual(events, ['start', 'end'])
+        for event in events:
+            self.assertIs(type(event), str)
+
+    def test_iterparse_malformed_xml_causes_malformed_exception(self):
+        self.assertRaises(
+            MalformedDocxException,
+            lambda: list(iterparse_xml(BytesIO(b'<one><two></one>'))),
+        )
+
+
+class LxmlXmlBackendTestCase(ElementTreeXmlBackendTestCase):
+    backend_name = 'lxml'
+
+    def setUp(self):
+        if lxml_etree is None:
+            raise SkipTest('lxml is not installed')
+        super(LxmlXmlBackendTestCase, self).setUp()
+
+    def test_huge_tree_is_opt_in(self):
+        self.assertFalse(LxmlXmlBackend().huge_tree)
+        self.assertTrue(LxmlXmlBackend(huge_tree=True).huge_tree)
+
+
+class SetXmlBackendTestCase(TestCase):
+    def test_default_backend_is_element_tree(self):
+        self.assertEqual(get_default_xml_backend().name, 'etree')
+
+    def test_set_backend_instance(self):
+        backend = ElementTreeXmlBackend()
+        previous_backend = set_xml_backend(backend)
+        try:
+            self.assertIs(get_xml_backend(), backend)
+        finally:
+            set_xml_backend(previous_backend)
+
+    def test_unknown_backend_name(self):
+        self.assertRaises(ValueError, lambda: set_xml_backend('foo'))
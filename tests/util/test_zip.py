@@ -8,7 +8,7 @@ from __future__ import (
 from unittest import TestCase
 
 from pydocx.exceptions import MalformedDocxException
-from pydocx.util.zip import ZipFile, BytesIO
+from pydocx.util.zip import ZipFile, BytesIO, create_zip_archive
 
 
 class ZipFileTestCase(TestCase):
@@ -20,3 +20,19 @@ class ZipFileTestCase(TestCase):
             raise AssertionError('Excepted MalformedDocxException')
         except MalformedDocxException:
             pass
+
+
+class CreateZipArchiveTestCase(TestCase):
+    def test_text_is_encoded_and_bytes_are_stored_as_is(self):
+        archive = create_zip_archive({
+            'text.txt': 'caf\xe9',
+            'image.png': b'\x89PNG\xff',
+            'missing.txt': None,
+        })
+        with ZipFile(archive) as zf:
+            self.assertEqual(
+                sorted(zf.namelist()),
+                ['image.png', 'text.txt'],
+            )
+            self.assertEqual(zf.read('text.txt'), 'caf\xe9'.encode('utf-8'))
+            self.assertEqual(zf.read('image.png'), b'\x89PNG\xff')